@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Body, Depends, HTTPException, status, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
-from app.services.chat_agent_service import get_ai_response
+from typing import List, Dict, Any, Optional
+from app.services.agent_runtime import AgentUnavailableError, agent_runtime
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.db.mongodb import get_database
 from app.core.security import get_api_key, get_current_user
 from uuid import uuid4
+import json
 
 # --- Helper Function for Clean Data Formatting ---
 def format_chat_for_frontend(chat: dict) -> dict:
@@ -32,19 +34,51 @@ def format_chat_for_frontend(chat: dict) -> dict:
 class ChatRequest(BaseModel):
     session_id: str
     question: str
-    chat_history: List[Dict[str, Any]]
+    # The server keeps each session's history; only older clients still send it
+    chat_history: Optional[List[Dict[str, Any]]] = None
 
 router = APIRouter()
 
+async def _chat_service():
+    """The chat agent service; 503 while it is still starting up or failed to start."""
+    try:
+        return await agent_runtime.get()
+    except AgentUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The chat assistant is starting up. Please try again in a moment.",
+            headers={"Retry-After": "5"}
+        )
+
 # --- Public Endpoint for Customer Chatbot ---
 @router.post("/", tags=["Chatbot"])
 async def handle_chat(request: ChatRequest):
     """Receives a question from any user and returns the AI's response."""
-    response = await get_ai_response(
+    service = await _chat_service()
+    response = await service.get_ai_response(
         request.session_id, request.question, request.chat_history
     )
     return {"answer": response}
 
+@router.post("/stream", tags=["Chatbot"])
+async def handle_chat_stream(request: ChatRequest):
+    """
+    Streaming variant of the chat endpoint. Sends Server-Sent Events while the agent
+    works: `tool_start`/`tool_end` progress, `token` pieces of the answer, and a final
+    `done` (or `error`) event with the complete answer.
+    """
+    service = await _chat_service()
+
+    async def event_stream():
+        async for event in service.stream_ai_response(request.session_id, request.question, request.chat_history):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # --- Secure Endpoints for Logged-in Customers ---
 @router.post("/contact-owner", status_code=status.HTTP_201_CREATED, tags=["Customer Actions"])
 async def send_message_to_owner(
@@ -114,3 +148,11 @@ async def reply_to_chat(
         
     return {"status": "success", "message": "Reply sent and chat closed."}
 
+@router.get("/agent-stats", tags=["Owner Actions"])
+async def get_agent_stats(api_key: str = Depends(get_api_key)):
+    """Returns the chat agent's runtime counters (backend queue depths, timeouts). Requires admin API key."""
+    if not agent_runtime.ready:
+        return {"runtime": agent_runtime.stats()}
+    service = await agent_runtime.get()
+    return {"runtime": agent_runtime.stats(), **service.get_service_stats()}
+
@@ -1,6 +1,6 @@
 # backend/app/api/v1/endpoints/menu.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.db.mongodb import get_database
@@ -9,9 +9,38 @@ from typing import List
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from app.schemas.menu_item import MenuItem, MenuItemCreate
+from app.services.catalog_version import catalog_version
+from app.services.menu_snapshot import menu_snapshot
+from app.services.query_cache import query_cache
 
 router = APIRouter()
 
+def _invalidate_chat_caches():
+    """Drops the chat agent's cached answers that depend on the menu."""
+    catalog_version.bump()
+    for namespace in ("category", "item", "menu"):
+        query_cache.invalidate(namespace)
+
+async def _rebuild_and_invalidate(db: AsyncIOMotorClient):
+    # Invalidating first would let a chat request re-cache answers from the old snapshot
+    await menu_snapshot.refresh(db)
+    _invalidate_chat_caches()
+
+def _menu_changed(background_tasks: BackgroundTasks, db: AsyncIOMotorClient):
+    """
+    Called after every category write: once the response is sent, rebuilds the
+    in-memory menu snapshot and then invalidates the chat agent's cached answers.
+    """
+    background_tasks.add_task(_rebuild_and_invalidate, db)
+
+async def _menu_item_changed(db: AsyncIOMotorClient, item: dict):
+    """
+    Called after a menu item is created or updated: renders just that item's chat
+    fragments into the menu snapshot, then invalidates cached answers.
+    """
+    await menu_snapshot.upsert_item(item, db)
+    _invalidate_chat_caches()
+
 @router.post(
     "/categories/",
     response_model=Category,
@@ -20,6 +49,7 @@ router = APIRouter()
 )
 async def create_category(
     category: CategoryCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncIOMotorClient = Depends(get_database)
 ):
     """
@@ -39,6 +69,7 @@ async def create_category(
             detail="Failed to create the category."
         )
 
+    _menu_changed(background_tasks, db)
     return created_category
 
 @router.get(
@@ -104,6 +135,7 @@ async def list_categories(
 async def update_category(
     category_id: str,
     category_update: CategoryCreate, # We can reuse the Create schema for the update data
+    background_tasks: BackgroundTasks,
     db: AsyncIOMotorClient = Depends(get_database)
 ):
     """
@@ -140,6 +172,7 @@ async def update_category(
 
     # Retrieve and return the updated document
     updated_category = await db["categories"].find_one({"_id": category_oid})
+    _menu_changed(background_tasks, db)
     return Category.model_validate(updated_category)
 
 @router.delete(
@@ -149,6 +182,7 @@ async def update_category(
 )
 async def delete_category(
     category_id: str,
+    background_tasks: BackgroundTasks,
     db: AsyncIOMotorClient = Depends(get_database)
 ):
     """
@@ -171,6 +205,7 @@ async def delete_category(
             detail=f"Category with id {category_id} not found"
         )
     
+    _menu_changed(background_tasks, db)
     # A 204 response should not have a body
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
@@ -216,6 +251,7 @@ async def create_menu_item(
             detail="Failed to create the menu item."
         )
 
+    await _menu_item_changed(db, created_item)
     return MenuItem.model_validate(created_item)
 
 
@@ -332,6 +368,7 @@ async def update_menu_item(
         )
 
     updated_item = await db["menu_items"].find_one({"_id": item_oid})
+    await _menu_item_changed(db, updated_item)
     return MenuItem.model_validate(updated_item)
 
 
@@ -363,4 +400,6 @@ async def delete_menu_item(
             detail=f"Menu item with id {item_id} not found"
         )
     
+    await menu_snapshot.remove_item(item_id)
+    _invalidate_chat_caches()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -7,14 +7,22 @@ from typing import List
 
 from app.db.mongodb import get_database
 from app.schemas.promotion import Promotion, PromotionCreate
+from app.services.catalog_version import catalog_version
+from app.services.query_cache import query_cache
 
 router = APIRouter()
 
+def _promotions_changed():
+    """Drops cached promotion lookups and the semantic cache's answers about offers."""
+    catalog_version.bump()
+    query_cache.invalidate("promotions")
+
 @router.post("/", response_model=Promotion, status_code=status.HTTP_201_CREATED, tags=["Promotions"])
 async def create_promotion(promo: PromotionCreate, db: AsyncIOMotorClient = Depends(get_database)):
     promo_dict = promo.model_dump()
     result = await db["promotions"].insert_one(promo_dict)
     created_promo = await db["promotions"].find_one({"_id": result.inserted_id})
+    _promotions_changed()
     return Promotion.model_validate(created_promo)
 
 @router.get("/", response_model=List[Promotion], tags=["Promotions"])
@@ -37,6 +45,7 @@ async def update_promotion(promo_id: str, promo_update: PromotionCreate, db: Asy
         raise HTTPException(status_code=404, detail=f"Promotion with id {promo_id} not found")
         
     updated_promo = await db["promotions"].find_one({"_id": promo_oid})
+    _promotions_changed()
     return Promotion.model_validate(updated_promo)
 
 @router.delete("/{promo_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Promotions"])
@@ -50,4 +59,5 @@ async def delete_promotion(promo_id: str, db: AsyncIOMotorClient = Depends(get_d
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail=f"Promotion with id {promo_id} not found")
     
+    _promotions_changed()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
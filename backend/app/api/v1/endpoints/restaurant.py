@@ -5,6 +5,8 @@ from app.db.mongodb import get_database
 from app.schemas.faq import FAQ, FAQUpdate
 from app.schemas.restaurant import RestaurantDetails
 from app.core.security import get_api_key
+from app.services.catalog_version import catalog_version
+from app.services.menu_snapshot import menu_snapshot
 
 router = APIRouter()
 
@@ -32,6 +34,9 @@ async def update_faqs(faq_update: FAQUpdate, db: AsyncIOMotorClient = Depends(ge
         {"$set": {"faqs": faqs_dict}}
     )
     
+    catalog_version.bump()
+    # Keeps the chat's keyword FAQ search (used while the vector store is down) current
+    await menu_snapshot.set_faqs(faqs_dict)
     updated_restaurant = await get_restaurant_doc(db)
     return updated_restaurant.get("faqs", [])
 
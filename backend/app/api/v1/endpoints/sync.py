@@ -1,13 +1,25 @@
 # backend/app/api/v1/endpoints/sync.py
 from fastapi import APIRouter, status, BackgroundTasks
-from app.services import sync_service
+from app.services.catalog_version import catalog_version
+from app.services.query_cache import query_cache
 
 router = APIRouter()
 
+def _sync_finished():
+    """Answers and search results cached against the old vectors are stale once the sync has finished."""
+    from app.services import chat_agent_service
+    chat_agent_service.local_indexes_saved()
+    catalog_version.bump()
+    for namespace in ("menu", "faq"):
+        query_cache.invalidate(namespace)
+
 @router.post("/run-sync", status_code=status.HTTP_202_ACCEPTED, tags=["Sync"])
 async def trigger_sync(background_tasks: BackgroundTasks):
     """
     Triggers the background task to sync MongoDB with Pinecone.
     """
+    # Imported here: it pulls in LangChain and Pinecone, which no other route needs
+    from app.services import sync_service
     background_tasks.add_task(sync_service.run_sync)
+    background_tasks.add_task(_sync_finished)
     return {"message": "Synchronization task has been started in the background."}
\ No newline at end of file
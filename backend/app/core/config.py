@@ -19,6 +19,69 @@ class Settings(BaseSettings):
     FRONTEND_URLS:str
     BACKEND_URL: str
     ENVIRONMENT: str = "DEV"
+
+    # --- Model providers (see app/services/providers.py) ---
+    EMBEDDING_PROVIDER: str = "gemini"  # "gemini", "sentence-transformers" or "hash" (deterministic fake, offline)
+    EMBEDDING_MODEL: str = ""  # empty: the provider's default model
+    CHAT_MODEL_PROVIDER: str = "gemini"  # "gemini" or "scripted" (fake tool-calling model, offline)
+    CHAT_MODEL: str = ""  # empty: the provider's default model
+    HASH_EMBEDDING_DIMENSIONS: int = 384
+    FAKE_EMBEDDING_LATENCY_SECONDS: float = 0.0  # injected per call by the hash embeddings
+    FAKE_LLM_LATENCY_SECONDS: float = 0.0  # injected per call by the scripted chat model
+
+    # --- Chat agent backends ---
+    EMBEDDING_MAX_CONCURRENCY: int = 8
+    EMBEDDING_TIMEOUT_SECONDS: float = 5.0
+    EMBEDDING_BATCH_WINDOW_MS: float = 5.0  # how long concurrent query embeddings wait to share a batch
+    EMBEDDING_BATCH_MAX_SIZE: int = 32  # a full batch is sent without waiting for the window
+    VECTOR_QUERY_MAX_CONCURRENCY: int = 8
+    VECTOR_QUERY_TIMEOUT_SECONDS: float = 5.0
+    MENU_SEARCH_VECTOR_K: int = 4  # vector results of a menu search, fused with its keyword (BM25) results
+    MENU_SEARCH_KEYWORD_K: int = 12
+    # Weight of the keyword ranking in the fusion (the vector ranking has 1). At 2 every keyword
+    # match outranks a vector-only result, so exact ingredient/tag matches aren't crowded out
+    MENU_SEARCH_KEYWORD_WEIGHT: float = 2.0
+    VECTOR_STORE_MODE: str = "pinecone"  # "pinecone" or "local" (in-process index built by the sync job)
+    LOCAL_VECTOR_INDEX_DIR: str = "data/vector_index"
+    LOCAL_VECTOR_INDEX_CHECK_SECONDS: float = 5.0  # how often searches look for a newer saved index
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "data/embedding_cache.sqlite3"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 50000
+    EMBEDDING_CACHE_DTYPE: str = "float16"  # "float16" (half the size) or "float32"
+    QUERY_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92  # cosine similarity needed to reuse an answer
+    SEMANTIC_CACHE_CAPACITY: int = 2048
+    SEMANTIC_CACHE_TTL_SECONDS: int = 3600
+    MENU_SNAPSHOT_MAX_AGE_SECONDS: int = 300
+    AGENT_RETRY_INTERVAL_SECONDS: float = 30.0  # how long a failed chat agent start is reported before retrying
+    AGENT_MAX_PARALLEL_TOOLS: int = 4  # tool calls of one agent step (one request) run at the same time
+
+    # --- Chat deadlines ---
+    CHAT_DEADLINE_SECONDS: float = 15.0  # longest any LLM or tool call may run for one question
+    CHAT_ANSWER_BY_SECONDS: float = 10.0  # then answer from the tool output gathered so far, if any
+    LLM_HEDGE_AFTER_SECONDS: float = 4.0  # a slower LLM call is also sent to the fallback tier; 0 disables
+    FALLBACK_CHAT_MODEL_PROVIDER: str = ""  # empty: the primary's provider
+    FALLBACK_CHAT_MODEL: str = "gemini-1.5-flash-8b"  # both empty: hedge with a second call to the primary
+
+    # --- Circuit breakers (embedding API, vector store, chat models) ---
+    CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failures that open a breaker
+    CIRCUIT_RESET_SECONDS: float = 30.0  # an open breaker fails fast this long, then lets one trial call through
+
+    # --- Chat sessions ---
+    SESSION_BACKEND: str = "memory"  # "memory" (per worker) or "mongo" (shared across workers)
+    SESSION_TTL_SECONDS: int = 7200
+    SESSION_FLUSH_INTERVAL_SECONDS: float = 1.0
+    CHAT_HISTORY_TOKEN_BUDGET: int = 1000  # summary + recent messages given to the agent
+    CHAT_HISTORY_COMPACT_AFTER: int = 4  # messages outside the budget before they're folded into the summary
+    CHAT_SUMMARY_MAX_TOKENS: int = 250
+
+    # --- Chat transcripts (written behind to the chat_transcripts collection) ---
+    TRANSCRIPTS_ENABLED: bool = True
+    TRANSCRIPT_BATCH_SIZE: int = 100
+    TRANSCRIPT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    TRANSCRIPT_MAX_BUFFERED: int = 5000
+    TRANSCRIPT_BACKPRESSURE_TIMEOUT_SECONDS: float = 0.05  # longest a chat response waits for buffer room
     
     
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,240 @@
+# backend/app/core/metrics.py
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Upper bounds (seconds) of the latency buckets: from in-process work (~0.1 ms) to slow LLM calls
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """
+    A Prometheus histogram with fixed buckets, optionally split by labels. Observations
+    are cheap (a bisect and a few additions under a lock) and safe from worker threads.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> (per-bucket counts, sum, count)
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes how long the `with` block took, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key in sorted(series):
+            counts, total, count = series[key]
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Counter:
+    """A Prometheus counter, optionally split by labels; safe from worker threads."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for key in sorted(values):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {values[key]}")
+        return lines
+
+
+class Gauge:
+    """
+    A Prometheus gauge, optionally split by labels. A series is either set directly or
+    bound to a function that is called when the metrics are rendered, for values that
+    already live elsewhere (e.g. a circuit breaker's state).
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Union[float, Callable[[], float]]] = {}
+
+    def _key(self, labels) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        with self._lock:
+            self._values[self._key(labels)] = fn
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            values = dict(self._values)
+        for key in sorted(values):
+            value = values[key]
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value() if callable(value) else value}")
+        return lines
+
+
+Metric = Union[Histogram, Counter, Gauge]
+
+
+class MetricsRegistry:
+    """The process-wide set of metrics, rendered in the Prometheus text format at /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Returns the histogram called `name`, creating it on first use."""
+        return self._get_or_create(name, lambda: Histogram(name, documentation, labelnames, buckets))
+
+    def _get_or_create(self, name: str, create: Callable[[], Metric]) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = create()
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Returns the counter called `name`, creating it on first use."""
+        return self._get_or_create(name, lambda: Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Returns the gauge called `name`, creating it on first use."""
+        return self._get_or_create(name, lambda: Gauge(name, documentation, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving an HTTP request until its response was fully sent",
+    ["router", "method", "route", "status"]
+)
+
+
+class HttpMetricsMiddleware:
+    """
+    ASGI middleware recording every request in HTTP_REQUEST_SECONDS. Requests are
+    labelled with the route template (not the raw path, which would create a series
+    per id) and the API router it belongs to, e.g. "menu" for /api/v1/menu/items/{item_id}.
+    Streaming responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app, api_prefix: str = "/api/v1"):
+        self.app = app
+        self.api_prefix = api_prefix.rstrip("/") + "/"
+
+    def _labels(self, scope) -> Tuple[str, str]:
+        template = getattr(scope.get("route"), "path", None)
+        if template is None:
+            return "unmatched", "unmatched"
+        if not scope["path"].startswith(self.api_prefix):
+            return "root", template
+        # Router prefixes are static, so the first path segment names the router
+        router = scope["path"][len(self.api_prefix):].split("/", 1)[0]
+        if not template.startswith(self.api_prefix):
+            # Newer FastAPI versions report an included route's path relative to its router
+            template = f"{self.api_prefix}{router}{template}"
+        return router, template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status: Optional[int] = None
+        finished = False
+
+        async def send_wrapper(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = True
+                self._record(scope, status, start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not finished:
+                # The app raised, or the client went away mid-stream
+                self._record(scope, status or 500, start)
+
+    def _record(self, scope, status: Optional[int], start: float):
+        router, route = self._labels(scope)
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            router=router, method=scope["method"], route=route, status=status or 500
+        )
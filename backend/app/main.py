@@ -1,15 +1,24 @@
 import firebase_admin
 from firebase_admin import credentials
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, db
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import HttpMetricsMiddleware, registry
+from app.services.agent_runtime import agent_runtime
+from app.services.menu_snapshot import menu_snapshot
+from app.services.session_store import session_memory
+from app.services.transcript_writer import transcript_writer
 from fastapi.middleware.cors import CORSMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_mongo()
+    # The chat agent (LangChain, Gemini, Pinecone) starts in the background; the other
+    # routes serve right away and /ready reports when chat is available too
+    agent_runtime.start()
     if not firebase_admin._apps:
         try:
             cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
@@ -17,7 +26,13 @@ async def lifespan(app: FastAPI):
             print("✅ Firebase Admin SDK initialized successfully.")
         except Exception as e:
             print(f"❌ Error initializing Firebase Admin SDK: {e}")
+    await session_memory.start()
+    await transcript_writer.start()
+    await menu_snapshot.refresh()
     yield
+    await session_memory.stop()
+    # Drain buffered chat transcripts while the database connection is still open
+    await transcript_writer.stop()
     await close_mongo_connection()
 
 app = FastAPI(
@@ -40,6 +55,9 @@ app.add_middleware(
     allow_headers=["*"], # Allows all headers
 )
 
+# Latency histograms of every request, per router, exposed at /metrics
+app.add_middleware(HttpMetricsMiddleware, api_prefix="/api/v1")
+
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/")
@@ -47,3 +65,18 @@ def read_root():
     """A simple root endpoint to confirm the API is running."""
     return {"status": "ok", "message": "Welcome to the HFC Restaurant AI Assistant API!"}
 
+@app.get("/ready")
+def read_ready():
+    """Readiness probe: 200 once MongoDB is connected and the chat agent has started, 503 before."""
+    checks = {
+        "database": db.client is not None,
+        "chat_agent": agent_runtime.ready,
+    }
+    ready = all(checks.values())
+    body = {"status": "ready" if ready else "not_ready", "checks": checks, "chat_agent": agent_runtime.stats()}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """Latency histograms (HTTP requests and chat agent stages) in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,105 @@
+# backend/app/services/agent_runtime.py
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_MODULE = "app.services.chat_agent_service"
+
+
+class AgentUnavailableError(RuntimeError):
+    """The chat agent is still starting, or its last start failed."""
+
+
+class AgentRuntime:
+    """
+    Starts the chat agent service without holding up the rest of the API. Importing
+    chat_agent_service pulls in LangChain, and building the agent sets up Gemini and
+    Pinecone clients; both happen on a worker thread, kicked off from the app lifespan.
+    Chat endpoints get the service through `get()`, which waits for a warm-up in
+    progress. If the start fails, menu/payment routes keep working, chat requests are
+    refused, and the start is retried after `retry_interval` seconds (or by the first
+    chat request after that).
+    """
+
+    def __init__(self, retry_interval: float):
+        self.retry_interval = retry_interval
+        self._service = None
+        self._task: Optional[asyncio.Task] = None
+        self.error: Optional[str] = None
+        self.failed_at = 0.0
+        self.attempts = 0
+        self.warmup_seconds: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._service is not None:
+            return "ready"
+        if self._task is not None and not self._task.done():
+            return "warming"
+        return "failed" if self.error is not None else "cold"
+
+    @property
+    def ready(self) -> bool:
+        return self._service is not None
+
+    @staticmethod
+    def _load():
+        service = importlib.import_module(SERVICE_MODULE)
+        service.get_chat_agent()
+        return service
+
+    async def _warm_up(self):
+        self.attempts += 1
+        start = time.perf_counter()
+        try:
+            service = await asyncio.to_thread(self._load)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.failed_at = time.monotonic()
+            logger.error(f"❌ Chat agent failed to start (attempt {self.attempts}), retrying in {self.retry_interval:.0f}s: {e}")
+            # Retry on its own too: an instance that isn't ready may not receive any chat requests
+            asyncio.get_running_loop().call_later(self.retry_interval, self.start)
+            raise
+        self._service = service
+        self.error = None
+        self.warmup_seconds = time.perf_counter() - start
+        logger.info(f"✅ Chat agent warmed up in {self.warmup_seconds:.2f}s")
+        return service
+
+    def start(self) -> asyncio.Task:
+        """Starts warming up in the background, unless that's already running or done."""
+        if self._task is None or (self._task.done() and self._service is None):
+            self._task = asyncio.ensure_future(self._warm_up())
+            # A failure is reported through state/error; don't log it again as never retrieved
+            self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._task
+
+    async def get(self):
+        """The chat_agent_service module, once its agent is built."""
+        if self._service is not None:
+            return self._service
+        if self.state == "failed" and time.monotonic() - self.failed_at < self.retry_interval:
+            raise AgentUnavailableError(self.error)
+        try:
+            # Shielded: a client that disconnects mustn't cancel the warm-up for everyone
+            return await asyncio.shield(self.start())
+        except Exception as e:
+            raise AgentUnavailableError(self.error or str(e)) from e
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "attempts": self.attempts,
+            "warmup_seconds": round(self.warmup_seconds, 3) if self.warmup_seconds is not None else None,
+            "error": self.error,
+        }
+
+
+agent_runtime = AgentRuntime(retry_interval=settings.AGENT_RETRY_INTERVAL_SECONDS)
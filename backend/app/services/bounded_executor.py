@@ -0,0 +1,99 @@
+# backend/app/services/bounded_executor.py
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class BackendTimeoutError(Exception):
+    """Raised when a backend call could not finish within its time budget."""
+
+
+class BoundedBackend:
+    """
+    Runs blocking calls for one external backend (e.g. the embedding API or the
+    vector database) on a dedicated, sized thread pool.
+
+    A semaphore caps how many calls are in flight, and a single timeout covers both
+    the wait for a slot and the call itself. A slow backend therefore only queues up
+    the requests that need it, instead of exhausting the default executor that the
+    rest of the API shares.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"{name}-worker")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Counters exposed through stats()
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.total_wait_time = 0.0
+
+    async def run(self, fn: Callable, *args, timeout: float | None = None, **kwargs) -> Any:
+        """Runs `fn(*args, **kwargs)` on the backend's pool, bounded by the concurrency limit and timeout."""
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        start_time = time.perf_counter()
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise BackendTimeoutError(f"{self.name}: no free slot within {timeout:.1f}s")
+        finally:
+            self.queued -= 1
+
+        waited = time.perf_counter() - start_time
+        self.total_wait_time += waited
+        self.started += 1
+        self.in_flight += 1
+
+        # The slot is released when the thread actually finishes, not when we stop waiting,
+        # so timed-out calls still count against the limit while they occupy a worker.
+        future = loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        future.add_done_callback(self._release)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), max(timeout - waited, 0))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"⏱️ {self.name} call timed out after {timeout:.1f}s")
+            raise BackendTimeoutError(f"{self.name}: call exceeded {timeout:.1f}s")
+        except Exception:
+            self.failed += 1
+            raise
+
+        self.completed += 1
+        return result
+
+    def _release(self, _future):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait_time / self.started * 1000, 2) if self.started else 0.0,
+        }
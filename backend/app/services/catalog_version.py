@@ -0,0 +1,19 @@
+# backend/app/services/catalog_version.py
+
+
+class CatalogVersion:
+    """
+    Monotonic counter of edits to the data the chat agent answers from (menu,
+    categories, FAQs). Anything caching derived answers records the version it was
+    built against and treats a different version as stale.
+    """
+
+    def __init__(self):
+        self.current = 0
+
+    def bump(self) -> int:
+        self.current += 1
+        return self.current
+
+
+catalog_version = CatalogVersion()
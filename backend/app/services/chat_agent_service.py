@@ -1,127 +1,119 @@
 # backend/app/services/chat_agent_service.py
 
-from pymongo import MongoClient
-from typing import List, Dict, Any, Optional
-from langchain_core.messages import HumanMessage, AIMessage
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from uuid import UUID
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain.tools import tool
-from langchain.agents import create_tool_calling_agent, AgentExecutor
+from langchain.agents import create_tool_calling_agent
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
 from langchain_core.documents import Document
+from langchain_core.callbacks import BaseCallbackHandler
+import asyncio
 import traceback
 import re
 import time
 import logging
+import threading
 from functools import lru_cache
 from datetime import datetime, timedelta
 import json
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from app.core.config import settings
+from app.core.metrics import registry
+from app.db.mongodb import get_database
+from app.services.bounded_executor import BoundedBackend
+from app.services.catalog_version import catalog_version
+from app.services.circuit_breaker import CircuitOpenError, breaker_stats, embedding_breaker, vector_breaker
+from app.services.conversation_history import ConversationHistory
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_cache import embed_query_batch, get_embedding_cache_store
+from app.services.hedged_chat_model import hedge_stats
+from app.services.keyword_search import reciprocal_rank_fusion
+from app.services.local_vector_index import LocalVectorStore
+from app.services.menu_fragments import price_summary, render_detail_markdown, render_item_detail, render_search_fragment
+from app.services.menu_snapshot import menu_snapshot
+from app.services.parallel_tools import ParallelToolAgentExecutor
+from app.services.providers import create_embeddings, create_tiered_chat_model, create_vectorstore
+from app.services.query_cache import query_cache
+from app.services.query_classifier import query_classifier
+from app.services.request_deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope, iterate_within
+from app.services.semantic_cache import SemanticAnswerCache, normalize_question
+from app.services.session_store import session_memory
+from app.services.singleflight import SingleFlight
+from app.services.structured_query_router import structured_query_router
+from app.services.transcript_writer import transcript_writer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# --- Session Memory Store ---
-class SessionMemory:
+# --- Latency metrics (exposed at /metrics) ---
+CHAT_STAGE_SECONDS = registry.histogram(
+    "chat_stage_duration_seconds",
+    "Time spent in each stage of answering a chat question",
+    ["stage"]
+)
+CHAT_TOOL_SECONDS = registry.histogram(
+    "chat_tool_duration_seconds",
+    "Time spent in each tool call made by the agent",
+    ["tool"]
+)
+CHAT_RESPONSE_SECONDS = registry.histogram(
+    "chat_response_duration_seconds",
+    "Total time to answer a chat question, by the path that answered it",
+    ["path", "mode"]
+)
+CHAT_KEYWORD_SEARCHES = registry.counter(
+    "chat_keyword_searches_total",
+    "Searches answered by the local keyword search because a backend was unavailable",
+    ["search"]
+)
+
+def _stage(name: str):
+    """Context manager timing one stage of a chat request into CHAT_STAGE_SECONDS."""
+    return CHAT_STAGE_SECONDS.time(stage=name)
+
+class LatencyCallbackHandler(BaseCallbackHandler):
+    """Times each LLM call (one per agent iteration) and each tool call the agent makes."""
+    
+    # Called directly on the event loop instead of through a thread pool; it only does arithmetic
+    run_inline = True
+    
     def __init__(self):
-        self.sessions = {}
-        self.cleanup_interval = 3600  # 1 hour
-        self.last_cleanup = time.time()
-    
-    def get_session(self, session_id: str) -> Dict:
-        self._cleanup_old_sessions()
-        if session_id not in self.sessions:
-            self.sessions[session_id] = {
-                'created_at': time.time(),
-                'last_active': time.time(),
-                'context': {},
-                'preferences': {},
-                'recent_queries': [],
-                'conversation_stage': 'greeting'
-            }
-        
-        self.sessions[session_id]['last_active'] = time.time()
-        return self.sessions[session_id]
+        self._started: Dict[UUID, Tuple[str, float]] = {}
     
-    def update_session(self, session_id: str, key: str, value: Any):
-        session = self.get_session(session_id)
-        session[key] = value
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._started[run_id] = ("", time.perf_counter())
     
-    def add_to_context(self, session_id: str, key: str, value: Any):
-        session = self.get_session(session_id)
-        session['context'][key] = value
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, **kwargs):
+        self._started[run_id] = ((serialized or {}).get("name") or kwargs.get("name") or "unknown", time.perf_counter())
     
-    def _cleanup_old_sessions(self):
-        current_time = time.time()
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            expired_sessions = [
-                sid for sid, data in self.sessions.items()
-                if current_time - data['last_active'] > 7200  # 2 hours
-            ]
-            for sid in expired_sessions:
-                del self.sessions[sid]
-            self.last_cleanup = current_time
-            logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
-
-# Global session memory
-session_memory = SessionMemory()
-
-# --- Fast Query Classifier ---
-class QueryClassifier:
-    def __init__(self):
-        self.patterns = {
-            'greeting': [
-                r'\b(hi|hello|hey|good\s*(morning|afternoon|evening)|greetings?)\b',
-                r'^(hi|hello|hey)[\s\W]*$'
-            ],
-            'goodbye': [
-                r'\b(bye|goodbye|see\s*you|thanks?\s*(bye|goodbye)|have\s*a\s*good\s*(day|night))\b',
-                r'\b(exit|quit|done|finished?)\b'
-            ],
-            'how_are_you': [
-                r'\b(how\s*are\s*you|how\s*do\s*you\s*do|how\s*is\s*it\s*going)\b'
-            ],
-            'menu_query': [
-                r'\b(menu|food|dish|eat|hungry|meal|cuisine|spicy|vegetarian|vegan|price|cost)\b',
-                r'\b(what.*available|show.*menu|recommend|suggest.*food)\b',
-                r'\b(pizza|burger|chicken|rice|bread|dessert|drink|beverage|starter|appetizer)\b',
-                r'\b(under|below|less than|within).*(\d+).*rupees?\b'
-            ],
-            'restaurant_info': [
-                r'\b(hours?|time|open|close|location|address|phone|contact|delivery|takeout)\b',
-                r'\b(where.*located|how.*reach|reservation|book.*table)\b'
-            ],
-            'promotion_query': [
-                r'\b(deal|discount|offer|promotion|special|coupon|cheap)\b',
-                r'\b(any.*offer|save.*money|best.*deal)\b'
-            ]
-        }
-        
-        # Compile patterns for speed
-        self.compiled_patterns = {
-            category: [re.compile(pattern, re.IGNORECASE) 
-                      for pattern in patterns]
-            for category, patterns in self.patterns.items()
-        }
+    def _finish(self, run_id: UUID):
+        entry = self._started.pop(run_id, None)
+        if entry is None:
+            return
+        tool_name, start = entry
+        elapsed = time.perf_counter() - start
+        if tool_name:
+            CHAT_STAGE_SECONDS.observe(elapsed, stage="tool")
+            CHAT_TOOL_SECONDS.observe(elapsed, tool=tool_name)
+        else:
+            CHAT_STAGE_SECONDS.observe(elapsed, stage="llm")
     
-    def classify(self, query: str) -> str:
-        query_lower = query.lower().strip()
-        
-        # Quick length check for simple greetings
-        if len(query_lower) <= 10 and any(word in query_lower for word in ['hi', 'hello', 'hey']):
-            return 'greeting'
-        
-        # Check each category
-        for category, compiled_patterns in self.compiled_patterns.items():
-            if any(pattern.search(query_lower) for pattern in compiled_patterns):
-                return category
-        
-        return 'general'
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+    
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+    
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
+    
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id)
 
-query_classifier = QueryClassifier()
+latency_callbacks = LatencyCallbackHandler()
+AGENT_RUN_CONFIG = {"callbacks": [latency_callbacks]}
 
 # --- Response Templates for Fast Replies ---
 class ResponseTemplates:
@@ -168,142 +160,242 @@ class ResponseTemplates:
 
 response_templates = ResponseTemplates()
 
-# --- Enhanced Cache System ---
-class QueryCache:
-    def __init__(self, max_size=500, ttl=1800):  # 30 minutes TTL
-        self.cache = {}
-        self.access_times = {}
-        self.max_size = max_size
-        self.ttl = ttl
-    
-    def _is_valid(self, key: str) -> bool:
-        if key not in self.cache:
-            return False
-        return time.time() - self.access_times[key] < self.ttl
-    
-    def get(self, key: str) -> Optional[str]:
-        if self._is_valid(key):
-            self.access_times[key] = time.time()
-            logger.info(f"Cache hit for query: {key[:50]}...")
-            return self.cache[key]
-        elif key in self.cache:
-            del self.cache[key]
-            del self.access_times[key]
-        return None
-    
-    def set(self, key: str, value: str):
-        # Clean old entries if cache is full
-        if len(self.cache) >= self.max_size:
-            oldest_key = min(self.access_times, key=self.access_times.get)
-            del self.cache[oldest_key]
-            del self.access_times[oldest_key]
-        
-        self.cache[key] = value
-        self.access_times[key] = time.time()
-        logger.info(f"Cached response for query: {key[:50]}...")
+# --- Embeddings, Vectorstores and Agent (built lazily) ---
 
-query_cache = QueryCache()
+class ChatAgent:
+    """
+    The parts of the chat agent that talk to external services: the embedding model,
+    the menu/FAQ vectorstores, the LLM and the AgentExecutor, each from the provider
+    configured in settings (app/services/providers.py). Built on first use by
+    get_chat_agent() instead of at import, so importing this module neither needs
+    Gemini/Pinecone to be reachable nor makes the API wait for them.
+    """
 
-# --- Connection Pool for MongoDB ---
-class MongoConnectionPool:
     def __init__(self):
-        self._client = None
-        self._db = None
-    
-    @property
-    def client(self):
-        if self._client is None:
-            self._client = MongoClient(
-                settings.MONGO_URI,
-                maxPoolSize=20,
-                minPoolSize=5,
-                maxIdleTimeMS=30000,
-                serverSelectionTimeoutMS=5000
+        logger.info(f"=== Initializing Optimized Chat Agent Service (embeddings: {settings.EMBEDDING_PROVIDER}, chat model: {settings.CHAT_MODEL_PROVIDER}) ===")
+        try:
+            # Wrapped in the persistent embedding cache, so repeated queries skip the provider call
+            self.embedding_model = create_embeddings()
+            
+            self.menu_vectorstore = create_vectorstore(self.embedding_model, "menu-items")
+            self.faq_vectorstore = create_vectorstore(self.embedding_model, "faqs")
+            logger.info(f"✅ Vectorstores initialized successfully (menu: {type(self.menu_vectorstore).__name__}, faqs: {type(self.faq_vectorstore).__name__})")
+        except Exception as e:
+            logger.error(f"❌ Error initializing vectorstores: {e}")
+            raise
+        
+        # Hedged with the fallback tier and bounded by each request's deadline
+        self.llm = create_tiered_chat_model()
+        
+        logger.info("=== Creating Enhanced Agent ===")
+        try:
+            agent = create_tool_calling_agent(self.llm, tools, prompt)
+            self.agent_executor = ParallelToolAgentExecutor(
+                agent=agent, 
+                tools=tools, 
+                max_parallel_tools=settings.AGENT_MAX_PARALLEL_TOOLS,
+                verbose=False,  # Reduce verbosity for speed
+                handle_parsing_errors=True,
+                max_iterations=3,  # Reduce iterations
+                early_stopping_method="generate",
+                return_intermediate_steps=False  # Disable for speed
             )
-        return self._client
-    
-    @property
-    def db(self):
-        if self._db is None:
-            self._db = self.client["restaurentDB"]
-        return self._db
+            logger.info("✅ Enhanced Agent created successfully")
+        except Exception as e:
+            logger.error(f"❌ Agent creation failed: {e}")
+            raise
 
-mongo_pool = MongoConnectionPool()
+_chat_agent: Optional[ChatAgent] = None
+_chat_agent_lock = threading.Lock()
 
-# --- Initialize Embeddings and Vectorstores ---
-logger.info("=== Initializing Optimized Chat Agent Service (with Gemini Embeddings) ===")
+def local_indexes_saved():
+    """Called after a sync in this process: local vector stores look for the new index on their next search."""
+    if _chat_agent is not None:
+        for vectorstore in (_chat_agent.menu_vectorstore, _chat_agent.faq_vectorstore):
+            if isinstance(vectorstore, LocalVectorStore):
+                vectorstore.invalidate()
 
-try:
-    # --- THIS IS THE CHANGE ---
-    # Import the correct library at the top of your file:
-    # from langchain_google_genai import GoogleGenerativeAIEmbeddings
+def get_chat_agent() -> ChatAgent:
+    """
+    Returns the chat agent, building it on first use. Blocking: async code should let
+    agent_runtime build it on a worker thread first. A failed build is retried on the next call.
+    """
+    global _chat_agent
+    if _chat_agent is None:
+        with _chat_agent_lock:
+            if _chat_agent is None:
+                _chat_agent = ChatAgent()
+                logger.info("=== Enhanced Chat Agent Service Ready! ===")
+    return _chat_agent
 
-    # Initialize embeddings using the Google Gemini API model.
-    # This offloads all heavy computation from our server.
-    embedding_model = GoogleGenerativeAIEmbeddings(
-        google_api_key=settings.GOOGLE_API_KEY, 
-        model="gemini-embedding-001"
-    )
-    logger.info("✅ Google Gemini Embeddings model initialized successfully")
-    
-    # The rest of the logic remains the same as it's a drop-in replacement.
-    menu_vectorstore = PineconeVectorStore(
-        index_name="restaurant-menu", 
-        embedding=embedding_model, 
-        namespace="menu-items"
-    )
-    
-    faq_vectorstore = PineconeVectorStore(
-        index_name="restaurant-menu", 
-        embedding=embedding_model, 
-        namespace="faqs"
+def _embed_queries(texts: List[str]) -> List[List[float]]:
+    return embed_query_batch(get_chat_agent().embedding_model, texts)
+
+# Embedding requests and Pinecone queries are blocking network calls. Each backend gets
+# its own sized pool, concurrency limit and timeout so a slow one can't stall the API.
+embedding_backend = BoundedBackend(
+    "embedding",
+    max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+    timeout=settings.EMBEDDING_TIMEOUT_SECONDS
+)
+vector_query_backend = BoundedBackend(
+    "vector-query",
+    max_concurrency=settings.VECTOR_QUERY_MAX_CONCURRENCY,
+    timeout=settings.VECTOR_QUERY_TIMEOUT_SECONDS
+)
+
+# Query embeddings of concurrent requests are sent to the model in small batches
+query_embedder = EmbeddingBatcher(
+    _embed_queries,
+    embedding_backend,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    window=settings.EMBEDDING_BATCH_WINDOW_MS / 1000
+)
+
+async def _similarity_search(vectorstore, query: str, k: int, namespace: str) -> List[Document]:
+    """
+    Embeds the query and runs the vector query, each on its own bounded backend behind
+    its own circuit breaker (CircuitOpenError while that backend is known to be down).
+    """
+    with _stage("embedding"):
+        query_vector = await embedding_breaker.call(query_embedder.embed, query)
+    with _stage("vector_query"):
+        if isinstance(vectorstore, LocalVectorStore) and not vectorstore.stale:
+            # A single in-memory matrix-vector product; not worth a thread hop. Searches that
+            # check for or load a new index version read files, so they go to the backend's threads
+            return vectorstore.similarity_search_by_vector(query_vector, k=k)
+        return await vector_breaker.call(
+            vector_query_backend.run, vectorstore.similarity_search_by_vector, query_vector, k=k, namespace=namespace
+        )
+
+def _cache_get(namespace: str, key: str) -> Optional[Any]:
+    with _stage("query_cache"):
+        return query_cache.get(namespace, key)
+
+# --- Local keyword search (degraded mode) ---
+# While the embedding API or the vector store is down (or its circuit is open), menu and
+# FAQ searches use BM25 over the in-memory menu snapshot instead of apologising. These
+# answers are not cached: the vector search answers again as soon as it is back.
+
+MENU_NO_RESULTS = "I couldn't find any menu items matching your query. Try asking about our popular categories like 'pizza', 'indian food', 'starters', or 'vegetarian options'."
+FAQ_NO_RESULTS = "I couldn't find specific information about that. Please contact our restaurant directly, or ask me about hours, location, or delivery."
+
+def _format_faqs(faqs: List[Tuple[str, str]]) -> str:
+    """Formats (question, answer) pairs as the faq_search answer."""
+    result = "ℹ️ **Restaurant Information:**\n\n"
+    for question, answer in faqs:
+        result += f"- **{question}**\n"
+        result += f"  ✅ {answer}\n\n"
+    return result
+
+async def _keyword_menu_search(query: str, k: int = 6) -> str:
+    CHAT_KEYWORD_SEARCHES.inc(search="menu")
+    with _stage("keyword_search"):
+        snapshot = await menu_snapshot.get()
+        items = snapshot.keyword_search(query, k)
+    if not items:
+        return MENU_NO_RESULTS
+    parts = ["🍽️ **Here are our menu items:**\n\n"]
+    parts.extend(item['search_md'] for item in items)
+    parts.append("💡 Want more details about any item? Just ask!")
+    return "".join(parts)
+
+def _render_vector_doc(doc: Document) -> str:
+    """The search fragment of a vector result that isn't in the menu snapshot, from its metadata."""
+    pricing = doc.metadata.get('pricing', [])
+    return render_search_fragment(
+        doc.metadata.get('name', 'Unknown'),
+        doc.page_content if doc.page_content else doc.metadata.get('description', 'Delicious item'),
+        price_summary(pricing)[1] if pricing else "Price not available",
+        doc.metadata.get('is_available', True),
+        doc.metadata.get('category', 'Menu Item'),
     )
-    logger.info("✅ Pinecone vectorstores initialized successfully")
-    
-except Exception as e:
-    logger.error(f"❌ Error initializing vectorstores: {e}")
-    raise
+
+def _hybrid_menu_results(snapshot, query: str, docs: List[Document], limit: int) -> List[str]:
+    """
+    Fuses the vector results with the snapshot's keyword (BM25) results by weighted
+    reciprocal rank fusion: names, ingredients and tags that match exactly ("with
+    mushroom", "bestseller") rank first even when the embedding misses them, and vector
+    results reorder them and fill the remaining places. Returns the search fragments of
+    the best `limit` items.
+    """
+    keyword_ranking = [position for position, _ in snapshot.menu_index.search(query, settings.MENU_SEARCH_KEYWORD_K)]
+    # Vector results missing from the snapshot (added since it was built) get ids past its end
+    vector_ranking: List[int] = []
+    unknown: List[Document] = []
+    for doc in docs:
+        position = snapshot.positions.get(doc.metadata.get('doc_id'))
+        if position is None:
+            position = len(snapshot.items) + len(unknown)
+            unknown.append(doc)
+        if position not in vector_ranking:
+            vector_ranking.append(position)
+    return [
+        snapshot.items[position]['search_md'] if position < len(snapshot.items)
+        else _render_vector_doc(unknown[position - len(snapshot.items)])
+        for position in reciprocal_rank_fusion([vector_ranking, keyword_ranking], limit,
+                                               weights=[1.0, settings.MENU_SEARCH_KEYWORD_WEIGHT])
+    ]
+
+async def _keyword_faq_search(query: str, k: int = 3) -> str:
+    CHAT_KEYWORD_SEARCHES.inc(search="faq")
+    with _stage("keyword_search"):
+        snapshot = await menu_snapshot.get()
+        faqs = snapshot.faq_search(query, k)
+    if not faqs:
+        return FAQ_NO_RESULTS
+    return _format_faqs([(faq.get('question', 'Restaurant Info'), faq.get('answer', '')) for faq in faqs])
+
 # --- Enhanced Tools with Structured Responses ---
 
+# Identical tool calls running at the same time (e.g. many customers asking for
+# offers right after a promotion goes live) share one execution
+tool_flight = SingleFlight("tools")
+
+# Enhanced category patterns for matching
+CATEGORY_PATTERNS = {
+    'starter': ['starter', 'appetizer', 'snack', 'chaat'],
+    'appetizer': ['starter', 'appetizer', 'snack', 'chaat'],
+    'main': ['main', 'curry', 'rice', 'biryani', 'bread', 'dal', 'sabzi'],
+    'dessert': ['dessert', 'sweet', 'ice cream', 'kulfi'],
+    'drink': ['drink', 'beverage', 'juice', 'tea', 'coffee', 'lassi'],
+    'pizza': ['pizza'],
+    'chinese': ['chinese', 'noodles', 'fried rice', 'manchurian'],
+    'paneer': ['paneer']
+}
+
 @tool
-def category_filter_search(category: str, max_price: Optional[int] = None) -> str:
+@tool_flight.coalesce("category_filter_search")
+async def category_filter_search(category: str, max_price: Optional[int] = None, dietary: Optional[List[str]] = None, limit: Optional[int] = None) -> str:
     """
-    Search for menu items by specific category (starters, mains, desserts, etc.) with optional price filtering.
-    Use this when customers ask for specific categories like "starters under 150" or "desserts below 200".
+    Search for menu items by specific category (starters, mains, desserts, etc.) with optional price and dietary filtering.
+    Use this when customers ask for specific categories like "starters under 150", "vegan desserts" or "list 5 drinks".
     
     Args:
         category: The menu category to search (e.g., "starters", "appetizers", "mains", "desserts", "paneer")
         max_price: Maximum price filter in rupees (optional, use None for no price limit)
+        dietary: Dietary requirements every item must meet (optional): "vegetarian", "non-veg", "vegan", "gluten-free", "jain", "spicy"
+        limit: How many items to list (optional, default 10)
     """
-    logger.info(f"🔧 TOOL CALLED: category_filter_search - Category: {category}, Max Price: {max_price}")
+    logger.info(f"🔧 TOOL CALLED: category_filter_search - Category: {category}, Max Price: {max_price}, Dietary: {dietary}, Limit: {limit}")
+    
+    dietary = sorted({flag.lower() for flag in dietary or []})
+    display_limit = limit if limit and limit > 0 else 10
     
     # Check cache first
-    cache_key = f"category:{category.lower()}:{max_price}"
-    cached_result = query_cache.get(cache_key)
+    cache_key = f"{category.lower()}:{max_price}:{','.join(dietary)}:{display_limit}"
+    cached_result = _cache_get("category", cache_key)
     if cached_result:
         return cached_result
     
     try:
         start_time = time.time()
-        db = mongo_pool.db
-        
-        # Enhanced category patterns for matching
-        category_patterns = {
-            'starter': ['starter', 'appetizer', 'snack', 'chaat'],
-            'appetizer': ['starter', 'appetizer', 'snack', 'chaat'],
-            'main': ['main', 'curry', 'rice', 'biryani', 'bread', 'dal', 'sabzi'],
-            'dessert': ['dessert', 'sweet', 'ice cream', 'kulfi'],
-            'drink': ['drink', 'beverage', 'juice', 'tea', 'coffee', 'lassi'],
-            'pizza': ['pizza'],
-            'chinese': ['chinese', 'noodles', 'fried rice', 'manchurian'],
-            'paneer': ['paneer']
-        }
         
         category_lower = category.lower()
         matching_patterns = []
         
         # Find matching patterns
-        for key, patterns in category_patterns.items():
+        for key, patterns in CATEGORY_PATTERNS.items():
             if key in category_lower or any(pattern in category_lower for pattern in patterns):
                 matching_patterns.extend(patterns)
         
@@ -311,196 +403,58 @@ def category_filter_search(category: str, max_price: Optional[int] = None) -> st
         if not matching_patterns:
             matching_patterns = [category_lower]
         
-        # Method 1: Use MongoDB aggregation with $lookup to join categories
-        try:
-            # Build the aggregation pipeline
-            pipeline = [
-                # Join with categories collection
-                {
-                    "$lookup": {
-                        "from": "categories",
-                        "localField": "category_id", 
-                        "foreignField": "_id",
-                        "as": "category_info"
-                    }
-                },
-                # Unwind the category array
-                {
-                    "$unwind": {
-                        "path": "$category_info",
-                        "preserveNullAndEmptyArrays": True
-                    }
-                },
-                # Match based on category name, item name, or tags
-                {
-                    "$match": {
-                        "$or": [
-                            # Match category name
-                            {"category_info.name": {"$regex": "|".join(matching_patterns), "$options": "i"}},
-                            # Match item name for specific items like paneer
-                            {"name": {"$regex": "|".join(matching_patterns), "$options": "i"}},
-                            # Match tags
-                            {"tags": {"$in": [pattern.title() for pattern in matching_patterns] + 
-                                             [pattern.upper() for pattern in matching_patterns] + 
-                                             [pattern.lower() for pattern in matching_patterns]}}
-                        ]
-                    }
-                }
-            ]
-            
-            logger.info(f"📊 MongoDB Aggregation Pipeline: {pipeline}")
-            items_cursor = db.menu_items.aggregate(pipeline)
-            items = list(items_cursor)
-            
-            logger.info(f"📊 Found {len(items)} items using aggregation for category '{category}'")
-            
-        except Exception as e:
-            logger.error(f"❌ Aggregation failed: {e}")
-            # Fallback to simple search
-            items = []
-        
-        # Method 2: Fallback - Search by item name and tags only
-        if not items:
-            logger.info("🔄 Using fallback method - searching by name and tags only")
-            fallback_query = {
-                "$or": [
-                    {"name": {"$regex": "|".join(matching_patterns), "$options": "i"}},
-                    {"tags": {"$in": [pattern.title() for pattern in matching_patterns] + 
-                                     [pattern.upper() for pattern in matching_patterns] + 
-                                     [pattern.lower() for pattern in matching_patterns]}}
-                ]
-            }
-            
-            items_cursor = db.menu_items.find(fallback_query, {'_id': 0})
-            items = list(items_cursor)
-            logger.info(f"📊 Found {len(items)} items using fallback method")
+        # Items come from the in-memory menu snapshot (already joined with categories,
+        # priced and sorted by price), so no database round trip is needed here
+        snapshot = await menu_snapshot.get()
+        items = snapshot.match_category(matching_patterns)
+        logger.info(f"📊 Found {len(items)} items in menu snapshot for category '{category}'")
         
         if not items:
             result = f"I couldn't find any items in the '{category}' category. Try asking about 'starters', 'mains', 'desserts', 'drinks', or specific items like 'paneer'."
-            query_cache.set(cache_key, result)
+            query_cache.set("category", cache_key, result)
             return result
         
-        # Process items and filter by price
-        processed_items = []
-        for item in items:
-            name = item.get('name', 'Unknown')
-            description = item.get('description', 'Delicious item')
-            pricing = item.get('pricing', [])
-            is_available = item.get('is_available', True)
-            
-            # Extract minimum price for filtering
-            min_price = None
-            price_display = "Price not available"
-            
-            if pricing and isinstance(pricing, list):
-                valid_prices = []
-                for p in pricing:
-                    price_val = p.get('price')
-                    if price_val and isinstance(price_val, (int, float)):
-                        valid_prices.append({
-                            'size': p.get('size', 'Regular'),
-                            'price': price_val
-                        })
-                        if min_price is None or price_val < min_price:
-                            min_price = price_val
-                
-                if valid_prices:
-                    if len(valid_prices) == 1:
-                        price_display = f"₹{valid_prices[0]['price']}"
-                    else:
-                        price_parts = [f"{p['size']}: ₹{p['price']}" for p in valid_prices]
-                        price_display = " | ".join(price_parts)
-            
-            # Apply price filter if specified (only if max_price is not None)
-            if max_price is not None and min_price is not None and min_price > max_price:
-                continue
-            
-            # Get dietary information
-            dietary_notes = []
-            dietary_info = item.get("dietary_info", {})
-            tags = item.get("tags", [])
-            
-            if dietary_info.get("is_vegan_available"):
-                dietary_notes.append("🌱 Vegan")
-            if dietary_info.get("is_gluten_free"):
-                dietary_notes.append("🌾 Gluten-free")
-            
-            # Check tags for dietary info
-            if tags:
-                tag_lower_set = {str(tag).lower() for tag in tags}
-                if any(veg_tag in tag_lower_set for veg_tag in ["vegetarian", "veg"]):
-                    dietary_notes.append("🥬 Vegetarian")
-                if "non-veg" in tag_lower_set or "nonveg" in tag_lower_set:
-                    dietary_notes.append("🍖 Non-Veg")
-                if "spicy" in tag_lower_set:
-                    dietary_notes.append("🌶️ Spicy")
-                if "popular" in tag_lower_set:
-                    dietary_notes.append("⭐ Popular")
-            
-            # Get category name if available from aggregation
-            category_name = ""
-            if 'category_info' in item:
-                category_name = item['category_info'].get('name', '')
-            
-            processed_items.append({
-                'name': name,
-                'description': description,
-                'price_display': price_display,
-                'min_price': min_price or 0,
-                'is_available': is_available,
-                'dietary_notes': dietary_notes,
-                'category_name': category_name,
-                'prep_time': item.get('prep_time_minutes', 0)
-            })
-        
-        if not processed_items and max_price is not None:
-            result = f"I couldn't find any {category} items under ₹{max_price}. Try increasing your budget or check other categories!"
-            query_cache.set(cache_key, result)
-            return result
+        # Apply price filter if specified (only if max_price is not None)
+        if max_price is not None:
+            processed_items = [
+                item for item in items
+                if item['min_price'] is None or item['min_price'] <= max_price
+            ]
+        else:
+            processed_items = items
         
-        # Sort by price (lowest first)
-        processed_items.sort(key=lambda x: x['min_price'])
+        # Apply dietary filters: every requested flag must be present
+        if dietary:
+            required = set(dietary)
+            processed_items = [item for item in processed_items if required <= item['dietary_flags']]
         
-        # Format structured response
+        label = " ".join([flag.title() for flag in dietary] + [category.title()])
+        
+        if not processed_items and (max_price is not None or dietary):
+            budget = f" under ₹{max_price}" if max_price is not None else ""
+            result = f"I couldn't find any {label.lower()} items{budget}. Try increasing your budget or check other categories!"
+            query_cache.set("category", cache_key, result)
+            return result
+        
+        # Format structured response from the items' pre-rendered fragments
         if max_price is not None:
-            result = f"🍽️ **{category.title()} items under ₹{max_price}:**\n\n"
+            header = f"🍽️ **{label} items under ₹{max_price}:**\n\n"
         else:
-            result = f"🍽️ **{category.title()} items:**\n\n"
-        
-        # Create bullet list of items (limit to 10 for readability)
-        displayed_items = 0
-        for item in processed_items[:10]:
-            if displayed_items >= 10:
-                break
-                
-            availability = "✅ Available" if item['is_available'] else "❌ Unavailable"
-            dietary_str = " | ".join(item['dietary_notes'][:3]) if item['dietary_notes'] else "ℹ️ No dietary info"
-            
-            result += f"- **{item['name']}**\n"
-            result += f"  📝 {item['description']}\n"
-            result += f"  💰 {item['price_display']}\n"
-            result += f"  {availability}\n"
-            
-            # Add category name if available
-            if item['category_name']:
-                result += f"  📂 Category: {item['category_name']}\n"
-            
-            # Add prep time if available
-            if item['prep_time'] > 0:
-                result += f"  ⏱️ Prep time: {item['prep_time']} minutes\n"
-                
-            result += f"  🏷️ {dietary_str}\n\n"
-            
-            displayed_items += 1
+            header = f"🍽️ **{label} items:**\n\n"
+        
+        # 10 items by default for readability
+        parts = [header]
+        parts.extend(item['list_md'] for item in processed_items[:display_limit])
         
         # Add summary
-        if len(processed_items) > 10:
-            result += f"💡 And {len(processed_items) - 10} more {category} items available!\n\n"
+        if len(processed_items) > display_limit:
+            parts.append(f"💡 And {len(processed_items) - display_limit} more {category} items available!\n\n")
         
-        result += "❓ Want details about any specific item? Just ask!"
+        parts.append("❓ Want details about any specific item? Just ask!")
+        result = "".join(parts)
         
         # Cache the result
-        query_cache.set(cache_key, result)
+        query_cache.set("category", cache_key, result)
         
         logger.info(f"✅ Category search completed in {time.time() - start_time:.2f}s")
         return result
@@ -513,7 +467,8 @@ def category_filter_search(category: str, max_price: Optional[int] = None) -> st
 
 # UPDATED: Enhanced menu_search to better handle price queries and use structured format
 @tool
-def menu_search(query: str) -> str:
+@tool_flight.coalesce("menu_search")
+async def menu_search(query: str) -> str:
     """
     Search the restaurant menu for food items, dishes, ingredients, or menu categories.
     Use this tool when customers ask about:
@@ -536,69 +491,49 @@ def menu_search(query: str) -> str:
         if match and price_match:
             category = match.group(1)
             max_price = int(price_match.group(2))
-            return category_filter_search(category, max_price)
+            return await category_filter_search.ainvoke({"category": category, "max_price": max_price})
     
     # Check cache first
-    cache_key = f"menu:{query.lower().strip()}"
-    cached_result = query_cache.get(cache_key)
+    cache_key = query.lower().strip()
+    cached_result = _cache_get("menu", cache_key)
     if cached_result:
         return cached_result
     
     try:
         start_time = time.time()
         
-        # Direct similarity search with timeout
-        results = menu_vectorstore.similarity_search(
-            query, 
-            k=6,  # Reasonable number for general searches
-            namespace="menu-items"
-        )
+        try:
+            results = await _similarity_search(
+                get_chat_agent().menu_vectorstore,
+                query, 
+                k=settings.MENU_SEARCH_VECTOR_K,  # the keyword results fill the rest
+                namespace="menu-items"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Menu vector search unavailable ({e}), using keyword search")
+            return await _keyword_menu_search(query)
         
         search_time = time.time() - start_time
         logger.info(f"📊 Pinecone search took {search_time:.2f}s, returned {len(results)} results")
         
-        if not results:
-            result = "I couldn't find any menu items matching your query. Try asking about our popular categories like 'pizza', 'indian food', 'starters', or 'vegetarian options'."
-            query_cache.set(cache_key, result)
-            return result
-        
-        # Format results with structured bullet points
-        result = "🍽️ **Here are our menu items:**\n\n"
+        # Fuse with the keyword matches; items in the menu snapshot have their
+        # fragment pre-rendered, anything else is rendered from metadata
+        snapshot = await menu_snapshot.get()
+        with _stage("keyword_search"):
+            fragments = _hybrid_menu_results(snapshot, query, results, limit=6)  # Limit to 6 items
         
-        for doc in results[:6]:  # Limit to 6 items
-            name = doc.metadata.get('name', 'Unknown')
-            description = doc.page_content if doc.page_content else doc.metadata.get('description', 'Delicious item')
-            
-            # Get price information
-            pricing = doc.metadata.get('pricing', [])
-            price_display = "Price not available"
-            
-            if pricing and isinstance(pricing, list):
-                valid_prices = []
-                for p in pricing:
-                    if p.get('price'):
-                        valid_prices.append(f"{p.get('size', 'Regular')}: ₹{p['price']}")
-                
-                if valid_prices:
-                    price_display = " | ".join(valid_prices)
-            
-            # Availability
-            is_available = doc.metadata.get('is_available', True)
-            availability = "✅ Available" if is_available else "❌ Currently unavailable"
-            
-            # Category
-            category = doc.metadata.get('category', 'Menu Item')
-            
-            result += f"- **{name}**\n"
-            result += f"  📝 {description}\n"
-            result += f"  💰 {price_display}\n"
-            result += f"  📂 Category: {category}\n"
-            result += f"  {availability}\n\n"
+        if not fragments:
+            result = MENU_NO_RESULTS
+            query_cache.set("menu", cache_key, result)
+            return result
         
-        result += "💡 Want more details about any item? Just ask!"
+        parts = ["🍽️ **Here are our menu items:**\n\n"]
+        parts.extend(fragments)
+        parts.append("💡 Want more details about any item? Just ask!")
+        result = "".join(parts)
         
         # Cache the result
-        query_cache.set(cache_key, result)
+        query_cache.set("menu", cache_key, result)
         
         logger.info(f"✅ Menu search completed in {time.time() - start_time:.2f}s")
         return result
@@ -608,8 +543,9 @@ def menu_search(query: str) -> str:
         logger.error(f"❌ Menu search error: {e}")
         return error_msg
 
-@tool  
-def faq_search(query: str) -> str:
+@tool
+@tool_flight.coalesce("faq_search")
+async def faq_search(query: str) -> str:
     """
     Search restaurant FAQs for information about policies, hours, location, delivery, etc.
     Use this tool when customers ask about:
@@ -622,39 +558,37 @@ def faq_search(query: str) -> str:
     logger.info(f"🔧 TOOL CALLED: faq_search - Query: {query}")
     
     # Check cache first
-    cache_key = f"faq:{query.lower().strip()}"
-    cached_result = query_cache.get(cache_key)
+    cache_key = query.lower().strip()
+    cached_result = _cache_get("faq", cache_key)
     if cached_result:
         return cached_result
     
     try:
         start_time = time.time()
         
-        results = faq_vectorstore.similarity_search(
-            query,
-            k=3,
-            namespace="faqs"
-        )
+        try:
+            results = await _similarity_search(
+                get_chat_agent().faq_vectorstore,
+                query,
+                k=3,
+                namespace="faqs"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ FAQ vector search unavailable ({e}), using keyword search")
+            return await _keyword_faq_search(query)
         
         logger.info(f"📊 FAQ search took {time.time() - start_time:.2f}s, returned {len(results)} results")
         
         if not results:
-            result = "I couldn't find specific information about that. Please contact our restaurant directly, or ask me about hours, location, or delivery."
-            query_cache.set(cache_key, result)
+            result = FAQ_NO_RESULTS
+            query_cache.set("faq", cache_key, result)
             return result
         
         # Format FAQ results with bullet points
-        result = "ℹ️ **Restaurant Information:**\n\n"
-        
-        for doc in results:
-            question = doc.metadata.get('question', 'Restaurant Info')
-            answer = doc.page_content
-            
-            result += f"- **{question}**\n"
-            result += f"  ✅ {answer}\n\n"
+        result = _format_faqs([(doc.metadata.get('question', 'Restaurant Info'), doc.page_content) for doc in results])
         
         # Cache the result
-        query_cache.set(cache_key, result)
+        query_cache.set("faq", cache_key, result)
         
         logger.info(f"✅ FAQ search completed in {time.time() - start_time:.2f}s")
         return result
@@ -665,7 +599,8 @@ def faq_search(query: str) -> str:
         return error_msg
 
 @tool
-def exact_lookup(item_name: str) -> dict:
+@tool_flight.coalesce("exact_lookup")
+async def exact_lookup(item_name: str) -> dict:
     """
     Performs a direct, typo-tolerant database lookup for a specific menu item's full details.
      
@@ -674,8 +609,8 @@ def exact_lookup(item_name: str) -> dict:
     logger.info(f"🔧 TOOL CALLED: exact_lookup - Item: {item_name}")
     
     # Check cache first
-    cache_key = f"item:{item_name.lower().strip()}"
-    cached_result = query_cache.get(cache_key)
+    cache_key = item_name.lower().strip()
+    cached_result = _cache_get("item", cache_key)
     if cached_result and isinstance(cached_result, str):
         try:
             return json.loads(cached_result)
@@ -684,45 +619,39 @@ def exact_lookup(item_name: str) -> dict:
     
     try:
         start_time = time.time()
-        db = mongo_pool.db
         
-        # Strategy 1: Atlas Search (primary method)
-        try:
-            pipeline = [
-                {
-                    "$search": {
-                        "index": "default",
-                        "autocomplete": {
-                            "query": item_name,
-                            "path": "name",
-                            "fuzzy": { "maxEdits": 1, "prefixLength": 3 }
-                        }
-                    }
-                },
-                {"$limit": 1}
-            ]
-            results = list(db.menu_items.aggregate(pipeline))
-            
-            if results:
-                result = _format_item_response(results[0])
-                query_cache.set(cache_key, json.dumps(result))
-                logger.info(f"✅ Exact lookup completed in {time.time() - start_time:.2f}s")
-                return result
-        except Exception:
-            pass
+        # Strategy 1: fuzzy match against the names in the menu snapshot (typos, Hinglish spellings);
+        # near misses ("butter chicken" vs "Butter Naan") don't match and go on to the database
+        with _stage("name_match"):
+            snapshot = await menu_snapshot.get()
+            entry = snapshot.match_name(item_name)
+        if entry is not None:
+            result = dict(entry['detail'])
+            query_cache.set("item", cache_key, json.dumps(result))
+            logger.info(f"✅ Exact lookup matched '{entry['name']}' in {time.time() - start_time:.4f}s")
+            return result
         
-        # Strategy 2: Regex search (fallback)
-        result = db.menu_items.find_one(
-            {"name": {"$regex": f".*{item_name}.*", "$options": "i"}}
-        )
+        # Strategy 2: substring search in the database, for items added since the snapshot was built
+        db = await get_database()
+        with _stage("mongo"):
+            result = await db.menu_items.find_one(
+                {"name": {"$regex": re.escape(item_name.strip()), "$options": "i"}}
+            )
         
         if result:
-            formatted_result = _format_item_response(result)
-            query_cache.set(cache_key, json.dumps(formatted_result))
+            formatted_result = await _format_item_response(result)
+            query_cache.set("item", cache_key, json.dumps(formatted_result))
             logger.info(f"✅ Exact lookup completed in {time.time() - start_time:.2f}s")
             return formatted_result
         
-        # No results found
+        # No results found: offer the names that came close instead of guessing one
+        suggestions = snapshot.suggest_names(item_name)
+        if suggestions:
+            return {
+                "error": f"I couldn't find '{item_name}' on our menu. Did you mean {' or '.join(suggestions)}?",
+                "suggestions": suggestions,
+                "success": False
+            }
         error_result = {
             "error": f"I couldn't find '{item_name}' on our menu. Try asking about similar items or browse our menu categories!",
             "success": False
@@ -733,70 +662,15 @@ def exact_lookup(item_name: str) -> dict:
         logger.error(f"❌ Exact lookup error: {e}")
         return {"error": "I'm having trouble looking up that item. Please try again!", "success": False}
 
-def _format_item_response(item: dict) -> dict:
-    """Helper function to format the item response consistently."""
-    # Same implementation as before but with emojis for better UX
-    name = item.get("name", "Unknown Item")
-    description = item.get("description", "No description available")
-    
-    # Format pricing efficiently
-    price_str = "Not available"
-    pricing = item.get("pricing", [])
-    if pricing and isinstance(pricing, list):
-        price_parts = [f"{p.get('size', '')}: ₹{p.get('price', '')}" 
-                      for p in pricing if p.get('size') and p.get('price')]
-        if price_parts:
-            price_str = ", ".join(price_parts)
-    
-    # Availability with emoji
-    is_available = item.get("is_available", True)
-    availability_str = "✅ Available" if is_available else "❌ Currently unavailable"
-    
-    # Preparation time
-    prep_time = item.get("prep_time_minutes")
-    prep_time_str = f"⏱️ {prep_time} minutes" if prep_time else "⏱️ Standard timing"
-    
-    # Build response with emojis
-    return {
-        "name": f"🍽️ {name}",
-        "description": description,
-        "price": f"💰 {price_str}",
-        "is_available": availability_str,
-        "preparation_time": prep_time_str,
-        "key_ingredients": item.get("key_ingredients", []),
-        "tags": item.get("tags", []),
-        "dietary_notes": _get_dietary_notes(item),
-        "image_url": item.get("image_url"),
-        "customization_options": item.get("customization_options", []),
-        "success": True
-    }
-
-def _get_dietary_notes(item: dict) -> List[str]:
-    """Extract dietary information with emojis."""
-    dietary_notes = []
-    dietary_info = item.get("dietary_info", {})
-    tags = item.get("tags", [])
-    
-    if dietary_info.get("is_vegan_available"):
-        dietary_notes.append("🌱 Vegan option available")
-    if dietary_info.get("is_gluten_free"):
-        dietary_notes.append("🌾 Gluten-free")
-    if dietary_info.get("is_jain_available"):
-        dietary_notes.append("🙏 Jain option available")
-    
-    # Check tags
-    tag_lower_set = {tag.lower() for tag in tags}
-    if any(tag in tag_lower_set for tag in ["vegetarian", "veg"]):
-        dietary_notes.append("🥬 Vegetarian")
-    if "non-veg" in tag_lower_set:
-        dietary_notes.append("🍖 Non-Vegetarian")
-    if "spicy" in tag_lower_set:
-        dietary_notes.append("🌶️ Spicy")
-    
-    return dietary_notes if dietary_notes else ["ℹ️ No special dietary options"]
+async def _format_item_response(item: dict) -> dict:
+    """The item's detail fragment: pre-rendered in the menu snapshot, rendered here otherwise."""
+    snapshot = await menu_snapshot.get()
+    entry = snapshot.by_id.get(str(item.get("_id", "")))
+    return dict(entry['detail']) if entry is not None else render_item_detail(item)
 
 @tool
-def promotion_lookup() -> str:
+@tool_flight.coalesce("promotion_lookup")
+async def promotion_lookup() -> str:
     """
     Get current promotions, deals, and special offers.
     Use this when customers ask about discounts, deals, or special offers.
@@ -804,16 +678,17 @@ def promotion_lookup() -> str:
     logger.info("🔧 TOOL CALLED: promotion_lookup")
     
     # Check cache first
-    cache_key = "promotions:current"
-    cached_result = query_cache.get(cache_key)
+    cache_key = "current"
+    cached_result = _cache_get("promotions", cache_key)
     if cached_result:
         return cached_result
     
     try:
         start_time = time.time()
-        db = mongo_pool.db
+        db = await get_database()
         
-        promos = list(db.promotions.find({}, {"_id": 0}))
+        with _stage("mongo"):
+            promos = await db.promotions.find({}, {"_id": 0}).to_list(length=None)
         
         if promos:
             result = "🎉 **Current Promotions:**\n\n"
@@ -826,15 +701,14 @@ def promotion_lookup() -> str:
                     result += f"  ⏰ Valid until: {promo['valid_until']}\n"
                 result += "\n"
             
-            # Cache for shorter time since promotions change
-            short_cache = QueryCache(ttl=900)  # 15 minutes
-            short_cache.set(cache_key, result)
+            # The promotions namespace has a shorter TTL since promotions change
+            query_cache.set("promotions", cache_key, result)
             
             logger.info(f"✅ Promotion lookup completed in {time.time() - start_time:.2f}s")
             return result
         else:
             result = "We don't have any active promotions right now, but our regular menu offers great value! 🍽️✨"
-            query_cache.set(cache_key, result)
+            query_cache.set("promotions", cache_key, result)
             return result
             
     except Exception as e:
@@ -844,15 +718,6 @@ def promotion_lookup() -> str:
 # --- Enhanced Agent Setup ---
 tools = [menu_search, category_filter_search, faq_search, exact_lookup, promotion_lookup]
 
-# Optimized LLM configuration
-llm = ChatGoogleGenerativeAI(
-    google_api_key=settings.GOOGLE_API_KEY, 
-    model="gemini-1.5-flash",
-    temperature=0.0,
-    convert_system_message_to_human=True,
-    request_timeout=10  # Add timeout
-)
-
 # Enhanced prompt with better structuring instructions
 prompt = ChatPromptTemplate.from_messages([
     ("system", """You are Lily, a friendly AI restaurant assistant. You're intelligent, efficient, and provide well-structured responses.
@@ -864,6 +729,7 @@ prompt = ChatPromptTemplate.from_messages([
     - For restaurant info → use faq_search tool  
     - For specific item details → use exact_lookup tool
     - For deals/promotions → use promotion_lookup tool
+    - When a question needs several lookups (e.g. comparing two dishes, or a dish plus current deals), request ALL the tool calls at once in the same step - they run in parallel
     - Never give factual data that doesn't come from tool usage.
 
     📋 RESPONSE STRUCTURE RULES - CRITICAL:
@@ -884,6 +750,7 @@ prompt = ChatPromptTemplate.from_messages([
     - "list five paneer items" → category_filter_search("paneer", None)
     - "cheap appetizers" → category_filter_search("appetizer", 200)
     - "desserts below 100" → category_filter_search("dessert", 100)
+    - "paneer tikka vs butter chicken, any offers?" → exact_lookup("paneer tikka") + exact_lookup("butter chicken") + promotion_lookup() in one step
 
     💡 INTELLIGENCE RULES:
     1. Always choose the RIGHT tool for the query type
@@ -901,113 +768,499 @@ prompt = ChatPromptTemplate.from_messages([
      MessagesPlaceholder(variable_name="agent_scratchpad"),
 ])
 
-logger.info("=== Creating Enhanced Agent ===")
-try:
-    agent = create_tool_calling_agent(llm, tools, prompt)
-    agent_executor = AgentExecutor(
-        agent=agent, 
-        tools=tools, 
-        verbose=False,  # Reduce verbosity for speed
-        handle_parsing_errors=True,
-        max_iterations=3,  # Reduce iterations
-        early_stopping_method="generate",
-        return_intermediate_steps=False  # Disable for speed
-    )
-    logger.info("✅ Enhanced Agent created successfully")
-except Exception as e:
-    logger.error(f"❌ Agent creation failed: {e}")
-    raise
+# Answers to recently asked questions, looked up by embedding similarity
+semantic_cache = SemanticAnswerCache(
+    capacity=settings.SEMANTIC_CACHE_CAPACITY,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    ttl=settings.SEMANTIC_CACHE_TTL_SECONDS
+)
 
 # --- Main Service Function with Enhanced Intelligence ---
 
-async def get_ai_response(session_id: str, question: str, chat_history: List[Dict[str, Any]]):
+FALLBACK_RESPONSES = {
+    'menu_query': "I'm having trouble accessing our menu right now. Please try asking about specific food items or categories like 'pizza' or 'vegetarian options'.",
+    'restaurant_info': "I'm having trouble getting restaurant information. Please call us directly or visit our website for current hours and location details.",
+    'promotion_query': "I can't access current promotions right now. Please check our website or ask our staff about current deals!",
+    'general': "I'm experiencing some technical difficulties. Please try rephrasing your question or contact our restaurant directly for assistance."
+}
+
+EMPTY_OUTPUT_RESPONSE = "I apologize, I couldn't process that properly. Could you please rephrase your question?"
+
+def _fast_response(session_id: str, query_type: str) -> Optional[str]:
+    """Template answers for small talk, which never needs tools or the LLM."""
+    if query_type == 'greeting':
+        return response_templates.greeting_response(session_id)
+    elif query_type == 'how_are_you':
+        return response_templates.how_are_you_response()
+    elif query_type == 'goodbye':
+        return response_templates.goodbye_response(session_id)
+    return None
+
+async def _structured_response(question: str) -> Optional[str]:
     """
-    Enhanced service function with smart routing, memory, and structured responses
+    Answers category/price/dietary listings ("veg starters under 200") by calling
+    category_filter_search directly. Its output is already the final markdown, so the
+    agent would only add an LLM round trip. Returns None when the question needs the agent.
     """
+    parsed = structured_query_router.parse(question)
+    if parsed is None:
+        structured_query_router.record(bypassed=False)
+        return None
+    
     start_time = time.time()
+    try:
+        result = await category_filter_search.ainvoke(parsed.tool_args())
+    except Exception as e:
+        logger.warning(f"⚠️ Structured fast path failed, using the agent: {e}")
+        structured_query_router.record(bypassed=False)
+        return None
+    
+    structured_query_router.record(bypassed=True, seconds=time.time() - start_time)
+    logger.info(f"🎯 Structured query answered without the agent: {parsed}")
+    return result
+
+# --- Conversation History ---
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You keep a running summary of a chat between a restaurant customer and Lily, the restaurant's AI assistant.
+    Update the summary with the new messages. Keep what later questions may refer to: dishes discussed,
+    preferences, budget, dietary needs and open requests. Plain text, at most {max_words} words."""),
+    ("user", "Summary so far:\n{summary}\n\nNew messages:\n{messages}"),
+])
+
+async def _summarize_history(summary: str, messages: List[Dict[str, Any]]) -> str:
+    """Folds `messages` into the running summary with one short LLM call."""
+    transcript = "\n".join(
+        f"{'Customer' if message['role'] == 'user' else 'Lily'}: {message['text']}" for message in messages
+    )
+    # Runs in the background after the answer, so the request's deadline doesn't apply
+    with _stage("summary"), deadline_scope(None):
+        result = await (SUMMARY_PROMPT | get_chat_agent().llm).ainvoke({
+            "summary": summary or "(none yet)",
+            "messages": transcript,
+            "max_words": settings.CHAT_SUMMARY_MAX_TOKENS * 3 // 4,
+        })
+    return _chunk_text(result)
+
+# Each session's history lives server-side; the agent gets a summary + the latest messages
+conversation_history = ConversationHistory(
+    session_memory,
+    summarize=_summarize_history,
+    token_budget=settings.CHAT_HISTORY_TOKEN_BUDGET,
+    summary_max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+    compact_after=settings.CHAT_HISTORY_COMPACT_AFTER
+)
+
+async def _record_turn(session_id: str, question: str, answer: str, query_type: str, path: str, mode: str, start_time: float):
+    """
+    Adds the turn to the session's history (unless it failed) and hands its transcript to
+    the write-behind buffer. Never waits on the database; at most briefly on a full buffer.
+    """
+    if path != "error":
+        conversation_history.record_turn(session_id, question, answer)
+    if settings.TRANSCRIPTS_ENABLED:
+        await transcript_writer.record({
+            "session_id": session_id,
+            "question": question,
+            "answer": answer,
+            "query_type": query_type,
+            "path": path,
+            "mode": mode,
+            "latency_ms": round((time.time() - start_time) * 1000, 1),
+            "created_at": datetime.utcnow(),
+        })
+
+def _build_agent_input(session: Dict, question: str) -> Dict[str, Any]:
+    """Builds the agent's input from the question, the session's history and its context."""
+    # Summary of older turns, then the recent messages that fit in the token budget
+    summary, recent_messages = conversation_history.context(session)
+    history_messages = []
+    if summary:
+        history_messages.append(SystemMessage(content=f"Summary of the earlier conversation: {summary}"))
+    for message in recent_messages:
+        if message["role"] == "user":
+            history_messages.append(HumanMessage(content=message["text"]))
+        else:
+            history_messages.append(AIMessage(content=message["text"]))
+    
+    # Add session context to input
+    context_info = ""
+    if session['context']:
+        if 'user_preferences' in session['context']:
+            context_info = f"User preferences: {session['context']['user_preferences']}. "
+    
+    return {
+        # Enhanced input processing for better tool selection
+        "input": f"{context_info}{question}",
+        "chat_history": history_messages,
+        # Personalised inputs are never shared between sessions
+        "shareable": not context_info,
+        # The semantic cache is keyed on the question alone, so an answer that may
+        # depend on earlier turns ("how much is it?") must not be stored or reused
+        "cacheable": not context_info and not history_messages
+    }
+
+async def _lookup_cached_answer(question: str, cacheable: bool):
+    """
+    Semantic cache: reuse the answer to a near-identical recent question, as long as
+    the menu/FAQ data hasn't changed since. Returns (answer or None, question vector,
+    data version); the latter two are needed to store the agent's answer afterwards.
+    """
+    data_version = catalog_version.current
+    if not (settings.SEMANTIC_CACHE_ENABLED and cacheable):
+        return None, None, data_version
+    try:
+        with _stage("embedding"):
+            question_vector = await embedding_breaker.call(query_embedder.embed, normalize_question(question))
+    except Exception as e:
+        logger.warning(f"⚠️ Semantic cache lookup skipped: {e}")
+        return None, None, data_version
+
+    with _stage("semantic_cache"):
+        cached_answer = semantic_cache.lookup(question_vector, data_version)
+    if cached_answer:
+        logger.info(f"⚡ Semantic cache hit (similarity {cached_answer[1]:.3f})")
+        return cached_answer[0], question_vector, data_version
+    return None, question_vector, data_version
+
+def _remember_turn(session_id: str, query_type: str, question: str):
+    """Update session context based on query type."""
+    if query_type == 'menu_query':
+        session_memory.add_to_context(session_id, 'looking_for_food', True)
+        # Extract any mentioned price range for future context
+        price_match = re.search(r'(\d+)', question)
+        if price_match:
+            session_memory.add_to_context(session_id, 'budget_mentioned', int(price_match.group(1)))
+
+# Concurrent identical questions share one semantic cache lookup + agent run
+agent_flight = SingleFlight("agent")
+
+def _coalesce_key(question: str, agent_input: Dict[str, Any]) -> Optional[tuple]:
+    """
+    Requests may share an answer only when nothing session-specific went into it:
+    no personal context, and the same recent history (usually none, for a first question).
+    """
+    if not agent_input["shareable"]:
+        return None
+    history = tuple((type(message).__name__, message.content) for message in agent_input["chat_history"])
+    return (normalize_question(question), history)
+
+TOOL_ANSWER_INTRO = "⏱️ Here's what I found so far:"
+
+def _answer_from_tools(tool_outputs: List[Any]) -> Optional[str]:
+    """The tool results gathered for a question, rendered directly for when the LLM runs out of time."""
+    parts = []
+    for observation in tool_outputs:
+        if isinstance(observation, dict):
+            if observation.get("success") is False:
+                continue
+            text = render_detail_markdown(observation)
+        else:
+            text = str(observation).strip()
+        if text and text not in parts:
+            parts.append(text)
+    return f"{TOOL_ANSWER_INTRO}\n\n" + "\n\n".join(parts) if parts else None
+
+NO_LLM_ANSWER_INTRO = "🔎 I'm answering in quick-search mode right now. Here's what matches your question:"
+
+def _llm_available() -> bool:
+    """False while the circuit breakers of every chat model tier are open."""
+    return getattr(get_chat_agent().llm, "available", True)
+
+async def _answer_without_llm(question: str) -> str:
+    """
+    Answers while the chat models are unavailable: the tool the question's type calls
+    for, run directly (menu and FAQ searches fall back to keyword search themselves).
+    """
+    query_type = query_classifier.classify(question)
+    if query_type == 'restaurant_info':
+        result = await faq_search.ainvoke({"query": question})
+    elif query_type == 'promotion_query':
+        result = await promotion_lookup.ainvoke({})
+    else:
+        result = await menu_search.ainvoke({"query": question})
+    return f"{NO_LLM_ANSWER_INTRO}\n\n{result}"
+
+async def _run_agent(question: str, agent_input: Dict[str, Any]) -> Tuple[str, bool]:
+    """
+    Runs the agent within the current request deadline. Returns (answer, complete):
+    past the answer-by time, or when the deadline cuts the agent off, the answer is
+    built from the tool results gathered so far (complete=False), if there are any.
+    When the chat models' circuits open mid-run, it is answered without the LLM.
+    """
+    deadline = current_deadline()
+    run = asyncio.ensure_future(get_chat_agent().agent_executor.ainvoke({
+        "input": agent_input["input"],
+        "chat_history": agent_input["chat_history"]
+    }, config=AGENT_RUN_CONFIG))
+    try:
+        if deadline is not None:
+            done, _ = await asyncio.wait({run}, timeout=deadline.until_answer_by())
+            if not done:
+                answer = _answer_from_tools(deadline.tool_outputs)
+                if answer is not None:
+                    logger.warning(f"⏱️ Answer-by time reached, answering from {len(deadline.tool_outputs)} tool results")
+                    return answer, False
+                # Nothing to show yet: the agent may use the rest of the budget
+                done, _ = await asyncio.wait({run}, timeout=deadline.remaining())
+                if not done:
+                    raise DeadlineExceeded("request deadline reached")
+        response = await run
+        return response.get("output", "").strip(), True
+    except DeadlineExceeded as e:
+        answer = _answer_from_tools(deadline.tool_outputs) if deadline is not None else None
+        if answer is None:
+            raise
+        logger.warning(f"⏱️ {e}, answering from {len(deadline.tool_outputs)} tool results")
+        return answer, False
+    except CircuitOpenError as e:
+        logger.warning(f"🔌 {e}, answering without the LLM")
+        answer = _answer_from_tools(deadline.tool_outputs) if deadline is not None else None
+        return answer if answer is not None else await _answer_without_llm(question), False
+    finally:
+        if not run.done():
+            run.cancel()
+
+async def _answer_with_agent(question: str, agent_input: Dict[str, Any]) -> Tuple[str, bool]:
+    """
+    Answers from the semantic cache, or runs the agent and caches its answer.
+    Returns (answer, complete); see _run_agent. Skips the agent while the LLM is unavailable.
+    """
+    output, question_vector, data_version = await _lookup_cached_answer(question, agent_input["cacheable"])
+    if output is not None:
+        return output, True
+    if not _llm_available():
+        return await _answer_without_llm(question), False
+    
+    # Invoke agent
+    agent_start = time.time()
+    with _stage("agent"):
+        output, complete = await _run_agent(question, agent_input)
+    
+    # Answers cut short by the deadline aren't worth reusing
+    if output and complete and question_vector is not None:
+        semantic_cache.add(question_vector, output, data_version, time.time() - agent_start)
+    return output, complete
+
+async def get_ai_response(session_id: str, question: str, chat_history: Optional[List[Dict[str, Any]]] = None):
+    """
+    Enhanced service function with smart routing, memory, and structured responses.
+    The conversation so far is kept in the session; `chat_history` is only used by
+    older clients, to seed a session the server has no history for.
+    """
+    start_time = time.time()
+    deadline = Deadline(settings.CHAT_DEADLINE_SECONDS, settings.CHAT_ANSWER_BY_SECONDS)
     logger.info(f"🔄 Processing query for session {session_id}: {question[:50]}...")
     
-    # Get session memory
-    session = session_memory.get_session(session_id)
+    # Get session memory (refreshed from the shared store when one is configured)
+    with _stage("session"):
+        session = await session_memory.load(session_id)
     session_memory.add_to_context(session_id, 'last_query', question)
+    if chat_history:
+        conversation_history.seed(session_id, chat_history)
     
     # Smart classification for fast responses
-    query_type = query_classifier.classify(question)
+    with _stage("classification"):
+        query_type = query_classifier.classify(question)
     logger.info(f"🎯 Classified as: {query_type}")
     
     # Handle simple queries without tools
-    if query_type == 'greeting':
-        response = response_templates.greeting_response(session_id)
-        logger.info(f"✅ Fast greeting response in {time.time() - start_time:.2f}s")
-        return response
-    
-    elif query_type == 'how_are_you':
-        response = response_templates.how_are_you_response()
-        logger.info(f"✅ Fast how-are-you response in {time.time() - start_time:.2f}s")
-        return response
-    
-    elif query_type == 'goodbye':
-        response = response_templates.goodbye_response(session_id)
-        logger.info(f"✅ Fast goodbye response in {time.time() - start_time:.2f}s")
+    with _stage("fast_path"):
+        response = _fast_response(session_id, query_type)
+    if response is not None:
+        await _record_turn(session_id, question, response, query_type, "fast", "blocking", start_time)
+        CHAT_RESPONSE_SECONDS.observe(time.time() - start_time, path="fast", mode="blocking")
+        logger.info(f"✅ Fast {query_type} response in {time.time() - start_time:.2f}s")
         return response
     
     # For complex queries, use agent with context
     try:
-        # Convert recent chat history (keep memory light)
-        history_messages = []
-        for message in chat_history[-3:]:  # Only last 3 for speed
-            if message["sender"] == "user":
-                history_messages.append(HumanMessage(content=message["text"]))
-            else:
-                history_messages.append(AIMessage(content=message["text"]))
-        
-        # Add session context to input
-        context_info = ""
-        if session['context']:
-            if 'user_preferences' in session['context']:
-                context_info = f"User preferences: {session['context']['user_preferences']}. "
-        
-        # Enhanced input processing for better tool selection
-        enhanced_input = f"{context_info}{question}"
-        
-        # Check for category + price patterns to guide tool selection
-        category_price_pattern = r'(starter|appetizer|main|dessert|drink|beverage).*?(under|below|less than|within)\s*(\d+)'
-        if re.search(category_price_pattern, question.lower()):
-            logger.info("🎯 Detected category + price query - will use category_filter_search")
+        with _stage("structured"):
+            output = await _structured_response(question)
+        if output is not None:
+            _remember_turn(session_id, query_type, question)
+            await _record_turn(session_id, question, output, query_type, "structured", "blocking", start_time)
+            CHAT_RESPONSE_SECONDS.observe(time.time() - start_time, path="structured", mode="blocking")
+            logger.info(f"✅ Structured query response in {time.time() - start_time:.2f}s")
+            return output
         
-        # Invoke agent
-        response = await agent_executor.ainvoke({
-            "input": enhanced_input,
-            "chat_history": history_messages
-        })
-        
-        output = response.get("output", "").strip()
+        agent_input = _build_agent_input(session, question)
+        coalesce_key = _coalesce_key(question, agent_input)
+        with deadline_scope(deadline):
+            if coalesce_key is not None:
+                output, complete = await agent_flight.do(coalesce_key, lambda: _answer_with_agent(question, agent_input))
+            else:
+                output, complete = await _answer_with_agent(question, agent_input)
+        path = "agent" if complete else "tools"
         
         if not output:
-            output = "I apologize, I couldn't process that properly. Could you please rephrase your question?"
+            output = EMPTY_OUTPUT_RESPONSE
         
-        # Update session context based on query type
-        if query_type == 'menu_query':
-            session_memory.add_to_context(session_id, 'looking_for_food', True)
-            # Extract any mentioned price range for future context
-            price_match = re.search(r'(\d+)', question)
-            if price_match:
-                session_memory.add_to_context(session_id, 'budget_mentioned', int(price_match.group(1)))
+        _remember_turn(session_id, query_type, question)
+        await _record_turn(session_id, question, output, query_type, path, "blocking", start_time)
         
         total_time = time.time() - start_time
+        CHAT_RESPONSE_SECONDS.observe(total_time, path=path, mode="blocking")
         logger.info(f"✅ Complex query response in {total_time:.2f}s")
         
         return output
         
     except Exception as e:
+        CHAT_RESPONSE_SECONDS.observe(time.time() - start_time, path="error", mode="blocking")
         logger.error(f"❌ Error in get_ai_response: {e}")
-        fallback_responses = {
-            'menu_query': "I'm having trouble accessing our menu right now. Please try asking about specific food items or categories like 'pizza' or 'vegetarian options'.",
-            'restaurant_info': "I'm having trouble getting restaurant information. Please call us directly or visit our website for current hours and location details.",
-            'promotion_query': "I can't access current promotions right now. Please check our website or ask our staff about current deals!",
-            'general': "I'm experiencing some technical difficulties. Please try rephrasing your question or contact our restaurant directly for assistance."
-        }
+        fallback = FALLBACK_RESPONSES.get(query_type, FALLBACK_RESPONSES['general'])
+        await _record_turn(session_id, question, fallback, query_type, "error", "blocking", start_time)
+        return fallback
+
+def _chunk_text(chunk) -> str:
+    """Extracts the text of a streamed message chunk (Gemini may send a list of parts)."""
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+
+async def stream_ai_response(session_id: str, question: str, chat_history: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of get_ai_response. Yields events as they happen:
+    `tool_start`/`tool_end` while tools run, `token` for each piece of LLM output,
+    and a final `done` event carrying the complete answer.
+    """
+    start_time = time.time()
+    deadline = Deadline(settings.CHAT_DEADLINE_SECONDS, settings.CHAT_ANSWER_BY_SECONDS)
+    logger.info(f"🔄 Streaming query for session {session_id}: {question[:50]}...")
+    
+    with _stage("session"):
+        session = await session_memory.load(session_id)
+    session_memory.add_to_context(session_id, 'last_query', question)
+    if chat_history:
+        conversation_history.seed(session_id, chat_history)
+    
+    with _stage("classification"):
+        query_type = query_classifier.classify(question)
+    logger.info(f"🎯 Classified as: {query_type}")
+    
+    with _stage("fast_path"):
+        response = _fast_response(session_id, query_type)
+    if response is not None:
+        await _record_turn(session_id, question, response, query_type, "fast", "stream", start_time)
+        CHAT_RESPONSE_SECONDS.observe(time.time() - start_time, path="fast", mode="stream")
+        yield {"type": "token", "content": response}
+        yield {"type": "done", "answer": response}
+        return
+    
+    try:
+        with _stage("structured"):
+            output = await _structured_response(question)
+        if output is not None:
+            _remember_turn(session_id, query_type, question)
+            await _record_turn(session_id, question, output, query_type, "structured", "stream", start_time)
+            CHAT_RESPONSE_SECONDS.observe(time.time() - start_time, path="structured", mode="stream")
+            yield {"type": "token", "content": output}
+            yield {"type": "done", "answer": output}
+            return
+        
+        agent_input = _build_agent_input(session, question)
+        coalesce_key = _coalesce_key(question, agent_input)
+        complete = True
+        if coalesce_key is not None and agent_flight.in_flight(coalesce_key):
+            # An identical question is being answered right now: share that answer
+            with deadline_scope(deadline):
+                output, complete = await agent_flight.do(coalesce_key, lambda: _answer_with_agent(question, agent_input))
+        else:
+            output, question_vector, data_version = await _lookup_cached_answer(question, agent_input["cacheable"])
+        
+        if output is None and not _llm_available():
+            output = await _answer_without_llm(question)
+            complete = False
         
-        return fallback_responses.get(query_type, fallback_responses['general'])
+        if output is not None:
+            yield {"type": "token", "content": output}
+        else:
+            agent_start = time.time()
+            output = ""
+            streamed_tokens = False
+            events = get_chat_agent().agent_executor.astream_events(
+                {"input": agent_input["input"], "chat_history": agent_input["chat_history"]},
+                config=AGENT_RUN_CONFIG,
+                version="v2"
+            )
+            with deadline_scope(deadline):
+                try:
+                    # Past the answer-by time, stop at once if tool results can be shown and nothing was streamed yet
+                    async for event in iterate_within(events, deadline, lambda: not streamed_tokens and _answer_from_tools(deadline.tool_outputs) is not None):
+                        kind = event["event"]
+                        if kind == "on_chat_model_stream":
+                            text = _chunk_text(event["data"]["chunk"])
+                            if text:
+                                streamed_tokens = True
+                                yield {"type": "token", "content": text}
+                        elif kind == "on_tool_start":
+                            yield {"type": "tool_start", "tool": event["name"]}
+                        elif kind == "on_tool_end":
+                            yield {"type": "tool_end", "tool": event["name"]}
+                        elif kind == "on_chain_end" and not event.get("parent_ids"):
+                            # End of the top-level AgentExecutor run
+                            output = (event["data"].get("output") or {}).get("output", "").strip()
+                except DeadlineExceeded as e:
+                    # Half an answer can't be taken back; otherwise show the tool results instead
+                    output = None if streamed_tokens else _answer_from_tools(deadline.tool_outputs)
+                    if output is None:
+                        raise
+                    logger.warning(f"⏱️ {e}, answering from {len(deadline.tool_outputs)} tool results")
+                    complete = False
+                    streamed_tokens = False
+                except CircuitOpenError as e:
+                    if streamed_tokens:
+                        raise
+                    logger.warning(f"🔌 {e}, answering without the LLM")
+                    output = _answer_from_tools(deadline.tool_outputs) or await _answer_without_llm(question)
+                    complete = False
+            
+            # Models that don't support streaming only produce the final output
+            if output and not streamed_tokens:
+                yield {"type": "token", "content": output}
+            
+            CHAT_STAGE_SECONDS.observe(time.time() - agent_start, stage="agent")
+            if output and complete and question_vector is not None:
+                semantic_cache.add(question_vector, output, data_version, time.time() - agent_start)
+        
+        if not output:
+            output = EMPTY_OUTPUT_RESPONSE
+            yield {"type": "token", "content": output}
+        
+        path = "agent" if complete else "tools"
+        _remember_turn(session_id, query_type, question)
+        await _record_turn(session_id, question, output, query_type, path, "stream", start_time)
+        CHAT_RESPONSE_SECONDS.observe(time.time() - start_time, path=path, mode="stream")
+        logger.info(f"✅ Streamed complex query response in {time.time() - start_time:.2f}s")
+        yield {"type": "done", "answer": output}
+        
+    except Exception as e:
+        CHAT_RESPONSE_SECONDS.observe(time.time() - start_time, path="error", mode="stream")
+        logger.error(f"❌ Error in stream_ai_response: {e}")
+        fallback = FALLBACK_RESPONSES.get(query_type, FALLBACK_RESPONSES['general'])
+        await _record_turn(session_id, question, fallback, query_type, "error", "stream", start_time)
+        yield {"type": "error", "answer": fallback}
 
-logger.info("=== Enhanced Chat Agent Service Ready! ===")
+def get_service_stats() -> Dict[str, Any]:
+    """Collects runtime counters of the chat agent service for the owner dashboard."""
+    return {
+        "backends": {
+            "embedding": embedding_backend.stats(),
+            "embedding_batches": query_embedder.stats(),
+            "vector_query": vector_query_backend.stats(),
+        },
+        "embedding_cache": get_embedding_cache_store().stats() if settings.EMBEDDING_CACHE_ENABLED else None,
+        "menu_snapshot": menu_snapshot.stats(),
+        "query_cache": query_cache.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "coalescing": {
+            "agent": agent_flight.stats(),
+            "tools": tool_flight.stats(),
+        },
+        "sessions": session_memory.stats(),
+        "conversation_history": conversation_history.stats(),
+        "transcripts": transcript_writer.stats(),
+        "structured_router": structured_query_router.stats(),
+        "llm_tiers": dict(hedge_stats),
+        "circuit_breakers": breaker_stats(),
+    }
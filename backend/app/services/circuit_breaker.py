@@ -0,0 +1,164 @@
+# backend/app/services/circuit_breaker.py
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Numeric value of each state in the circuit_breaker_state gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = registry.gauge(
+    "circuit_breaker_state",
+    "State of each circuit breaker: 0 closed, 1 half-open (trial call), 2 open (failing fast)",
+    ["breaker"]
+)
+CIRCUIT_OPENED = registry.counter(
+    "circuit_breaker_opened_total",
+    "Times each circuit breaker opened",
+    ["breaker"]
+)
+CIRCUIT_REJECTED = registry.counter(
+    "circuit_breaker_rejected_total",
+    "Calls failed fast because their circuit breaker was open",
+    ["breaker"]
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a backend that keeps failing, so requests fail fast (and can use a
+    local fallback) instead of each waiting out the backend's timeout.
+
+    `failure_threshold` consecutive failures open the breaker. While open, calls are
+    rejected with CircuitOpenError. After `reset_timeout` seconds one trial call is let
+    through (half-open): its success closes the breaker, its failure opens it again.
+    Cancelled calls count as neither. The state can be read from any thread.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at = 0.0
+
+        # Counters exposed through stats()
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+
+        CIRCUIT_STATE.set_function(lambda: STATE_VALUES[self.state], breaker=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    @property
+    def available(self) -> bool:
+        """Whether a call would be let through now (without starting a trial call)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                return now - self._opened_at >= self.reset_timeout
+            # Half-open with a trial call in flight; a trial that never reported back is retried
+            return now - self._trial_started_at >= self.reset_timeout
+
+    def allow_request(self) -> bool:
+        """Reserves a call: True if it may go to the backend, else counts a rejection."""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._trial_started_at = now
+                return True
+            if self._state == HALF_OPEN and now - self._trial_started_at >= self.reset_timeout:
+                self._trial_started_at = now
+                return True
+            self.rejected += 1
+        CIRCUIT_REJECTED.inc(breaker=self.name)
+        return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"✅ Circuit '{self.name}' closed again")
+            self._state = CLOSED
+            self._consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            consecutive_failures = self._consecutive_failures
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._consecutive_failures >= self.failure_threshold):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.opened += 1
+                opened = True
+            else:
+                opened = False
+        if opened:
+            CIRCUIT_OPENED.inc(breaker=self.name)
+            logger.warning(f"🔌 Circuit '{self.name}' opened after {consecutive_failures} failures, "
+                           f"failing fast for {self.reset_timeout:g}s")
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Awaits `fn(*args, **kwargs)` through the breaker; raises CircuitOpenError while it is open."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(name, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+
+
+embedding_breaker = _breaker("embedding")
+vector_breaker = _breaker("vector-query")
+llm_breaker = _breaker("llm")
+llm_fallback_breaker = _breaker("llm-fallback")
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {breaker.name: breaker.stats() for breaker in (embedding_breaker, vector_breaker, llm_breaker, llm_fallback_breaker)}
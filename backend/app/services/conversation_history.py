@@ -0,0 +1,150 @@
+# backend/app/services/conversation_history.py
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.session_store import SessionMemory
+
+logger = logging.getLogger(__name__)
+
+# (previous summary, messages to fold into it) -> new summary
+Summarizer = Callable[[str, List[Dict[str, Any]]], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough to keep a budget."""
+    return len(text) // 4 + 1
+
+
+def _extractive_summary(summary: str, messages: List[Dict[str, Any]], max_tokens: int) -> str:
+    """Fallback when the summarizer is unavailable: keep what the customer asked, newest last."""
+    lines = [summary] if summary else []
+    lines.extend(f"Customer asked: {message['text'][:200]}" for message in messages if message["role"] == "user")
+    text = "\n".join(lines)
+    max_chars = max_tokens * 4
+    return text[-max_chars:] if len(text) > max_chars else text
+
+
+class ConversationHistory:
+    """
+    Each chat session's conversation, kept in the session itself so clients only send
+    the new question.
+
+    The agent sees a running summary plus as many of the latest messages as fit in
+    `token_budget`. Messages that no longer fit are folded into the summary by
+    `summarize`, in the background and only once at least `compact_after` of them have
+    piled up. The summary is stored with the session and updated from the previous
+    summary plus the newly dropped messages, never rebuilt from the whole conversation.
+    Folded messages are removed from the session, which keeps its size bounded.
+    """
+
+    def __init__(self, sessions: SessionMemory, summarize: Optional[Summarizer], token_budget: int,
+                 summary_max_tokens: int, compact_after: int):
+        self.sessions = sessions
+        self.summarize = summarize
+        self.token_budget = token_budget
+        self.summary_max_tokens = summary_max_tokens
+        self.compact_after = max(1, compact_after)
+        self._compacting: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.compactions = 0
+        self.summarizer_failures = 0
+        self.seeded = 0
+
+    @staticmethod
+    def _history(session: Dict) -> List[Dict[str, Any]]:
+        return session.setdefault('history', [])
+
+    def has_history(self, session: Dict) -> bool:
+        return bool(session.get('history') or session.get('summary'))
+
+    def seed(self, session_id: str, chat_history: List[Dict[str, Any]]):
+        """
+        Adopts a client-sent history (older clients, or a session that expired on the
+        server) when the server has none for this session.
+        """
+        session = self.sessions.get_session(session_id)
+        if self.has_history(session) or not chat_history:
+            return
+        history = self._history(session)
+        for message in chat_history:
+            text = message.get("text")
+            if isinstance(text, str) and text:
+                role = "user" if message.get("sender") == "user" else "assistant"
+                history.append({"role": role, "text": text, "tokens": estimate_tokens(text)})
+        self.sessions.update_session(session_id, 'history', history)
+        self.seeded += 1
+
+    def context(self, session: Dict) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        The summary and the most recent messages that fit in the token budget
+        (oldest first). Messages left out are compacted into the summary later.
+        """
+        summary = session.get('summary', "")
+        budget = self.token_budget - (estimate_tokens(summary) if summary else 0)
+        history = session.get('history', [])
+
+        recent = []
+        for message in reversed(history):
+            if message["tokens"] > budget and recent:
+                break
+            recent.append(message)
+            budget -= message["tokens"]
+        recent.reverse()
+        # Start at a question: an answer whose question was cut off reads as out of place
+        if recent and recent[0]["role"] != "user" and len(recent) < len(history):
+            recent.pop(0)
+        return summary, recent
+
+    def record_turn(self, session_id: str, question: str, answer: str):
+        """Appends a question and its answer, and compacts if enough has fallen out of the budget."""
+        session = self.sessions.get_session(session_id)
+        history = self._history(session)
+        history.append({"role": "user", "text": question, "tokens": estimate_tokens(question)})
+        history.append({"role": "assistant", "text": answer, "tokens": estimate_tokens(answer)})
+        self.sessions.update_session(session_id, 'history', history)
+
+        overflow = len(history) - len(self.context(session)[1])
+        if overflow >= self.compact_after and session_id not in self._compacting:
+            self._compacting.add(session_id)
+            task = asyncio.ensure_future(self._compact(session_id, overflow))
+            # Keep a reference until it finishes, otherwise the task may be garbage collected
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _compact(self, session_id: str, count: int):
+        try:
+            session = self.sessions.get_session(session_id)
+            previous = session.get('summary', "")
+            folded = list(self._history(session)[:count])
+            try:
+                if self.summarize is None:
+                    raise RuntimeError("no summarizer configured")
+                summary = (await self.summarize(previous, folded)).strip()
+                if not summary:
+                    raise ValueError("empty summary")
+            except Exception as e:
+                self.summarizer_failures += 1
+                logger.warning(f"⚠️ Summarizing history of session {session_id} failed, keeping an extractive summary: {e}")
+                summary = _extractive_summary(previous, folded, self.summary_max_tokens)
+
+            # Messages are only ever appended, so the folded ones are still the oldest
+            session = self.sessions.get_session(session_id)
+            history = self._history(session)
+            del history[:count]
+            session['summary'] = summary
+            self.sessions.update_session(session_id, 'history', history)
+            self.compactions += 1
+        finally:
+            self._compacting.discard(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "token_budget": self.token_budget,
+            "compactions": self.compactions,
+            "compacting": len(self._compacting),
+            "summarizer_failures": self.summarizer_failures,
+            "seeded_from_client": self.seeded,
+        }
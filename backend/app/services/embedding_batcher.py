@@ -0,0 +1,105 @@
+# backend/app/services/embedding_batcher.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.bounded_executor import BoundedBackend
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the batch-size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class EmbeddingBatcher:
+    """
+    Async micro-batcher for query embeddings. Concurrent `embed()` calls are collected
+    for up to `window` seconds, or until `max_batch_size` texts are waiting, then sent
+    to the embedding model as one batch on the embedding backend. Each caller gets
+    its own vector back. Identical texts in a batch are embedded once.
+    """
+
+    def __init__(self, embed_batch: Callable[[List[str]], List[List[float]]], backend: BoundedBackend,
+                 max_batch_size: int, window: float):
+        self.embed_batch = embed_batch
+        self.backend = backend
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = window
+
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.size_histogram: Dict[int, int] = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            # Keep a reference until it finishes, otherwise the task may be garbage collected
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        dispatched_at = time.perf_counter()
+        self._record(batch, dispatched_at)
+
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        try:
+            vectors = await self.backend.run(self.embed_batch, texts)
+        except Exception as e:
+            self.failed_batches += 1
+            logger.warning(f"⚠️ Embedding batch of {len(texts)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, vectors))
+        for text, future, _ in batch:
+            if not future.done():  # the caller may have been cancelled meanwhile
+                future.set_result(by_text[text])
+
+    def _record(self, batch, dispatched_at: float):
+        self.batches += 1
+        self.items += len(batch)
+        for _, _, enqueued_at in batch:
+            wait = dispatched_at - enqueued_at
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        bucket = next((bucket for bucket in BATCH_SIZE_BUCKETS if len(batch) <= bucket), BATCH_SIZE_BUCKETS[-1])
+        self.size_histogram[bucket] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "failed_batches": self.failed_batches,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": {f"<={bucket}": count for bucket, count in self.size_histogram.items()},
+            "avg_added_wait_ms": round(self.total_wait / self.items * 1000, 3) if self.items else 0.0,
+            "max_added_wait_ms": round(self.max_wait * 1000, 3),
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+        }
@@ -0,0 +1,210 @@
+# backend/app/services/embedding_cache.py
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace and case, so trivially different inputs share one entry."""
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def embed_query_batch(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    Embeds several queries in one call. Gemini embeds queries and documents with
+    different task types, so its batch endpoint is asked for query embeddings
+    explicitly; models that embed both alike just use embed_documents.
+    """
+    if hasattr(embeddings, "embed_queries"):
+        return embeddings.embed_queries(texts)
+    if len(texts) == 1:
+        return [embeddings.embed_query(texts[0])]
+    if isinstance(embeddings, GoogleGenerativeAIEmbeddings):
+        return embeddings.embed_documents(texts, task_type="RETRIEVAL_QUERY")
+    return embeddings.embed_documents(texts)
+
+
+class EmbeddingCacheStore:
+    """
+    Embedding vectors persisted in a local SQLite file, so they survive restarts and
+    deploys. Vectors are stored as raw float16 or float32 blobs. Entries are keyed by
+    model, kind ("query"/"document", which some providers embed differently) and
+    normalized text. When the table grows past max_entries, the least recently used
+    tenth is pruned.
+    """
+
+    def __init__(self, path: str, max_entries: int, dtype: str = "float16"):
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        self.path = path
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Embedding calls run on worker threads; access is serialised by self._lock
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, dtype TEXT NOT NULL, "
+                "vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def make_key(model: str, kind: str, text: str) -> str:
+        return hashlib.sha1(f"{model}\0{kind}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Returns the cached vectors among `keys` and marks them as recently used."""
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            placeholders = ",".join("?" * len(keys))
+            rows = connection.execute(
+                f"SELECT key, dtype, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+            for key, dtype, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=dtype).astype(np.float32).tolist()
+            if found:
+                now = time.time()
+                connection.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+                connection.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model: str, entries: Dict[str, List[float]]):
+        if not entries:
+            return
+        now = time.time()
+        rows = [
+            (key, model, self.dtype.name, np.asarray(vector, dtype=self.dtype).tobytes(), now)
+            for key, vector in entries.items()
+        ]
+        with self._lock:
+            connection = self._connect()
+            connection.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            self._prune(connection)
+            connection.commit()
+
+    def _prune(self, connection: sqlite3.Connection):
+        count = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # Prune below the limit, so the next few inserts don't each trigger a prune
+        excess = count - int(self.max_entries * 0.9)
+        connection.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self.pruned += excess
+        logger.info(f"🧹 Pruned {excess} least recently used embeddings from the cache")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "pruned": self.pruned,
+            "dtype": self.dtype.name,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding model with an EmbeddingCacheStore. Only texts missing from the
+    cache reach the wrapped model, in a single batch.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, store: EmbeddingCacheStore):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.store = store
+
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        keys = [self.store.make_key(self.model_name, kind, text) for text in texts]
+        try:
+            cached = self.store.get_many(list(dict.fromkeys(keys)))
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Embedding cache read failed, embedding directly: {e}")
+            cached = {}
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            if kind == "query":
+                computed = embed_query_batch(self.embeddings, list(missing.values()))
+            else:
+                computed = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing.keys(), computed))
+            try:
+                self.store.put_many(self.model_name, fresh)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Embedding cache write failed: {e}")
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query")[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "query")
+
+
+_store: Optional[EmbeddingCacheStore] = None
+
+
+def get_embedding_cache_store() -> EmbeddingCacheStore:
+    """The process-wide cache store, opened lazily."""
+    global _store
+    if _store is None:
+        _store = EmbeddingCacheStore(
+            settings.EMBEDDING_CACHE_PATH,
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            dtype=settings.EMBEDDING_CACHE_DTYPE,
+        )
+    return _store
+
+
+def with_embedding_cache(embeddings: Embeddings, model_name: str) -> Embeddings:
+    """Returns `embeddings` wrapped in the persistent cache, unless it is disabled."""
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return embeddings
+    return CachedEmbeddings(embeddings, model_name, get_embedding_cache_store())
@@ -0,0 +1,204 @@
+# backend/app/services/fuzzy_names.py
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from app.services.keyword_search import STOPWORDS
+
+# Common Hinglish spellings of dish words -> the spelling used on the menu
+TRANSLITERATIONS: Dict[str, str] = {
+    "paner": "paneer", "panir": "paneer", "panner": "paneer",
+    "biriyani": "biryani", "briyani": "biryani", "biriani": "biryani", "biryanee": "biryani",
+    "tika": "tikka", "tikkah": "tikka",
+    "makhni": "makhani", "makkhani": "makhani",
+    "daal": "dal", "dhal": "dal", "dall": "dal",
+    "channa": "chana", "chhole": "chole", "cholay": "chole",
+    "alu": "aloo", "aaloo": "aloo",
+    "gobhi": "gobi", "gobhee": "gobi",
+    "nan": "naan",
+    "lasi": "lassi", "lassy": "lassi",
+    "masaala": "masala", "massala": "masala",
+    "pulav": "pulao", "pilaf": "pulao",
+    "raitha": "raita",
+    "zeera": "jeera", "jira": "jeera",
+    "mutter": "matar", "mattar": "matar",
+    "kadhai": "kadai", "karahi": "kadai",
+    "pakoda": "pakora", "pakodi": "pakora",
+    "kurma": "korma",
+    "chay": "chai", "chaay": "chai",
+    "khir": "kheer",
+    "momo": "momos",
+}
+
+# Spelling differences that don't change how a word sounds ("ph"/"f", "ee"/"i", doubled letters)
+_PHONETIC = [
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"([bcdgkpst])h"), r"\1"),
+    (re.compile(r"ee|ie"), "i"),
+    (re.compile(r"oo|ou"), "u"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"q"), "k"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+_WORD = re.compile(r"[a-z0-9]+")
+# "non-veg" is one word here, so it never matches a search for "veg"
+_NON_VEG = re.compile(r"\bnon[\s-]*veg")
+
+
+def _raw_words(name: str) -> List[str]:
+    return _WORD.findall(_NON_VEG.sub("nonveg", name.lower()))
+
+
+def _word_key(word: str) -> str:
+    word = TRANSLITERATIONS.get(word, word)
+    for pattern, replacement in _PHONETIC:
+        word = pattern.sub(replacement, word)
+    return word
+
+
+def _words(name: str) -> List[str]:
+    """The phonetic keys of the words of `name`."""
+    return [_word_key(word) for word in _raw_words(name)]
+
+
+def normalize_name(name: str) -> str:
+    """A spelling-insensitive key for a dish name: "Paner Tika" and "Paneer Tikka" get the same one."""
+    return " ".join(_words(name))
+
+
+def allowed_typos(word: str) -> int:
+    """Edits a query word may be away from a name word: none for short words ("egg" is not "veg")."""
+    return 0 if len(word) <= 3 else 1 if len(word) <= 7 else 2
+
+
+def typo_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance between `a` and `b` counting a swap of adjacent letters as one edit
+    (optimal string alignment), or `limit` + 1 as soon as it must exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        # Later rows build on this one, or on the one before it plus a transposition
+        if min(current) > limit and min(previous) >= limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _trigrams(key: str) -> Counter:
+    padded = f"  {key} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class FuzzyNameIndex:
+    """
+    Typo- and transliteration-tolerant lookup of a name among a few thousand, in memory.
+
+    Names and queries are reduced to phonetic word keys (see normalize_name). A name
+    matches only if every word of the query matches one of its words, exactly or within
+    allowed_typos: "paner tika" finds "Paneer Tikka" and "biryani" finds "Mutton
+    Biryani", but "butter chicken" does not find "Butter Naan". Among the matches, the
+    name with the most of its words asked for and the fewest typos wins.
+
+    Near misses are not matches; suggest() offers them ("did you mean ...?"), ranked by
+    the Dice similarity of their character trigrams.
+    """
+
+    def __init__(self, names: Sequence[str], suggest_score: float = 0.5):
+        self.suggest_score = suggest_score
+        self._words = [_words(name) for name in names]
+        self._keys = [" ".join(words) for words in self._words]
+        self._compact: Dict[str, int] = {}
+        # word -> indexes of the names containing it
+        self._word_names: Dict[str, Set[int]] = {}
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        for index, (words, key) in enumerate(zip(self._words, self._keys)):
+            # Written together ("paneertikka") or apart, a name is the same name
+            self._compact.setdefault(key.replace(" ", ""), index)
+            for word in words:
+                self._word_names.setdefault(word, set()).add(index)
+            trigrams = _trigrams(key)
+            self._sizes.append(sum(trigrams.values()))
+            for trigram, count in trigrams.items():
+                self._postings.setdefault(trigram, []).append((index, count))
+
+    def _close_words(self, word: str) -> Dict[str, int]:
+        """Name words within the typos allowed for query word `word` -> their distance."""
+        if word in self._word_names:
+            return {word: 0}
+        limit = allowed_typos(word)
+        if not limit:
+            return {}
+        close = {}
+        for candidate in self._word_names:
+            distance = typo_distance(word, candidate, limit)
+            if distance <= limit:
+                close[candidate] = distance
+        return close
+
+    def match(self, query: str) -> Optional[Tuple[int, float]]:
+        """(index of the best matching name, score in (0, 1]), or None when no name has every query word."""
+        query_words = [_word_key(word) for word in _raw_words(query) if word not in STOPWORDS]
+        if not query_words:
+            return None
+        compact = self._compact.get("".join(query_words))
+        if compact is not None:
+            return compact, 1.0
+
+        candidates: Optional[Set[int]] = None
+        close_words = []
+        for word in query_words:
+            close = self._close_words(word)
+            names = set().union(*(self._word_names[candidate] for candidate in close))
+            candidates = names if candidates is None else candidates & names
+            if not candidates:
+                return None
+            close_words.append(close)
+
+        best: Optional[Tuple[int, float]] = None
+        for index in candidates:
+            name_words = self._words[index]
+            typos = sum(min(close.get(word, limit + 1) for word in name_words)
+                        for close, limit in zip(close_words, (allowed_typos(word) for word in query_words)))
+            covered = sum(1 for word in name_words if any(word in close for close in close_words))
+            score = covered / len(name_words) * 0.9 ** typos
+            # Ties go to the shorter name: "paneer tikka" over "paneer tikka masala"
+            if best is None or score > best[1] or (score == best[1] and self._sizes[index] < self._sizes[best[0]]):
+                best = (index, score)
+        return best
+
+    def suggest(self, query: str, limit: int = 3) -> List[int]:
+        """Indexes of up to `limit` names that look like `query` without matching it, most alike first."""
+        key = normalize_name(query)
+        if not key:
+            return []
+        trigrams = _trigrams(key)
+        query_size = sum(trigrams.values())
+        shared: Counter = Counter()
+        for trigram, count in trigrams.items():
+            for index, name_count in self._postings.get(trigram, ()):
+                shared[index] += min(count, name_count)
+        scored = [
+            (2.0 * overlap / (query_size + self._sizes[index]), index) for index, overlap in shared.items()
+        ]
+        scored = sorted((item for item in scored if item[0] >= self.suggest_score), key=lambda item: (-item[0], item[1]))
+        suggestions: List[int] = []
+        for _, index in scored:
+            # Menus repeat names across sizes and categories; suggest each once
+            if all(self._keys[index] != self._keys[other] for other in suggestions):
+                suggestions.append(index)
+            if len(suggestions) == limit:
+                break
+        return suggestions
@@ -0,0 +1,208 @@
+# backend/app/services/hedged_chat_model.py
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage, BaseMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.request_deadline import DeadlineExceeded, current_deadline
+
+logger = logging.getLogger(__name__)
+
+# The wrapper reports the call to the callbacks itself; the inner calls would report it again
+_INNER_CONFIG = {"callbacks": []}
+
+hedge_stats: Dict[str, int] = {
+    "calls": 0, "hedged": 0, "fallback_wins": 0, "primary_failures": 0, "deadline_exceeded": 0, "circuit_open": 0
+}
+
+
+def _as_chunk(message: BaseMessage) -> BaseMessageChunk:
+    """Models without streaming support "stream" one whole message; chunks are expected."""
+    if isinstance(message, BaseMessageChunk):
+        return message
+    return AIMessageChunk(
+        content=message.content,
+        additional_kwargs=message.additional_kwargs,
+        response_metadata=message.response_metadata,
+        id=message.id,
+        tool_call_chunks=[
+            {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+            for i, call in enumerate(getattr(message, "tool_calls", None) or [])
+        ],
+    )
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model calls bounded by the request deadline, with a second tier.
+
+    Each call goes to `primary`. If it hasn't answered (for streaming: sent its first
+    chunk) within `hedge_after` seconds, or it fails, the same call is also sent to
+    `fallback` (a cheaper, faster model; the primary itself when None) and the first
+    good answer wins, the other call is cancelled. Nothing waits past the request's
+    deadline: the call then raises DeadlineExceeded. `hedge_after` of 0 disables hedging.
+
+    Each tier may have a circuit breaker: a tier whose breaker is open is skipped (the
+    fallback is then called straight away), and with every tier open the call raises
+    CircuitOpenError at once. Failures, and calls still running at the deadline, count
+    against a tier's breaker; a call cancelled because the other tier won does not.
+    """
+
+    primary: Runnable
+    fallback: Optional[Runnable] = None
+    hedge_after: float = 0.0
+    primary_breaker: Optional[CircuitBreaker] = None
+    fallback_breaker: Optional[CircuitBreaker] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={
+            "primary": self.primary.bind_tools(tools, **kwargs),
+            "fallback": self.fallback.bind_tools(tools, **kwargs) if self.fallback is not None else None,
+        })
+
+    @property
+    def available(self) -> bool:
+        """False while the circuit breakers of all tiers are open."""
+        breakers = [self.primary_breaker] + ([self.fallback_breaker] if self.fallback is not None else [])
+        return any(breaker is None or breaker.available for breaker in breakers)
+
+    async def _race(self, call: Callable[[Runnable], Awaitable[Any]],
+                    discard: Optional[Callable[[Any], Awaitable[None]]] = None) -> Any:
+        """
+        Runs `call` on the primary, hedged with the fallback tier; returns the first success.
+        `discard` is awaited with the result of a call that also succeeded but lost.
+        """
+        deadline = current_deadline()
+        hedge_at = time.monotonic() + self.hedge_after if self.hedge_after > 0 else None
+        # Running calls -> the breaker of their tier
+        running: Dict[asyncio.Future, Optional[CircuitBreaker]] = {}
+        primary: Optional[asyncio.Future] = None
+        hedged = False
+        error: Optional[BaseException] = None
+        hedge_stats["calls"] += 1
+
+        def start(model: Runnable, breaker: Optional[CircuitBreaker]) -> Optional[asyncio.Future]:
+            nonlocal error
+            if breaker is not None and not breaker.allow_request():
+                hedge_stats["circuit_open"] += 1
+                error = error or CircuitOpenError(f"{breaker.name} is unavailable (circuit open)")
+                return None
+            task = asyncio.ensure_future(call(model))
+            running[task] = breaker
+            return task
+
+        def start_hedge():
+            nonlocal hedged
+            hedged = True
+            if self.fallback is not None:
+                task = start(self.fallback, self.fallback_breaker)
+            else:
+                task = start(self.primary, self.primary_breaker)
+            if task is not None:
+                hedge_stats["hedged"] += 1
+
+        primary = start(self.primary, self.primary_breaker)
+        if primary is None:
+            # The primary's circuit is open: go straight to the fallback tier, if there is one
+            if self.fallback is not None:
+                start_hedge()
+            if not running:
+                raise error
+
+        try:
+            while True:
+                waits = [deadline.remaining()] if deadline is not None else []
+                if not hedged and hedge_at is not None:
+                    waits.append(max(0.0, hedge_at - time.monotonic()))
+                done, _ = await asyncio.wait(running, timeout=min(waits) if waits else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    breaker = running.pop(task)
+                    if task.exception() is None:
+                        if breaker is not None:
+                            breaker.record_success()
+                        if task is not primary:
+                            hedge_stats["fallback_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+                    if breaker is not None:
+                        breaker.record_failure()
+                    if task is primary:
+                        hedge_stats["primary_failures"] += 1
+                        logger.warning(f"⚠️ Primary chat model failed: {error}")
+
+                if deadline is not None and deadline.expired:
+                    hedge_stats["deadline_exceeded"] += 1
+                    for breaker in running.values():
+                        if breaker is not None:
+                            breaker.record_failure()
+                    raise DeadlineExceeded("chat model call ran out of time")
+                if not hedged and (error is not None or (hedge_at is not None and time.monotonic() >= hedge_at)):
+                    start_hedge()
+                if not running:
+                    raise error
+        finally:
+            for task in running:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None and discard is not None:
+                    try:
+                        await discard(task.result())
+                    except Exception as e:
+                        logger.debug(f"Discarding a losing chat model call failed: {e}")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = await self._race(lambda model: model.ainvoke(messages, _INNER_CONFIG, stop=stop, **kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        # Synchronous callers (scripts) get the primary alone
+        message = self.primary.invoke(messages, _INNER_CONFIG, stop=stop, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        async def first_chunk(model: Runnable):
+            stream = model.astream(messages, _INNER_CONFIG, stop=stop, **kwargs).__aiter__()
+            try:
+                return await stream.__anext__(), stream
+            except StopAsyncIteration:
+                return None, stream
+            except BaseException:
+                # Failed, or cancelled because the other tier won: nobody else will close it
+                await stream.aclose()
+                raise
+
+        async def close_stream(result):
+            await result[1].aclose()
+
+        # Hedge on the time to the first chunk; once a tier is streaming, it finishes the answer.
+        # A tier that also sent its first chunk but lost is closed by the race.
+        chunk, stream = await self._race(first_chunk, discard=close_stream)
+        try:
+            while chunk is not None:
+                yield ChatGenerationChunk(message=_as_chunk(chunk))
+                deadline = current_deadline()
+                try:
+                    if deadline is None:
+                        chunk = await stream.__anext__()
+                    else:
+                        chunk = await asyncio.wait_for(stream.__anext__(), deadline.remaining())
+                except StopAsyncIteration:
+                    chunk = None
+                except asyncio.TimeoutError:
+                    hedge_stats["deadline_exceeded"] += 1
+                    raise DeadlineExceeded("chat model stream ran out of time")
+        finally:
+            await stream.aclose()
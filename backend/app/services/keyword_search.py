@@ -0,0 +1,105 @@
+# backend/app/services/keyword_search.py
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Words and Devanagari runs (vowel signs would otherwise split Hindi words)
+_TOKEN = re.compile(r"[\w\u0900-\u097F]+")
+# "non-veg" must not match a search for "veg"
+_NON_VEG = re.compile(r"\bnon[\s-]*veg")
+
+STOPWORDS = frozenset(
+    "a an and any are as at be can do does for from have i in is it me my of on or our "
+    "please show some tell that the their there these this to what whats which with you your "
+    "hai hain ka ke ki ko kya mein".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words without stopwords, plurals and -ing folded ("pizzas" -> "pizza", "opening" -> "open")."""
+    tokens = []
+    for token in _TOKEN.findall(_NON_VEG.sub("nonveg", str(text).lower())):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        if len(token) > 5 and token.endswith("ing"):
+            token = token[:-3]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over pre-tokenized documents, entirely in memory: the per-term weights of
+    every document are computed once, so a query is a few NumPy additions. Used as the
+    keyword half of the menu search, and alone while the embedding API or the vector
+    store is unavailable.
+    """
+
+    def __init__(self, documents: Sequence[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.size = len(documents)
+        lengths = np.array([len(tokens) for tokens in documents], dtype=np.float32)
+        average_length = float(lengths.mean()) if self.size and lengths.mean() > 0 else 1.0
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for doc_id, tokens in enumerate(documents):
+            for term, count in Counter(tokens).items():
+                ids, counts = postings.setdefault(term, ([], []))
+                ids.append(doc_id)
+                counts.append(count)
+
+        # term -> (document ids, BM25 weight of the term in each of them)
+        self._weights: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, (ids, counts) in postings.items():
+            ids = np.array(ids, dtype=np.int32)
+            tf = np.array(counts, dtype=np.float32)
+            idf = np.log(1.0 + (self.size - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = k1 * (1.0 - b + b * lengths[ids] / average_length)
+            self._weights[term] = (ids, (idf * tf * (k1 + 1.0) / (tf + norm)).astype(np.float32))
+
+    def scores(self, query: str) -> np.ndarray:
+        """The BM25 score of every document for `query` (0 where no term matches)."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._weights.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        return scores
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Up to `k` (document id, score) pairs matching `query`, best first."""
+        if k <= 0:
+            return []
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores)
+        if k < len(matched):
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        order = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in order]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], limit: int, k: int = 60,
+                           weights: Optional[Sequence[float]] = None) -> List[int]:
+    """
+    Merges rankings of document ids (best first) by reciprocal rank fusion: each document
+    scores the sum of weight / (k + rank) over the rankings it appears in (weight 1 unless
+    `weights` gives one per ranking). Returns the best `limit` ids. Only ranks are used,
+    so BM25 and cosine scores need no calibration.
+    """
+    weighted = [
+        (np.asarray(ranking, dtype=np.int64), weight)
+        for ranking, weight in zip(rankings, weights if weights is not None else [1.0] * len(rankings)) if len(ranking)
+    ]
+    if not weighted or limit <= 0:
+        return []
+    scores = np.zeros(max(int(ranking.max()) for ranking, _ in weighted) + 1, dtype=np.float64)
+    for ranking, weight in weighted:
+        np.add.at(scores, ranking, weight / (k + np.arange(1, len(ranking) + 1)))
+    ranked = np.flatnonzero(scores)
+    if limit < len(ranked):
+        ranked = ranked[np.argpartition(-scores[ranked], limit - 1)[:limit]]
+    return ranked[np.argsort(-scores[ranked], kind="stable")].tolist()
@@ -0,0 +1,175 @@
+# backend/app/services/local_vector_index.py
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+
+class LocalVectorIndex:
+    """
+    Exact nearest-neighbour index kept in one contiguous float32 matrix.
+
+    Rows are L2-normalised, so cosine similarity for every document is a single
+    matrix-vector product. For a restaurant-sized catalog (hundreds of rows) this
+    is far cheaper than a network round trip to a hosted vector database.
+    """
+
+    def __init__(self, vectors: np.ndarray, documents: List[Dict[str, Any]]):
+        if len(vectors) != len(documents):
+            raise ValueError("Every vector needs exactly one document")
+        self.vectors = vectors
+        self.documents = documents
+        # (vectors file, documents file) it was loaded from, if any
+        self.paths: Optional[Tuple[str, str]] = None
+
+    @staticmethod
+    def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @classmethod
+    def from_embeddings(cls, embeddings: Sequence[Sequence[float]], texts: List[str], metadatas: List[Dict[str, Any]]) -> "LocalVectorIndex":
+        if not texts:
+            return cls(np.zeros((0, 0), dtype=np.float32), [])
+        vectors = np.ascontiguousarray(cls._normalize_rows(np.asarray(embeddings, dtype=np.float32)))
+        documents = [{"page_content": text, "metadata": metadata} for text, metadata in zip(texts, metadatas)]
+        return cls(vectors, documents)
+
+    def search(self, query_vector: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """Returns (row, cosine similarity) of the k closest documents, best first."""
+        if not len(self.documents):
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        scores = self.vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top]
+
+    # --- Persistence ---
+    # Each save writes a new version directory holding both files, then points
+    # `{name}.current` at it with one rename, so a reader always gets a matching pair.
+    @staticmethod
+    def _pointer_path(directory: str, name: str) -> str:
+        return os.path.join(directory, f"{name}.current")
+
+    @classmethod
+    def current_paths(cls, directory: str, name: str) -> Tuple[str, str]:
+        """(vectors file, documents file) of the index's current version."""
+        try:
+            with open(cls._pointer_path(directory, name), encoding="utf-8") as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            # Written before versioned saves: a single pair next to the pointer's place
+            return os.path.join(directory, f"{name}.npy"), os.path.join(directory, f"{name}.json")
+        version_dir = os.path.join(directory, version)
+        return os.path.join(version_dir, "vectors.npy"), os.path.join(version_dir, "documents.json")
+
+    def save(self, directory: str, name: str, keep_versions: int = 2):
+        """
+        Writes the index as a new version and switches to it atomically (one rename).
+        The previous version is kept for readers still loading it; older ones are removed.
+        """
+        version = f"{name}.v{time.time_ns()}"
+        version_dir = os.path.join(directory, version)
+        os.makedirs(version_dir)
+        with open(os.path.join(version_dir, "vectors.npy"), "wb") as f:
+            np.save(f, self.vectors)
+        with open(os.path.join(version_dir, "documents.json"), "w", encoding="utf-8") as f:
+            json.dump(self.documents, f, ensure_ascii=False, default=str)
+
+        pointer_path = self._pointer_path(directory, name)
+        with open(pointer_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(pointer_path + ".tmp", pointer_path)
+
+        versions = sorted(
+            (entry for entry in os.listdir(directory)
+             if entry.startswith(f"{name}.v") and entry[len(name) + 2:].isdigit()),
+            key=lambda entry: int(entry[len(name) + 2:])
+        )
+        for old_version in versions[:-keep_versions]:
+            shutil.rmtree(os.path.join(directory, old_version), ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str, name: str, attempts: int = 3) -> "LocalVectorIndex":
+        """Loads the current version; the vectors are memory-mapped rather than read into the heap."""
+        for attempt in range(attempts):
+            paths = cls.current_paths(directory, name)
+            try:
+                with open(paths[1], encoding="utf-8") as f:
+                    documents = json.load(f)
+                vectors = np.load(paths[0], mmap_mode="r")
+            except FileNotFoundError:
+                # Newer saves removed this version after the pointer was read: follow it again
+                if attempt == attempts - 1 or cls.current_paths(directory, name) == paths:
+                    raise
+                continue
+            index = cls(vectors, documents)
+            index.paths = paths
+            return index
+
+    @classmethod
+    def exists(cls, directory: str, name: str) -> bool:
+        return all(os.path.exists(path) for path in cls.current_paths(directory, name))
+
+
+class LocalVectorStore:
+    """
+    Read side of a persisted LocalVectorIndex, with the subset of the vectorstore
+    API the chat tools use. Reloads the index when the sync job saves a new version:
+    the version pointer is re-read at most every `check_interval` seconds, or on the
+    next search after invalidate().
+    """
+
+    def __init__(self, directory: str, name: str, check_interval: float = 5.0):
+        self.directory = directory
+        self.name = name
+        self.check_interval = check_interval
+        self._index: Optional[LocalVectorIndex] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def stale(self) -> bool:
+        """Whether the next search reads files (the first load, or time to re-check the pointer)."""
+        return self._index is None or time.monotonic() - self._checked_at >= self.check_interval
+
+    def invalidate(self):
+        """Re-checks the version pointer on the next search; called when a sync in this process saved a new index."""
+        self._checked_at = 0.0
+
+    def _current_index(self) -> LocalVectorIndex:
+        if self.stale:
+            with self._lock:
+                if self.stale:
+                    paths = LocalVectorIndex.current_paths(self.directory, self.name)
+                    if self._index is None or paths != self._index.paths:
+                        self._index = LocalVectorIndex.load(self.directory, self.name)
+                        logger.info(f"📂 Loaded local vector index '{self.name}' ({len(self._index.documents)} documents)")
+                    self._checked_at = time.monotonic()
+        return self._index
+
+    def similarity_search_by_vector(self, embedding: Sequence[float], k: int = 4, namespace: Optional[str] = None, **kwargs) -> List[Document]:
+        return [document for document, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_by_vector_with_score(self, embedding: Sequence[float], k: int = 4) -> List[Tuple[Document, float]]:
+        index = self._current_index()
+        return [
+            (Document(page_content=index.documents[row]["page_content"], metadata=index.documents[row]["metadata"]), score)
+            for row, score in index.search(embedding, k)
+        ]
@@ -0,0 +1,159 @@
+# backend/app/services/menu_fragments.py
+# Markdown/JSON fragments the chat tools show for a menu item. They are rendered once
+# per item, when the menu snapshot is built or an item is written, so a tool
+# response is just a join of precomputed strings.
+
+from typing import Any, Dict, List
+
+
+def price_summary(pricing) -> tuple:
+    """Returns (min_price, price_display) for an item's pricing list."""
+    min_price = None
+    price_display = "Price not available"
+
+    if pricing and isinstance(pricing, list):
+        valid_prices = []
+        for p in pricing:
+            price_val = p.get('price')
+            if price_val and isinstance(price_val, (int, float)):
+                valid_prices.append({
+                    'size': p.get('size', 'Regular'),
+                    'price': price_val
+                })
+                if min_price is None or price_val < min_price:
+                    min_price = price_val
+
+        if valid_prices:
+            if len(valid_prices) == 1:
+                price_display = f"₹{valid_prices[0]['price']}"
+            else:
+                price_display = " | ".join(f"{p['size']}: ₹{p['price']}" for p in valid_prices)
+
+    return min_price, price_display
+
+
+def list_dietary_notes(item: dict) -> List[str]:
+    """Dietary badges shown next to an item in category listings."""
+    dietary_notes = []
+    dietary_info = item.get("dietary_info") or {}
+    tags = item.get("tags") or []
+
+    if dietary_info.get("is_vegan_available"):
+        dietary_notes.append("🌱 Vegan")
+    if dietary_info.get("is_gluten_free"):
+        dietary_notes.append("🌾 Gluten-free")
+
+    # Check tags for dietary info
+    if tags:
+        tag_lower_set = {str(tag).lower() for tag in tags}
+        if any(veg_tag in tag_lower_set for veg_tag in ["vegetarian", "veg"]):
+            dietary_notes.append("🥬 Vegetarian")
+        if "non-veg" in tag_lower_set or "nonveg" in tag_lower_set:
+            dietary_notes.append("🍖 Non-Veg")
+        if "spicy" in tag_lower_set:
+            dietary_notes.append("🌶️ Spicy")
+        if "popular" in tag_lower_set:
+            dietary_notes.append("⭐ Popular")
+
+    return dietary_notes
+
+
+def _detail_dietary_notes(item: dict) -> List[str]:
+    """Extract dietary information with emojis."""
+    dietary_notes = []
+    dietary_info = item.get("dietary_info") or {}
+    tags = item.get("tags") or []
+
+    if dietary_info.get("is_vegan_available"):
+        dietary_notes.append("🌱 Vegan option available")
+    if dietary_info.get("is_gluten_free"):
+        dietary_notes.append("🌾 Gluten-free")
+    if dietary_info.get("is_jain_available"):
+        dietary_notes.append("🙏 Jain option available")
+
+    # Check tags
+    tag_lower_set = {str(tag).lower() for tag in tags}
+    if any(tag in tag_lower_set for tag in ["vegetarian", "veg"]):
+        dietary_notes.append("🥬 Vegetarian")
+    if "non-veg" in tag_lower_set:
+        dietary_notes.append("🍖 Non-Vegetarian")
+    if "spicy" in tag_lower_set:
+        dietary_notes.append("🌶️ Spicy")
+
+    return dietary_notes if dietary_notes else ["ℹ️ No special dietary options"]
+
+
+def render_list_fragment(name: str, description: str, price_display: str, is_available: bool,
+                         category_name: str, prep_time: int, dietary_notes: List[str]) -> str:
+    """One item of a category_filter_search listing."""
+    availability = "✅ Available" if is_available else "❌ Unavailable"
+    dietary_str = " | ".join(dietary_notes[:3]) if dietary_notes else "ℹ️ No dietary info"
+
+    lines = [f"- **{name}**", f"  📝 {description}", f"  💰 {price_display}", f"  {availability}"]
+    if category_name:
+        lines.append(f"  📂 Category: {category_name}")
+    if prep_time > 0:
+        lines.append(f"  ⏱️ Prep time: {prep_time} minutes")
+    lines.append(f"  🏷️ {dietary_str}")
+    return "\n".join(lines) + "\n\n"
+
+
+def render_search_fragment(name: str, description: str, price_display: str, is_available: bool, category_name: str) -> str:
+    """One item of a menu_search result."""
+    availability = "✅ Available" if is_available else "❌ Currently unavailable"
+    return (
+        f"- **{name}**\n"
+        f"  📝 {description}\n"
+        f"  💰 {price_display}\n"
+        f"  📂 Category: {category_name or 'Menu Item'}\n"
+        f"  {availability}\n\n"
+    )
+
+
+def render_item_detail(item: dict) -> Dict[str, Any]:
+    """The structured answer exact_lookup returns for one item."""
+    name = item.get("name", "Unknown Item")
+    description = item.get("description", "No description available")
+
+    # Format pricing efficiently
+    price_str = "Not available"
+    pricing = item.get("pricing", [])
+    if pricing and isinstance(pricing, list):
+        price_parts = [f"{p.get('size', '')}: ₹{p.get('price', '')}"
+                      for p in pricing if p.get('size') and p.get('price')]
+        if price_parts:
+            price_str = ", ".join(price_parts)
+
+    # Availability with emoji
+    is_available = item.get("is_available", True)
+    availability_str = "✅ Available" if is_available else "❌ Currently unavailable"
+
+    # Preparation time
+    prep_time = item.get("prep_time_minutes")
+    prep_time_str = f"⏱️ {prep_time} minutes" if prep_time else "⏱️ Standard timing"
+
+    return {
+        "name": f"🍽️ {name}",
+        "description": description,
+        "price": f"💰 {price_str}",
+        "is_available": availability_str,
+        "preparation_time": prep_time_str,
+        "key_ingredients": item.get("key_ingredients", []),
+        "tags": item.get("tags", []),
+        "dietary_notes": _detail_dietary_notes(item),
+        "image_url": item.get("image_url"),
+        "customization_options": item.get("customization_options", []),
+        "success": True
+    }
+
+
+def render_detail_markdown(detail: Dict[str, Any]) -> str:
+    """An item detail from render_item_detail() as Markdown, for answers shown without the LLM."""
+    lines = [f"**{detail.get('name', 'Menu Item')}**"]
+    for key in ("description", "price", "is_available", "preparation_time"):
+        if detail.get(key):
+            lines.append(f"- {detail[key]}")
+    if detail.get("key_ingredients"):
+        lines.append(f"- 🥘 {', '.join(detail['key_ingredients'])}")
+    lines.extend(f"- {note}" for note in detail.get("dietary_notes") or [])
+    return "\n".join(lines)
@@ -0,0 +1,265 @@
+# backend/app/services/menu_snapshot.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.db.mongodb import get_database
+from app.services.fuzzy_names import FuzzyNameIndex
+from app.services.keyword_search import BM25Index, tokenize
+from app.services.menu_fragments import (
+    list_dietary_notes, price_summary, render_item_detail, render_list_fragment, render_search_fragment
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _dietary_flags(item: dict) -> FrozenSet[str]:
+    """Normalised dietary attributes used to filter listings ("vegan", "spicy", ...)."""
+    dietary_info = item.get("dietary_info") or {}
+    tags = {str(tag).lower() for tag in item.get("tags") or []}
+    flags = set()
+    if dietary_info.get("is_vegan_available"):
+        flags.add("vegan")
+    if dietary_info.get("is_gluten_free"):
+        flags.add("gluten-free")
+    if dietary_info.get("is_jain_available"):
+        flags.add("jain")
+    if tags & {"vegetarian", "veg"}:
+        flags.add("vegetarian")
+    if tags & {"non-veg", "nonveg"}:
+        flags.add("non-veg")
+    if "spicy" in tags:
+        flags.add("spicy")
+    return frozenset(flags)
+
+
+def build_snapshot_item(item: dict, category_name: str) -> Dict[str, Any]:
+    """Joins a menu item with its category name and precomputes everything the tools derive from it."""
+    min_price, price_display = price_summary(item.get('pricing', []))
+    name = item.get('name', 'Unknown')
+    description = item.get('description', 'Delicious item')
+    is_available = item.get('is_available', True)
+    prep_time = item.get('prep_time_minutes') or 0
+    dietary_notes = list_dietary_notes(item)
+    return {
+        'id': str(item.get('_id', '')),
+        'name': name,
+        'description': description,
+        'price_display': price_display,
+        'min_price': min_price,
+        'is_available': is_available,
+        'dietary_notes': dietary_notes,
+        'dietary_flags': _dietary_flags(item),
+        'category_id': str(item.get('category_id', '')),
+        'category_name': category_name,
+        'prep_time': prep_time,
+        # Lowercased copies for matching
+        'name_lower': item.get('name', '').lower(),
+        'category_lower': category_name.lower(),
+        'tags_lower': frozenset(str(tag).lower() for tag in item.get('tags') or []),
+        # Keyword search terms; the name counts three times
+        'search_tokens': (
+            tokenize(name) * 3 + tokenize(category_name) + tokenize(description)
+            + tokenize(" ".join(str(tag) for tag in item.get('tags') or []))
+            + tokenize(" ".join(str(ingredient) for ingredient in item.get('key_ingredients') or []))
+        ),
+        # Pre-rendered output of the chat tools
+        'list_md': render_list_fragment(name, description, price_display, is_available, category_name, prep_time, dietary_notes),
+        'search_md': render_search_fragment(name, description, price_display, is_available, category_name),
+        'detail': render_item_detail(item),
+        'doc': item,
+    }
+
+
+class MenuSnapshot:
+    """
+    Immutable, in-memory join of `menu_items` with `categories`, sorted by price, plus
+    the restaurant's FAQs. Lookups are memoised per snapshot, so repeated category
+    queries are dict hits. The keyword (BM25) and fuzzy name indexes are built on first search.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], version: int = 0, category_names: Optional[Dict[str, str]] = None,
+                 faqs: Optional[List[Dict[str, str]]] = None, built_at: Optional[float] = None):
+        self.items = sorted(items, key=lambda item: item['min_price'] or 0)
+        self.by_id = {item['id']: item for item in self.items}
+        self.positions = {item['id']: position for position, item in enumerate(self.items)}
+        self.category_names = category_names or {}
+        self.faqs = faqs or []
+        self.version = version
+        # When the data was last read in full: derived copies keep it, so the store still refreshes on age
+        self.built_at = built_at if built_at is not None else time.time()
+        self._category_matches: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+        self._menu_index: Optional[BM25Index] = None
+        self._faq_index: Optional[BM25Index] = None
+        self._name_index: Optional[FuzzyNameIndex] = None
+
+    def match_category(self, patterns: List[str]) -> List[Dict[str, Any]]:
+        """
+        Items whose category name or item name contains any pattern, or that carry a
+        pattern as a tag (case-insensitive). Results keep the snapshot's price order.
+        """
+        key = frozenset(pattern.lower() for pattern in patterns)
+        matches = self._category_matches.get(key)
+        if matches is None:
+            matches = [
+                item for item in self.items
+                if item['tags_lower'] & key
+                or any(pattern in item['category_lower'] or pattern in item['name_lower'] for pattern in key)
+            ]
+            self._category_matches[key] = matches
+        return matches
+
+    @property
+    def menu_index(self) -> BM25Index:
+        """BM25 index over the items' name, category, description, tags and key ingredients."""
+        if self._menu_index is None:
+            self._menu_index = BM25Index([item['search_tokens'] for item in self.items])
+        return self._menu_index
+
+    def keyword_search(self, query: str, k: int) -> List[Dict[str, Any]]:
+        """Up to `k` items matching the words of `query`, best match first."""
+        return [self.items[index] for index, _ in self.menu_index.search(query, k)]
+
+    @property
+    def name_index(self) -> FuzzyNameIndex:
+        if self._name_index is None:
+            self._name_index = FuzzyNameIndex([item['name'] for item in self.items])
+        return self._name_index
+
+    def match_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """The item whose name has every word of `name`, allowing typos and Hinglish spellings."""
+        match = self.name_index.match(name)
+        return self.items[match[0]] if match is not None else None
+
+    def suggest_names(self, name: str, limit: int = 3) -> List[str]:
+        """Names of items that look like `name` but didn't match it, for a "did you mean" reply."""
+        return [self.items[index]['name'] for index in self.name_index.suggest(name, limit)]
+
+    def faq_search(self, query: str, k: int) -> List[Dict[str, str]]:
+        """Up to `k` FAQs whose question or answer shares words with `query`, best match first."""
+        if self._faq_index is None:
+            self._faq_index = BM25Index([
+                tokenize(faq.get('question', '')) * 2 + tokenize(faq.get('answer', '')) for faq in self.faqs
+            ])
+        return [self.faqs[index] for index, _ in self._faq_index.search(query, k)]
+
+    def with_item(self, entry: Dict[str, Any], version: int) -> "MenuSnapshot":
+        """A copy with one item added or replaced; every other item keeps its rendered fragments."""
+        items = [item for item in self.items if item['id'] != entry['id']]
+        items.append(entry)
+        return MenuSnapshot(items, version, self.category_names, self.faqs, self.built_at)
+
+    def without_item(self, item_id: str, version: int) -> "MenuSnapshot":
+        return MenuSnapshot([item for item in self.items if item['id'] != item_id], version, self.category_names, self.faqs,
+                            self.built_at)
+
+    def with_faqs(self, faqs: List[Dict[str, str]], version: int) -> "MenuSnapshot":
+        return MenuSnapshot(self.items, version, self.category_names, faqs, self.built_at)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class MenuSnapshotStore:
+    """
+    Holds the current MenuSnapshot. Rebuilds replace it with a single reference swap,
+    so readers always see either the old or the new menu, never a mix. Snapshots
+    older than MENU_SNAPSHOT_MAX_AGE_SECONDS are refreshed in the background, which
+    also picks up writes handled by other workers.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self.snapshot: Optional[MenuSnapshot] = None
+        self.rebuilds = 0
+        self.updates = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def rebuild(self, db=None) -> MenuSnapshot:
+        async with self._lock:
+            start_time = time.perf_counter()
+            db = db if db is not None else await get_database()
+            categories = await db["categories"].find({}, {"name": 1}).to_list(length=None)
+            category_names = {str(category["_id"]): category.get("name", "") for category in categories}
+            items = await db["menu_items"].find({}).to_list(length=None)
+            restaurant = await db["restaurants"].find_one({}, {"faqs": 1})
+
+            snapshot = MenuSnapshot(
+                [build_snapshot_item(item, category_names.get(str(item.get("category_id")), "")) for item in items],
+                version=self.snapshot.version + 1 if self.snapshot else 1,
+                category_names=category_names,
+                faqs=(restaurant or {}).get("faqs") or []
+            )
+            self.snapshot = snapshot
+            self.rebuilds += 1
+            logger.info(f"📸 Menu snapshot rebuilt with {len(snapshot)} items in {(time.perf_counter() - start_time) * 1000:.1f}ms")
+            return snapshot
+
+    async def upsert_item(self, item: dict, db=None):
+        """
+        Renders a single created/updated item and swaps in a snapshot containing it,
+        so an item write doesn't re-render the whole menu. Before the first build
+        there is nothing to update; the first get() will load the item.
+        """
+        async with self._lock:
+            if self.snapshot is None:
+                return
+            category_id = str(item.get("category_id"))
+            category_name = self.snapshot.category_names.get(category_id)
+            if category_name is None:
+                db = db if db is not None else await get_database()
+                category = await db["categories"].find_one({"_id": ObjectId(category_id)}, {"name": 1}) if ObjectId.is_valid(category_id) else None
+                category_name = category.get("name", "") if category else ""
+            self.snapshot = self.snapshot.with_item(build_snapshot_item(item, category_name), self.snapshot.version + 1)
+            self.updates += 1
+
+    async def remove_item(self, item_id: str):
+        async with self._lock:
+            if self.snapshot is not None:
+                self.snapshot = self.snapshot.without_item(item_id, self.snapshot.version + 1)
+                self.updates += 1
+
+    async def set_faqs(self, faqs: List[Dict[str, str]]):
+        """Swaps in a snapshot with the restaurant's updated FAQs."""
+        async with self._lock:
+            if self.snapshot is not None:
+                self.snapshot = self.snapshot.with_faqs(faqs, self.snapshot.version + 1)
+                self.updates += 1
+
+    async def refresh(self, db=None):
+        """Rebuilds the snapshot, logging instead of raising. Used for background rebuilds."""
+        try:
+            await self.rebuild(db)
+        except Exception as e:
+            logger.error(f"❌ Menu snapshot rebuild failed, keeping the previous one: {e}")
+
+    async def get(self) -> MenuSnapshot:
+        """Returns the current snapshot, building it on first use."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            # Concurrent first callers share one build
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = asyncio.create_task(self.rebuild())
+            return await asyncio.shield(self._refresh_task)
+        if time.time() - snapshot.built_at > self.max_age and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            "items": len(snapshot) if snapshot else 0,
+            "faqs": len(snapshot.faqs) if snapshot else 0,
+            "rebuilds": self.rebuilds,
+            "item_updates": self.updates,
+            "age_seconds": round(time.time() - snapshot.built_at, 1) if snapshot else None,
+        }
+
+
+menu_snapshot = MenuSnapshotStore(max_age=settings.MENU_SNAPSHOT_MAX_AGE_SECONDS)
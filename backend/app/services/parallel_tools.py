@@ -0,0 +1,78 @@
+# backend/app/services/parallel_tools.py
+
+import asyncio
+from contextvars import ContextVar
+from typing import Optional
+
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentAction, AgentStep
+
+from app.core.metrics import registry
+from app.services.request_deadline import current_deadline
+
+TOOL_CALLS_PER_STEP = registry.histogram(
+    "chat_tool_calls_per_step",
+    "Tool calls the model made in one agent step (run concurrently)",
+    buckets=(1, 2, 3, 4, 6, 8)
+)
+
+# Tool call slots of the agent step being executed; the step's gathered tool tasks inherit it
+_step_slots: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("tool_step_slots", default=None)
+
+
+class ParallelToolAgentExecutor(AgentExecutor):
+    """
+    AgentExecutor that runs all tool calls of a step concurrently (the base class
+    gathers them in async runs), at most `max_parallel_tools` at a time. A request's
+    steps run one after another, so this is also the most tool calls a request has
+    in flight. Observations are returned in the order the model made the calls,
+    whichever finishes first, so the model reads them as it asked for them.
+
+    Under a request deadline, a tool call that runs out of time returns a timeout
+    observation instead, and every observation is also added to the deadline's
+    `tool_outputs`, for an answer built from them if the LLM runs out of time. That
+    happens here, in the calling request, after the tool returns: a tool call coalesced
+    with another request's (tool_flight) runs in that request's task, and its shared
+    result must reach every caller's deadline, not only the first one's.
+    """
+
+    max_parallel_tools: int = 4
+
+    async def _perform_within_deadline(self, name_to_tool_map, color_mapping, agent_action, run_manager):
+        deadline = current_deadline()
+        if deadline is None:
+            return await super()._aperform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+        try:
+            step = await asyncio.wait_for(
+                super()._aperform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager),
+                deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            return AgentStep(action=agent_action, observation=f"{agent_action.tool} did not finish in time.")
+        # This request's own deadline, even when the tool's work was shared with others
+        deadline.tool_outputs.append(step.observation)
+        return step
+
+    async def _aperform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None):
+        slots = _step_slots.get()
+        if slots is None:
+            return await self._perform_within_deadline(name_to_tool_map, color_mapping, agent_action, run_manager)
+        async with slots:
+            return await self._perform_within_deadline(name_to_tool_map, color_mapping, agent_action, run_manager)
+
+    async def _aiter_next_step(self, *args, **kwargs):
+        token = _step_slots.set(asyncio.Semaphore(max(1, self.max_parallel_tools)))
+        actions = 0
+        try:
+            async for item in super()._aiter_next_step(*args, **kwargs):
+                if isinstance(item, AgentAction):
+                    actions += 1
+                yield item
+        finally:
+            try:
+                _step_slots.reset(token)
+            except ValueError:
+                # Closed from another context (e.g. garbage collected mid-step); nothing to restore
+                pass
+        if actions:
+            TOOL_CALLS_PER_STEP.observe(actions)
@@ -0,0 +1,261 @@
+# backend/app/services/providers.py
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.core.config import settings
+from app.services.circuit_breaker import llm_breaker, llm_fallback_breaker
+from app.services.embedding_cache import with_embedding_cache
+from app.services.hedged_chat_model import HedgedChatModel
+from app.services.local_vector_index import LocalVectorIndex, LocalVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+# --- Deterministic local fakes (offline benchmarks and CI) ---
+class HashEmbeddings(Embeddings):
+    """
+    Bag-of-words embeddings from a stable hash of each word: no model and no network,
+    and the same vector for the same text in every process. Texts that share words get
+    similar vectors, so vector search and the semantic cache still behave sensibly.
+    `latency` seconds are slept per call to stand in for a remote embedding API.
+    """
+
+    def __init__(self, dimensions: int = 384, latency: float = 0.0):
+        self.dimensions = dimensions
+        self.latency = latency
+
+    def _vector(self, text: str) -> List[float]:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            vector[int.from_bytes(digest, "little") % self.dimensions] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def _compared_items(question: str) -> List[Dict[str, Any]]:
+    """"compare paneer tikka and dal makhani" -> one exact_lookup per dish."""
+    names = re.split(r"\s*(?:,|\band\b|\bvs\b\.?|\bversus\b|\bor\b)\s*", re.sub(r"\bcompare\b", "", question))
+    return [{"item_name": name.strip(" ?.!")} for name in names if name.strip(" ?.!")]
+
+
+# (pattern in the question, tool, arguments of each call) -- the first rule whose tool is bound wins
+DEFAULT_TOOL_RULES: List[Tuple[str, str, Callable[[str], List[Dict[str, Any]]]]] = [
+    (r"\b(compare|vs|versus)\b", "exact_lookup", _compared_items),
+    (r"\b(offer|offers|deal|deals|discount|promotion)", "promotion_lookup", lambda question: [{}]),
+    (r"\b(hour|hours|open|close|deliver|delivery|location|address|parking)\b", "faq_search", lambda question: [{"query": question}]),
+    (r"\b(how much is|price of|tell me about)\b", "exact_lookup",
+     lambda question: [{"item_name": re.sub(r".*\b(how much is|price of|tell me about)\b", "", question).strip(" ?.!")}]),
+    (r".", "menu_search", lambda question: [{"query": question}]),
+]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    A chat model that answers from a script instead of an API, for running the agent offline.
+
+    With `responses`, returns them in turn (cycling). Otherwise it acts like a tool-calling
+    model: the first call of an agent turn calls a bound tool (once or more, in one step)
+    by the first matching rule in `tool_rules`, and the call after the tools have run
+    answers with their outputs. Each
+    call takes `latency` seconds, to reproduce the LLM's share of a request's latency.
+    """
+
+    latency: float = 0.0
+    responses: List[str] = []
+    tool_rules: List[Tuple[str, str, Callable[[str], List[Dict[str, Any]]]]] = DEFAULT_TOOL_RULES
+    bound_tools: List[str] = []
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        names = [getattr(tool, "name", None) or getattr(tool, "__name__", str(tool)) for tool in tools]
+        return self.model_copy(update={"bound_tools": names})
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        call_number = self.calls
+        self.calls += 1
+        if self.responses:
+            return AIMessage(content=self.responses[call_number % len(self.responses)])
+
+        # Only the current turn counts: everything after the last human message
+        last_human = max((i for i, message in enumerate(messages) if isinstance(message, HumanMessage)), default=-1)
+        question = str(messages[last_human].content) if last_human >= 0 else ""
+        tool_outputs = [message for message in messages[last_human + 1:] if isinstance(message, ToolMessage)]
+        if tool_outputs:
+            found = "\n\n".join(str(message.content) for message in tool_outputs)
+            return AIMessage(content=f"Here's what I found:\n\n{found}")
+
+        for pattern, tool_name, make_calls in self.tool_rules:
+            if tool_name in self.bound_tools and re.search(pattern, question.lower()):
+                tool_calls = [
+                    {"name": tool_name, "args": args, "id": f"call_{hashlib.md5(f'{call_number}:{i}:{question}'.encode()).hexdigest()[:12]}"}
+                    for i, args in enumerate(make_calls(question.lower()))
+                ]
+                return AIMessage(content="", tool_calls=tool_calls)
+        # No tools bound (e.g. the history summarizer): a short deterministic answer
+        return AIMessage(content=f"Summary: {question[:200]}" if question else "OK")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+
+# --- Provider registry ---
+# name -> factory(model) returning (embeddings, name the embedding cache keys them by)
+EmbeddingFactory = Callable[[str], Tuple[Embeddings, str]]
+ChatModelFactory = Callable[[str], BaseChatModel]
+
+DEFAULT_EMBEDDING_MODELS = {
+    "gemini": "gemini-embedding-001",
+    "sentence-transformers": "all-MiniLM-L6-v2",
+    "hash": "hash",
+}
+DEFAULT_CHAT_MODELS = {
+    "gemini": "gemini-1.5-flash",
+    "scripted": "scripted",
+}
+
+
+def _gemini_embeddings(model: str) -> Tuple[Embeddings, str]:
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    return GoogleGenerativeAIEmbeddings(google_api_key=settings.GOOGLE_API_KEY, model=model), model
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """Adapts a local SentenceTransformer model to the Embeddings interface."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.encode(text).tolist()
+
+
+def _sentence_transformer_embeddings(model: str) -> Tuple[Embeddings, str]:
+    return SentenceTransformerEmbeddings(model), model
+
+
+def _hash_embeddings(model: str) -> Tuple[Embeddings, str]:
+    dimensions = settings.HASH_EMBEDDING_DIMENSIONS
+    return HashEmbeddings(dimensions, latency=settings.FAKE_EMBEDDING_LATENCY_SECONDS), f"hash-{dimensions}"
+
+
+def _gemini_chat_model(model: str) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        google_api_key=settings.GOOGLE_API_KEY,
+        model=model,
+        temperature=0.0,
+        convert_system_message_to_human=True,
+        request_timeout=10
+    )
+
+
+def _scripted_chat_model(model: str) -> BaseChatModel:
+    return ScriptedChatModel(latency=settings.FAKE_LLM_LATENCY_SECONDS)
+
+
+EMBEDDING_PROVIDERS: Dict[str, EmbeddingFactory] = {
+    "gemini": _gemini_embeddings,
+    "sentence-transformers": _sentence_transformer_embeddings,
+    "hash": _hash_embeddings,
+}
+CHAT_MODEL_PROVIDERS: Dict[str, ChatModelFactory] = {
+    "gemini": _gemini_chat_model,
+    "scripted": _scripted_chat_model,
+}
+
+
+def create_embeddings(provider: Optional[str] = None, model: Optional[str] = None, cached: bool = True) -> Embeddings:
+    """
+    The embedding model of `provider` (default: settings.EMBEDDING_PROVIDER), wrapped in
+    the persistent embedding cache unless `cached` is False.
+    """
+    provider = provider or settings.EMBEDDING_PROVIDER
+    factory = EMBEDDING_PROVIDERS.get(provider)
+    if factory is None:
+        raise ValueError(f"Unknown EMBEDDING_PROVIDER '{provider}'. Use one of: {', '.join(EMBEDDING_PROVIDERS)}.")
+    model = model or settings.EMBEDDING_MODEL or DEFAULT_EMBEDDING_MODELS[provider]
+    embeddings, cache_name = factory(model)
+    logger.info(f"✅ Embeddings: {provider} ({cache_name})")
+    return with_embedding_cache(embeddings, cache_name) if cached else embeddings
+
+
+def create_chat_model(provider: Optional[str] = None, model: Optional[str] = None) -> BaseChatModel:
+    """The chat model of `provider` (default: settings.CHAT_MODEL_PROVIDER)."""
+    provider = provider or settings.CHAT_MODEL_PROVIDER
+    factory = CHAT_MODEL_PROVIDERS.get(provider)
+    if factory is None:
+        raise ValueError(f"Unknown CHAT_MODEL_PROVIDER '{provider}'. Use one of: {', '.join(CHAT_MODEL_PROVIDERS)}.")
+    model = model or settings.CHAT_MODEL or DEFAULT_CHAT_MODELS[provider]
+    logger.info(f"✅ Chat model: {provider} ({model})")
+    return factory(model)
+
+
+
+def create_tiered_chat_model() -> BaseChatModel:
+    """
+    The agent's chat model: the configured one, hedged with the fallback tier
+    (FALLBACK_CHAT_MODEL_PROVIDER/FALLBACK_CHAT_MODEL), bounded by the request deadline
+    and with a circuit breaker per tier.
+    """
+    primary = create_chat_model()
+    fallback = None
+    if settings.FALLBACK_CHAT_MODEL_PROVIDER or settings.FALLBACK_CHAT_MODEL:
+        provider = settings.FALLBACK_CHAT_MODEL_PROVIDER or settings.CHAT_MODEL_PROVIDER
+        fallback = create_chat_model(provider, settings.FALLBACK_CHAT_MODEL or DEFAULT_CHAT_MODELS.get(provider))
+    return HedgedChatModel(
+        primary=primary,
+        fallback=fallback,
+        hedge_after=settings.LLM_HEDGE_AFTER_SECONDS,
+        primary_breaker=llm_breaker,
+        fallback_breaker=llm_fallback_breaker
+    )
+
+# Small catalogs can be served from the local index written by the sync job;
+# Pinecone remains the default and the fallback until that index exists.
+def create_vectorstore(embedding_model: Embeddings, namespace: str):
+    """The vectorstore for `namespace` selected by settings.VECTOR_STORE_MODE."""
+    if settings.VECTOR_STORE_MODE == "local":
+        if LocalVectorIndex.exists(settings.LOCAL_VECTOR_INDEX_DIR, namespace):
+            return LocalVectorStore(settings.LOCAL_VECTOR_INDEX_DIR, namespace, settings.LOCAL_VECTOR_INDEX_CHECK_SECONDS)
+        logger.warning(f"⚠️ No local vector index for '{namespace}' yet (run a sync first), using Pinecone")
+    from langchain_pinecone import PineconeVectorStore
+    return PineconeVectorStore(
+        index_name="restaurant-menu",
+        embedding=embedding_model,
+        namespace=namespace
+    )
@@ -0,0 +1,149 @@
+# backend/app/services/query_cache.py
+
+import logging
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds each namespace's entries stay valid. Promotions change more often than the menu.
+NAMESPACE_TTLS = {
+    "menu": 1800,
+    "category": 1800,
+    "faq": 3600,
+    "item": 1800,
+    "promotions": 900,
+}
+
+
+class _NamespaceStats:
+    __slots__ = ("hits", "misses", "evictions", "expirations", "entries", "bytes")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.entries = 0
+        self.bytes = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": self.entries,
+            "bytes": self.bytes,
+        }
+
+
+# --- Enhanced Cache System ---
+class QueryCache:
+    """
+    LRU cache for tool results with a TTL per namespace and a cap on total bytes.
+
+    Entries live in one OrderedDict in least-recently-used order, so a hit is a
+    move_to_end and eviction pops from the front: both O(1) regardless of size.
+    """
+
+    def __init__(self, max_bytes: int, namespace_ttls: Optional[Dict[str, float]] = None, default_ttl: float = 1800):
+        self.max_bytes = max_bytes
+        self.namespace_ttls = dict(NAMESPACE_TTLS if namespace_ttls is None else namespace_ttls)
+        self.default_ttl = default_ttl
+        # (namespace, key) -> (value, expires_at, size)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float, int]]" = OrderedDict()
+        self._stats: Dict[str, _NamespaceStats] = {}
+        self.total_bytes = 0
+
+    def _ns_stats(self, namespace: str) -> _NamespaceStats:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = _NamespaceStats()
+        return stats
+
+    @staticmethod
+    def _sizeof(key: Tuple[str, str], value: Any) -> int:
+        # getsizeof is O(1) for str/bytes, which is what the tools cache
+        return sys.getsizeof(key[1]) + sys.getsizeof(value)
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        stats = self._ns_stats(namespace)
+        entry_key = (namespace, key)
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            stats.misses += 1
+            return None
+
+        if entry[1] <= time.monotonic():
+            self._remove(entry_key)
+            stats.expirations += 1
+            stats.misses += 1
+            return None
+
+        self._entries.move_to_end(entry_key)
+        stats.hits += 1
+        logger.debug(f"Cache hit for {namespace}: {key[:50]}...")
+        return entry[0]
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        entry_key = (namespace, key)
+        if entry_key in self._entries:
+            self._remove(entry_key)
+
+        size = self._sizeof(entry_key, value)
+        if size > self.max_bytes:
+            logger.warning(f"Not caching {namespace} entry of {size} bytes (budget {self.max_bytes})")
+            return
+
+        ttl = self.namespace_ttls.get(namespace, self.default_ttl) if ttl is None else ttl
+        self._entries[entry_key] = (value, time.monotonic() + ttl, size)
+        stats = self._ns_stats(namespace)
+        stats.entries += 1
+        stats.bytes += size
+        self.total_bytes += size
+
+        # Evict least recently used entries until we are back under the byte budget
+        while self.total_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self._ns_stats(oldest_key[0]).evictions += 1
+
+    def _remove(self, entry_key: Tuple[str, str]):
+        _, _, size = self._entries.pop(entry_key)
+        stats = self._ns_stats(entry_key[0])
+        stats.entries -= 1
+        stats.bytes -= size
+        self.total_bytes -= size
+
+    def invalidate(self, namespace: str) -> int:
+        """Drops every entry of a namespace, e.g. after the underlying data was edited."""
+        keys = [entry_key for entry_key in self._entries if entry_key[0] == namespace]
+        for entry_key in keys:
+            self._remove(entry_key)
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        namespaces = {namespace: stats.as_dict() for namespace, stats in self._stats.items()}
+        hits = sum(stats.hits for stats in self._stats.values())
+        lookups = hits + sum(stats.misses for stats in self._stats.values())
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "evictions": sum(stats.evictions for stats in self._stats.values()),
+            "namespaces": namespaces,
+        }
+
+
+query_cache = QueryCache(max_bytes=settings.QUERY_CACHE_MAX_BYTES)
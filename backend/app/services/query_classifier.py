@@ -0,0 +1,99 @@
+# backend/app/services/query_classifier.py
+
+import re
+from typing import Dict, List, Tuple
+
+# Word boundaries that also hold inside Devanagari: `\b` treats vowel signs (matras)
+# as non-word characters, so it would split "नमस्ते" into several "words".
+_WORD_CHAR = r"[\w\u0900-\u097F]"
+_START = rf"(?<!{_WORD_CHAR})"
+_END = rf"(?!{_WORD_CHAR})"
+
+# Weights: 2 = unambiguous for the intent, 1 = typical, 0.5 = weak hint
+INTENT_PATTERNS: Dict[str, List[Tuple[str, float]]] = {
+    'greeting': [
+        (r'hi+|hello+|helo|hey+|good\s*(morning|afternoon|evening)|greetings?', 1),
+        (r'namaste|namaskar|pranam|salaam|ram\s*ram|नमस्ते|नमस्कार|प्रणाम|हेलो|हाय', 1),
+    ],
+    'goodbye': [
+        (r'bye+|goodbye|see\s*you|thanks?\s*(bye|goodbye)|have\s*a\s*good\s*(day|night)', 1),
+        (r'exit|quit|done|finished?', 0.5),
+        (r'alvida|phir\s*milenge|chal(ta|ti)\s*h(u+|oo)n?|tata|अलविदा|फिर\s*मिलेंगे|बाय', 1),
+    ],
+    'how_are_you': [
+        (r'how\s*are\s*(you|u)|how\s*do\s*you\s*do|how\s*is\s*it\s*going', 2),
+        (r'kaise\s*(ho|hain|hai)|kaisi\s*(ho|hain|hai)|kya\s*haal|क्या\s*हाल|कैसे\s*(हो|हैं)|कैसी\s*(हो|हैं)', 2),
+    ],
+    'menu_query': [
+        (r'menu|food|dish(es)?|eat|hungry|meal|cuisine|spicy|vegetarian|vegan|price|cost', 1),
+        (r'what.*?available|show.*?menu|recommend|suggest.*?food', 1),
+        (r'pizzas?|burgers?|chicken|rice|bread|desserts?|drinks?|beverages?|starters?|appetizers?', 1),
+        (r'(under|below|less\s*than|within).*?\d+.*?(rupees?|rs)', 1),
+        (r'₹\s*\d+|\d+\s*(rs|rupees?|₹)|\d+\s*(se\s*kam|ke\s*andar|tak)', 1),
+        (r'khana|khaana|khane|bhook|bhukh|teekha|tikha|shakahari|daam|keemat|kimat|mithai|meetha|thanda|peene', 1),
+        (r'biryani|paneer|dal|roti|naan|lassi|chai|samosa|kulfi|thali|tikka|curry|momos?', 1),
+        (r'मेनू|मेन्यू|खाना|खाने|भूख|तीखा|शाकाहारी|दाम|कीमत|रुपये|मिठाई|ठंडा|बिरयानी|पनीर', 1),
+    ],
+    'restaurant_info': [
+        (r'hours?|time|timings?|open|close[ds]?|location|address|phone|contact|delivery|takeout|parking', 1),
+        (r'where.*?located|how.*?reach|reservations?|book.*?table|table.*?book', 2),
+        (r'kab\s*(khulta|khulega|band)|khulta|kahan|kaha\s*(hai|ho)|pata\s*kya', 1),
+        (r'समय|खुलता|बंद|कहाँ|कहां|पता|डिलीवरी|बुकिंग', 1),
+    ],
+    'promotion_query': [
+        (r'deals?|discounts?|offers?|promotions?|coupons?|cheap|combo|cashback|promo\s*code', 2),
+        (r'any.*?offer|save.*?money|best.*?deal', 2),
+        (r'specials?', 0.5),
+        (r'chhoot|chhut|sasta|saste|sasti|ऑफर|छूट|सस्ता|सस्ते|डील', 2),
+    ],
+}
+
+# Intents that carry an actual request. When one of them scores, small talk in
+# the same message ("hi, any offers?") must not route it to a canned reply.
+CONTENT_INTENTS = ('promotion_query', 'restaurant_info', 'menu_query')
+
+# Tie-break order: the more specific intent wins, so "cheap pizza" is a promotion query
+INTENT_PRIORITY = ('promotion_query', 'restaurant_info', 'menu_query', 'how_are_you', 'goodbye', 'greeting')
+
+
+class QueryClassifier:
+    """
+    Single-pass intent classifier. Every keyword family of every intent is one named
+    group in a single compiled alternation, so a query is scanned once and each
+    match adds its family's weight to that intent's score.
+    """
+
+    def __init__(self, intent_patterns: Dict[str, List[Tuple[str, float]]] = INTENT_PATTERNS):
+        self.group_intents: Dict[str, Tuple[str, float]] = {}
+        alternatives = []
+        for intent, patterns in intent_patterns.items():
+            for i, (pattern, weight) in enumerate(patterns):
+                group = f"{intent}_{i}"
+                self.group_intents[group] = (intent, weight)
+                alternatives.append(f"(?P<{group}>{_START}(?:{pattern}){_END})")
+
+        self.pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+        self._priority = {intent: rank for rank, intent in enumerate(INTENT_PRIORITY)}
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Total keyword weight per intent; intents with no match are left out."""
+        scores: Dict[str, float] = {}
+        for match in self.pattern.finditer(query):
+            intent, weight = self.group_intents[match.lastgroup]
+            scores[intent] = scores.get(intent, 0.0) + weight
+        return scores
+
+    def rank(self, query: str) -> List[Tuple[str, float]]:
+        """Scored intents, best first. Content intents outrank small talk; ties follow INTENT_PRIORITY."""
+        scores = self.score(query)
+        return sorted(
+            scores.items(),
+            key=lambda item: (item[0] not in CONTENT_INTENTS, -item[1], self._priority.get(item[0], len(self._priority)))
+        )
+
+    def classify(self, query: str) -> str:
+        ranked = self.rank(query)
+        return ranked[0][0] if ranked else 'general'
+
+
+query_classifier = QueryClassifier()
@@ -0,0 +1,120 @@
+# backend/app/services/request_deadline.py
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The request's time budget ran out before the work finished."""
+
+
+class Deadline:
+    """
+    The time budget of one chat request, started when the request arrives.
+
+    `budget` seconds is the hard limit for every LLM and tool call made for the request.
+    `answer_by` seconds is when the request should stop waiting for the LLM and answer
+    from the tool output gathered so far (kept in `tool_outputs`, in completion order).
+    """
+
+    def __init__(self, budget: float, answer_by: Optional[float] = None):
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget
+        self.answer_by_at = self.started_at + min(budget if answer_by is None else answer_by, budget)
+        self.tool_outputs: List[Any] = []
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def until_answer_by(self) -> float:
+        return max(0.0, self.answer_by_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def past_answer_by(self) -> bool:
+        return time.monotonic() >= self.answer_by_at
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the request being handled, if any. Tasks started for it inherit it."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Makes `deadline` the current one inside the block (None: no deadline)."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        try:
+            _current_deadline.reset(token)
+        except ValueError:
+            # Left from another context (an async generator closed elsewhere); nothing to restore
+            pass
+
+
+def time_left(cap: Optional[float] = None) -> Optional[float]:
+    """Seconds left of the current deadline, at most `cap`; None when neither limits it."""
+    deadline = current_deadline()
+    if deadline is None:
+        return cap
+    return deadline.remaining() if cap is None else min(cap, deadline.remaining())
+
+
+async def iterate_within(items: AsyncIterator[T], deadline: Optional[Deadline],
+                         stop_at_answer_by: Callable[[], bool]) -> AsyncIterator[T]:
+    """
+    Yields from `items` until `deadline`, then raises DeadlineExceeded. Past the
+    answer-by time it raises as soon as `stop_at_answer_by()` is true, so the caller can
+    answer with what it has. Waiting for the next item never cancels it, so `items`
+    stays usable after a wait that only timed out at the answer-by time.
+    """
+    iterator = items.__aiter__()
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            if deadline is None:
+                timeout = None
+            elif deadline.past_answer_by:
+                if stop_at_answer_by():
+                    raise DeadlineExceeded("answer-by time reached")
+                timeout = deadline.remaining()
+            else:
+                timeout = deadline.until_answer_by()
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded("request deadline reached")
+                continue
+            try:
+                item = pending.result()
+            except StopAsyncIteration:
+                return
+            finally:
+                pending = None
+            yield item
+    finally:
+        if pending is not None:
+            # The generator can only be closed once the step in progress has stopped
+            pending.cancel()
+            try:
+                await pending
+            except BaseException:
+                pass
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
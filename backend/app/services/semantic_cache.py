@@ -0,0 +1,106 @@
+# backend/app/services/semantic_cache.py
+
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_PUNCTUATION = re.compile(r"[^\w\s₹]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercases and strips punctuation so trivial variations embed identically."""
+    question = _PUNCTUATION.sub(" ", question.lower())
+    return _WHITESPACE.sub(" ", question).strip()
+
+
+class SemanticAnswerCache:
+    """
+    Nearest-neighbour cache of recently answered questions.
+
+    Question embeddings are kept L2-normalised in one preallocated float32 matrix used
+    as a ring buffer, so a lookup is a single matrix-vector product (cosine similarity)
+    plus an argmax. Entries are only valid for the catalog version they were answered
+    against; when the version changes the whole cache is dropped.
+    """
+
+    def __init__(self, capacity: int, threshold: float, ttl: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl = ttl
+
+        self._matrix: Optional[np.ndarray] = None  # allocated on first add, once the dimension is known
+        self._expires_at = np.zeros(capacity, dtype=np.float64)
+        self._answers: List[Optional[str]] = [None] * capacity
+        self._latencies = np.zeros(capacity, dtype=np.float32)
+        self._size = 0
+        self._next = 0
+        self._version: Any = None
+
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+        self.lookup_time = 0.0
+
+    def _check_version(self, version: Any):
+        if version != self._version:
+            self._size = 0
+            self._next = 0
+            self._version = version
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, vector, version: Any) -> Optional[Tuple[str, float]]:
+        """Returns (answer, similarity) of the closest cached question above the threshold."""
+        start_time = time.perf_counter()
+        self._check_version(version)
+        match = None
+
+        if self._size:
+            similarities = self._matrix[:self._size] @ self._normalize(vector)
+            similarities[self._expires_at[:self._size] <= time.time()] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                match = (self._answers[best], float(similarities[best]))
+                self.latency_saved += float(self._latencies[best])
+
+        self.lookup_time += time.perf_counter() - start_time
+        if match is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return match
+
+    def add(self, vector, answer: str, version: Any, latency: float):
+        """Stores an answer together with how long the agent took to produce it."""
+        self._check_version(version)
+        vector = self._normalize(vector)
+        if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+            self._matrix = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+            self._size = 0
+            self._next = 0
+
+        slot = self._next
+        self._matrix[slot] = vector
+        self._answers[slot] = answer
+        self._latencies[slot] = latency
+        self._expires_at[slot] = time.time() + self.ttl
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "latency_saved_seconds": round(self.latency_saved, 2),
+            "avg_lookup_ms": round(self.lookup_time / lookups * 1000, 3) if lookups else 0.0,
+        }
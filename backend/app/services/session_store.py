@@ -0,0 +1,268 @@
+# backend/app/services/session_store.py
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+
+from pymongo import ReplaceOne
+
+from app.core.config import settings
+from app.db.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+
+def _new_session() -> Dict:
+    now = time.time()
+    return {
+        'created_at': now,
+        'last_active': now,
+        'context': {},
+        'preferences': {},
+        'recent_queries': [],
+        'conversation_stage': 'greeting'
+    }
+
+
+class _ExpiringDict:
+    """
+    Session dict ordered by last activity. Touching a session moves it to the end,
+    so expired sessions are always at the front and expiry pops them one by one
+    instead of scanning the whole store (O(1) amortized per request).
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        self.expire()
+        return self._data.get(session_id)
+
+    def put(self, session_id: str, session: Dict):
+        self._data[session_id] = session
+        self._data.move_to_end(session_id)
+
+    def touch(self, session_id: str):
+        if session_id in self._data:
+            self._data.move_to_end(session_id)
+
+    def expire(self) -> int:
+        cutoff = time.time() - self.ttl
+        expired = 0
+        while self._data:
+            session_id, session = next(iter(self._data.items()))
+            if session['last_active'] > cutoff:
+                break
+            self._data.popitem(last=False)
+            expired += 1
+        return expired
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# --- Session Backends ---
+class SessionBackend(ABC):
+    """Storage interface for chat sessions. Implementations must be safe to share between requests."""
+
+    shared = False  # True if other worker processes see the same sessions
+
+    @abstractmethod
+    async def load(self, session_id: str) -> Optional[Dict]:
+        """The stored session, or None if there is none (or it expired)."""
+
+    @abstractmethod
+    async def save_many(self, sessions: Dict[str, Dict]) -> None:
+        """Stores the given sessions, replacing any stored under the same ids."""
+
+    async def setup(self) -> None:
+        """Hook for one-time initialisation (indexes, connections)."""
+
+
+class InMemorySessionBackend(SessionBackend):
+    """Process-local sessions. Fast, but each uvicorn worker has its own copy."""
+
+    def __init__(self, ttl: float):
+        self._store = _ExpiringDict(ttl)
+
+    async def load(self, session_id: str) -> Optional[Dict]:
+        return self._store.get(session_id)
+
+    async def save_many(self, sessions: Dict[str, Dict]) -> None:
+        for session_id, session in sessions.items():
+            self._store.put(session_id, session)
+
+
+class MongoSessionBackend(SessionBackend):
+    """
+    Sessions shared by all workers, stored in a MongoDB collection with a TTL index
+    on `expires_at` so the server expires them without any scanning on our side.
+    Accepts any Motor-compatible database, which allows running it against a local
+    stand-in instead of a real cluster.
+    """
+
+    shared = True
+
+    def __init__(self, ttl: float, database=None, collection: str = "chat_sessions"):
+        self.ttl = ttl
+        self._database = database
+        self.collection_name = collection
+
+    async def _collection(self):
+        database = self._database if self._database is not None else await get_database()
+        return database[self.collection_name]
+
+    async def setup(self) -> None:
+        collection = await self._collection()
+        await collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def load(self, session_id: str) -> Optional[Dict]:
+        collection = await self._collection()
+        document = await collection.find_one({"_id": session_id})
+        if document is None:
+            return None
+        return document.get("data")
+
+    async def save_many(self, sessions: Dict[str, Dict]) -> None:
+        if not sessions:
+            return
+        collection = await self._collection()
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        operations = [
+            ReplaceOne({"_id": session_id}, {"data": session, "expires_at": expires_at}, upsert=True)
+            for session_id, session in sessions.items()
+        ]
+        await collection.bulk_write(operations, ordered=False)
+
+
+# --- Session Memory Store ---
+class SessionMemory:
+    """
+    Per-process working set of chat sessions in front of a SessionBackend.
+
+    Requests read and mutate sessions synchronously from the working set; changed
+    sessions are marked dirty and written to the backend in batches by a background
+    flusher, so a turn that updates several keys costs at most one backend write.
+    """
+
+    def __init__(self, backend: SessionBackend, ttl: float, flush_interval: float):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.sessions = _ExpiringDict(ttl)
+        self._dirty: set = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def load(self, session_id: str) -> Dict:
+        """
+        Loads a session into the working set. For a shared backend this refetches the
+        session so context written by another worker is picked up, unless this worker
+        holds unflushed changes for it.
+        """
+        if session_id in self._dirty or (not self.backend.shared and session_id in self.sessions):
+            return self.get_session(session_id)
+
+        try:
+            stored = await self.backend.load(session_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to load session {session_id}: {e}")
+            stored = None
+
+        if stored is not None:
+            self.sessions.put(session_id, stored)
+        return self.get_session(session_id)
+
+    def get_session(self, session_id: str) -> Dict:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = _new_session()
+            self.sessions.put(session_id, session)
+            self._dirty.add(session_id)
+        else:
+            self.sessions.touch(session_id)
+
+        session['last_active'] = time.time()
+        return session
+
+    def update_session(self, session_id: str, key: str, value: Any):
+        session = self.get_session(session_id)
+        session[key] = value
+        self._dirty.add(session_id)
+
+    def add_to_context(self, session_id: str, key: str, value: Any):
+        session = self.get_session(session_id)
+        session['context'][key] = value
+        self._dirty.add(session_id)
+
+    async def flush(self, session_ids: Optional[Iterable[str]] = None) -> int:
+        """Writes dirty sessions to the backend in a single batch."""
+        pending = set(session_ids) & self._dirty if session_ids is not None else set(self._dirty)
+        batch = {}
+        for session_id in pending:
+            self._dirty.discard(session_id)
+            session = self.sessions.get(session_id)
+            if session is not None:
+                batch[session_id] = session
+        if not batch:
+            return 0
+
+        try:
+            await self.backend.save_many(batch)
+        except Exception as e:
+            # Keep them dirty so the next flush retries
+            self._dirty.update(batch)
+            logger.error(f"❌ Failed to flush {len(batch)} sessions: {e}")
+            return 0
+        return len(batch)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        """Prepares the backend and starts the background flusher. Called from the app lifespan."""
+        await self.backend.setup()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stops the flusher and writes any remaining dirty sessions."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "working_set": len(self.sessions),
+            "dirty": len(self._dirty),
+        }
+
+
+def create_session_backend(kind: str, ttl: float) -> SessionBackend:
+    if kind == "mongo":
+        return MongoSessionBackend(ttl)
+    if kind == "memory":
+        return InMemorySessionBackend(ttl)
+    raise ValueError(f"Unknown SESSION_BACKEND '{kind}'. Use 'memory' or 'mongo'.")
+
+
+# Global session memory
+session_memory = SessionMemory(
+    create_session_backend(settings.SESSION_BACKEND, settings.SESSION_TTL_SECONDS),
+    ttl=settings.SESSION_TTL_SECONDS,
+    flush_interval=settings.SESSION_FLUSH_INTERVAL_SECONDS
+)
@@ -0,0 +1,90 @@
+# backend/app/services/singleflight.py
+
+import asyncio
+import functools
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _normalize_arg(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_arg(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _normalize_arg(item)) for key, item in value.items()))
+    return value
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller starts the work,
+    later callers with the same key await that same result instead of repeating it.
+    The work runs in its own task, so a caller that disconnects doesn't cancel it
+    for the others. Nothing is kept once the work finishes; caching is left to the
+    caches.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+        self.coalesced_by_name: Dict[str, int] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], name: Optional[str] = None) -> T:
+        """Runs `fn()` unless a call with this key is already running; `name` groups the stats."""
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+            name = name or self.name
+            self.coalesced_by_name[name] = self.coalesced_by_name.get(name, 0) + 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception even if every caller went away, so it isn't reported as lost
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Singleflight '{self.name}' call failed: {task.exception()}")
+
+    def coalesce(self, name: str):
+        """
+        Decorator for async functions: concurrent calls with the same (normalized)
+        arguments share one execution. Keyed by `name` plus the bound arguments.
+        """
+        def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            signature = inspect.signature(fn)
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = (name, tuple((arg, _normalize_arg(value)) for arg, value in bound.arguments.items()))
+                return await self.do(key, lambda: fn(*args, **kwargs), name)
+
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.executed + self.coalesced
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_rate": round(self.coalesced / calls, 4) if calls else 0.0,
+            "in_flight": len(self._in_flight),
+            "coalesced_by_name": dict(self.coalesced_by_name),
+        }
@@ -0,0 +1,153 @@
+# backend/app/services/structured_query_router.py
+
+import re
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# Words that name a whole menu category, mapped to the category passed to
+# category_filter_search. Dish names ("biryani", "lassi") are deliberately absent:
+# those questions are about specific items and stay with the agent.
+CATEGORY_ALIASES = {
+    'starter': 'starters', 'starters': 'starters', 'appetizer': 'starters', 'appetizers': 'starters',
+    'snack': 'starters', 'snacks': 'starters',
+    'main': 'mains', 'mains': 'mains', 'main course': 'mains', 'main courses': 'mains',
+    'dessert': 'desserts', 'desserts': 'desserts', 'sweet': 'desserts', 'sweets': 'desserts',
+    'meetha': 'desserts', 'mithai': 'desserts',
+    'drink': 'drinks', 'drinks': 'drinks', 'beverage': 'drinks', 'beverages': 'drinks', 'thanda': 'drinks',
+    'pizza': 'pizza', 'pizzas': 'pizza',
+    'chinese': 'chinese',
+    'paneer': 'paneer',
+}
+
+DIETARY_ALIASES = {
+    'non veg': 'non-veg', 'non-veg': 'non-veg', 'nonveg': 'non-veg', 'non vegetarian': 'non-veg', 'non-vegetarian': 'non-veg',
+    'veg': 'vegetarian', 'vegetarian': 'vegetarian', 'pure veg': 'vegetarian', 'shakahari': 'vegetarian',
+    'vegan': 'vegan',
+    'gluten free': 'gluten-free', 'gluten-free': 'gluten-free',
+    'jain': 'jain',
+    'spicy': 'spicy', 'teekha': 'spicy', 'tikha': 'spicy',
+}
+
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+}
+
+# Filler that may surround a structured request without changing its meaning.
+# Anything else left over makes the parse unconfident and the query goes to the agent.
+FILLER_WORDS = frozenset("""
+    a an the some any all only just me i we us you your do does have has is are there
+    what which show list give get see find want need would like can could please pls plz
+    items item dishes dish options option food menu on in of for from with available
+    and price prices under below rupees rs
+    kya hai hain mein me ke ka ki ko wale wala wali sirf mujhe hume chahiye dikhao batao bataiye
+    do de dijiye kuch aapke apke yahan
+""".split())
+
+MAX_LIMIT = 20
+
+
+def _alternation(words) -> str:
+    # Longest first, so "non veg" wins over "veg" and "main course" over "main"
+    return "|".join(re.escape(word).replace(r"\ ", r"[\s-]+") for word in sorted(words, key=len, reverse=True))
+
+
+_NUMBER = rf"(\d{{1,2}}|{_alternation(NUMBER_WORDS)})"
+_CATEGORY_RE = re.compile(rf"\b({_alternation(CATEGORY_ALIASES)})\b")
+_DIETARY_RE = re.compile(rf"\b({_alternation(DIETARY_ALIASES)})\b")
+_PRICE_RES = [
+    re.compile(r"(?:under|below|less\s+than|within|up\s*to|max(?:imum)?|not\s+more\s+than|<=?)\s*(?:₹|rs\.?|inr)?\s*(\d+)\s*(?:₹|rs\.?|rupees?|/-)?"),
+    re.compile(r"(?:₹|rs\.?)?\s*(\d+)\s*(?:₹|rs\.?|rupees?|/-)?\s*(?:se\s+kam|ke\s+andar|tak|or\s+less|and\s+below|or\s+below)"),
+]
+_LIMIT_RES = [
+    re.compile(rf"\b(?:list|top|show(?:\s+me)?|give(?:\s+me)?|first|suggest)\s+{_NUMBER}\b"),
+    re.compile(rf"\b{_NUMBER}\s+(?=(?:items?|dishes|options|{_alternation(CATEGORY_ALIASES)}|{_alternation(DIETARY_ALIASES)})\b)"),
+]
+_WORD_RE = re.compile(r"[a-z]+|\d+")
+
+
+class StructuredQuery(NamedTuple):
+    category: str
+    max_price: Optional[int] = None
+    dietary: Tuple[str, ...] = ()
+    limit: Optional[int] = None
+
+    def tool_args(self) -> Dict[str, Any]:
+        """Arguments for category_filter_search."""
+        return {
+            "category": self.category,
+            "max_price": self.max_price,
+            "dietary": list(self.dietary) or None,
+            "limit": self.limit,
+        }
+
+
+def _number(value: str) -> int:
+    return int(value) if value.isdigit() else NUMBER_WORDS[value]
+
+
+class StructuredQueryRouter:
+    """
+    Recognises menu questions that are fully described by a category plus optional
+    price bound, dietary constraints and result count ("veg starters under 200",
+    "list 5 desserts", "200 se kam drinks"). Those can be answered by calling
+    category_filter_search directly, without a round trip through the LLM.
+
+    A parse is only returned when every word of the question is accounted for, so
+    anything that needs judgement ("which starter goes well with biryani") still
+    goes to the agent.
+    """
+
+    def __init__(self):
+        self.bypassed = 0
+        self.declined = 0
+        self.bypass_time = 0.0
+
+    def parse(self, question: str) -> Optional[StructuredQuery]:
+        text = question.lower()
+
+        categories = {CATEGORY_ALIASES[re.sub(r"[\s-]+", " ", m)] for m in _CATEGORY_RE.findall(text)}
+        if len(categories) != 1:
+            return None
+
+        max_price = None
+        for pattern in _PRICE_RES:
+            match = pattern.search(text)
+            if match:
+                max_price = int(match.group(1))
+                text = text[:match.start()] + " " + text[match.end():]
+                break
+
+        limit = None
+        for pattern in _LIMIT_RES:
+            match = pattern.search(text)
+            if match:
+                limit = min(_number(match.group(1)), MAX_LIMIT)
+                text = text[:match.start()] + " " + text[match.end():]
+                break
+
+        dietary = tuple(sorted({DIETARY_ALIASES[re.sub(r"[\s-]+", " ", m)] for m in _DIETARY_RE.findall(text)}))
+
+        remainder = _DIETARY_RE.sub(" ", _CATEGORY_RE.sub(" ", text))
+        if any(word not in FILLER_WORDS for word in _WORD_RE.findall(remainder)):
+            return None
+
+        return StructuredQuery(category=categories.pop(), max_price=max_price, dietary=dietary, limit=limit or None)
+
+    def record(self, bypassed: bool, seconds: float = 0.0):
+        if bypassed:
+            self.bypassed += 1
+            self.bypass_time += seconds
+        else:
+            self.declined += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.bypassed + self.declined
+        return {
+            "bypassed": self.bypassed,
+            "declined": self.declined,
+            "bypass_rate": round(self.bypassed / total, 4) if total else 0.0,
+            "avg_bypass_ms": round(self.bypass_time / self.bypassed * 1000, 2) if self.bypassed else 0.0,
+        }
+
+
+structured_query_router = StructuredQueryRouter()
@@ -1,39 +1,38 @@
 from pymongo import MongoClient
 from pinecone import Pinecone
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain.storage import InMemoryStore
 from langchain_pinecone import PineconeVectorStore
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain.retrievers import ParentDocumentRetriever
 from langchain_core.documents import Document
 from app.core.config import settings
+from app.services.local_vector_index import LocalVectorIndex
+from app.services.providers import create_embeddings
+
+def build_local_index(embeddings_model, docs):
+    """Embeds whole documents (no child splitting, the catalog is small) into a LocalVectorIndex."""
+    texts = [doc.page_content for doc in docs]
+    vectors = embeddings_model.embed_documents(texts)
+    return LocalVectorIndex.from_embeddings(vectors, texts, [doc.metadata for doc in docs])
 
 def run_sync():
     """
-    Clears and syncs all data types to Pinecone using Google's Gemini embedding model.
+    Clears and syncs all data types to Pinecone (or the local index) using the configured
+    embedding provider, the same one the chat agent embeds queries with.
     This version safely handles the initial sync without trying to delete non-existent namespaces.
     """
-    print("--- Starting full data synchronization with Pinecone (using Gemini Embeddings) ---")
+    print(f"--- Starting full data synchronization with Pinecone (using {settings.EMBEDDING_PROVIDER} embeddings) ---")
     
     # --- 1. Initialize Components ---
     mongo_client = MongoClient(settings.MONGO_URI)
     db = mongo_client["restaurentDB"]
-    embeddings_model = GoogleGenerativeAIEmbeddings(google_api_key=settings.GOOGLE_API_KEY, model="gemini-embedding-001")
-    pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-    index = pc.Index("restaurant-menu")
+    embeddings_model = create_embeddings()
+    if settings.VECTOR_STORE_MODE != "local":
+        pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+        index = pc.Index("restaurant-menu")
 
     # --- 2. Sync Menu Items ---
     print("\n--- Syncing Menu Items ---")
-    # --- THIS IS THE FIX: We no longer need to delete beforehand ---
-    # index.delete(delete_all=True, namespace="menu-items") 
-    
-    menu_vectorstore = PineconeVectorStore(index_name="restaurant-menu", embedding=embeddings_model, namespace="menu-items")
-    menu_retriever = ParentDocumentRetriever(
-        vectorstore=menu_vectorstore,
-        docstore=InMemoryStore(),
-        child_splitter=RecursiveCharacterTextSplitter(chunk_size=400)
-    )
-    
     menu_items = list(db.menu_items.find({"is_available": True}))
     menu_docs = [
         Document(
@@ -41,22 +40,34 @@ def run_sync():
             metadata={"doc_id": str(item["_id"]), "name": item["name"], "description": item["description"], "price_full": next((p['price'] for p in item.get('pricing', []) if p.get('size') == 'Full'), 0)}
         ) for item in menu_items
     ]
-    if menu_docs:
-        menu_retriever.add_documents(menu_docs, ids=None)
-        print(f"✅ Synced {len(menu_docs)} menu items.")
+
+    if settings.VECTOR_STORE_MODE == "local":
+        # The local index can carry the full item details the chat tools display
+        category_names = {str(c["_id"]): c.get("name", "") for c in db.categories.find({}, {"name": 1})}
+        for doc, item in zip(menu_docs, menu_items):
+            doc.metadata.update({
+                "pricing": item.get("pricing", []),
+                "is_available": item.get("is_available", True),
+                "category": category_names.get(str(item.get("category_id")), "Menu Item"),
+            })
+        build_local_index(embeddings_model, menu_docs).save(settings.LOCAL_VECTOR_INDEX_DIR, "menu-items")
+        print(f"✅ Wrote {len(menu_docs)} menu items to the local vector index.")
+    else:
+        # --- THIS IS THE FIX: We no longer need to delete beforehand ---
+        # index.delete(delete_all=True, namespace="menu-items") 
+        
+        menu_vectorstore = PineconeVectorStore(index_name="restaurant-menu", embedding=embeddings_model, namespace="menu-items")
+        menu_retriever = ParentDocumentRetriever(
+            vectorstore=menu_vectorstore,
+            docstore=InMemoryStore(),
+            child_splitter=RecursiveCharacterTextSplitter(chunk_size=400)
+        )
+        if menu_docs:
+            menu_retriever.add_documents(menu_docs, ids=None)
+            print(f"✅ Synced {len(menu_docs)} menu items.")
 
     # --- 3. Sync FAQs ---
     print("\n--- Syncing FAQs ---")
-    # --- THIS IS THE FIX: We no longer need to delete beforehand ---
-    # index.delete(delete_all=True, namespace="faqs")
-
-    faq_vectorstore = PineconeVectorStore(index_name="restaurant-menu", embedding=embeddings_model, namespace="faqs")
-    faq_retriever = ParentDocumentRetriever(
-        vectorstore=faq_vectorstore,
-        docstore=InMemoryStore(),
-        child_splitter=RecursiveCharacterTextSplitter(chunk_size=200)
-    )
-
     restaurant = db.restaurants.find_one()
     faqs = restaurant.get("faqs", []) if restaurant else []
     faq_docs = [
@@ -65,12 +76,26 @@ def run_sync():
             metadata={"question": faq["question"], "answer": faq["answer"]}
         ) for faq in faqs
     ]
-    if faq_docs:
-        faq_retriever.add_documents(faq_docs, ids=None)
-        print(f"✅ Synced {len(faq_docs)} FAQs.")
+
+    if settings.VECTOR_STORE_MODE == "local":
+        build_local_index(embeddings_model, faq_docs).save(settings.LOCAL_VECTOR_INDEX_DIR, "faqs")
+        print(f"✅ Wrote {len(faq_docs)} FAQs to the local vector index.")
+    else:
+        # --- THIS IS THE FIX: We no longer need to delete beforehand ---
+        # index.delete(delete_all=True, namespace="faqs")
+
+        faq_vectorstore = PineconeVectorStore(index_name="restaurant-menu", embedding=embeddings_model, namespace="faqs")
+        faq_retriever = ParentDocumentRetriever(
+            vectorstore=faq_vectorstore,
+            docstore=InMemoryStore(),
+            child_splitter=RecursiveCharacterTextSplitter(chunk_size=200)
+        )
+        if faq_docs:
+            faq_retriever.add_documents(faq_docs, ids=None)
+            print(f"✅ Synced {len(faq_docs)} FAQs.")
         
     mongo_client.close()
-    message = "--- Synchronization with Gemini embeddings complete. ---"
+    message = f"--- Synchronization with {settings.EMBEDDING_PROVIDER} embeddings complete. ---"
     print(message)
     return {"status": "success", "message": message}
 
@@ -0,0 +1,184 @@
+# backend/app/services/transcript_writer.py
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.mongodb import get_database
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class TranscriptWriter:
+    """
+    Write-behind buffer for AI chat transcripts. `record()` only appends the turn to an
+    in-memory buffer; a background task writes the buffer to MongoDB with insert_many
+    every `flush_interval` seconds, or as soon as `batch_size` turns are waiting.
+
+    The buffer holds at most `max_buffered` turns. When it is full (MongoDB slow or
+    down), `record()` wakes the flusher and waits up to `backpressure_timeout` for room,
+    then drops the turn rather than hold up the chat response any longer. Batches that
+    fail to write are put back at the front of the buffer and retried; if newer turns
+    have taken their room meanwhile, the oldest turns are the ones dropped.
+    Accepts any Motor-compatible database, which allows running it against a local stand-in.
+    """
+
+    def __init__(self, max_buffered: int, batch_size: int, flush_interval: float, backpressure_timeout: float,
+                 database=None, collection: str = "chat_transcripts"):
+        self.max_buffered = max_buffered
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.backpressure_timeout = backpressure_timeout
+        self._database = database
+        self.collection_name = collection
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.backpressure_waits = 0
+        self.failed_batches = 0
+
+    async def _collection(self):
+        database = self._database if self._database is not None else await get_database()
+        return database[self.collection_name]
+
+    async def record(self, turn: Dict[str, Any]) -> bool:
+        """Buffers one turn for writing. Returns False if it had to be dropped."""
+        if len(self._buffer) >= self.max_buffered:
+            self.backpressure_waits += 1
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._wait_for_space(), self.backpressure_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                return False
+
+        self._buffer.append(turn)
+        self.recorded += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _wait_for_space(self):
+        while len(self._buffer) >= self.max_buffered:
+            self._space.clear()
+            await self._space.wait()
+
+    def _requeue(self, batch: List[Dict[str, Any]]):
+        """Puts a failed batch back at the front, oldest first, dropping what doesn't fit."""
+        room = max(0, self.max_buffered - len(self._buffer))
+        keep = batch[:room]
+        self.dropped += len(batch) - len(keep)
+        self._buffer.extendleft(reversed(keep))
+
+    async def flush(self) -> int:
+        """Writes everything buffered, one insert_many per batch. Returns the number written."""
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._space.set()
+                try:
+                    collection = await self._collection()
+                    await collection.insert_many(batch, ordered=False)
+                except BulkWriteError as e:
+                    # Some documents made it; retrying the rest won't fix them (duplicates are already stored)
+                    errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != DUPLICATE_KEY_ERROR]
+                    self.written += len(batch) - len(errors)
+                    written += len(batch) - len(errors)
+                    self.dropped += len(errors)
+                    if errors:
+                        logger.error(f"❌ {len(errors)} chat transcripts were rejected: {errors[0].get('errmsg')}")
+                    continue
+                except asyncio.CancelledError:
+                    # Shutting down mid-write: keep the batch for the final drain (or count it as dropped)
+                    self._requeue(batch)
+                    raise
+                except Exception as e:
+                    self.failed_batches += 1
+                    self._requeue(batch)
+                    logger.error(f"❌ Failed to write {len(batch)} chat transcripts, will retry: {e}")
+                    break
+                self.written += len(batch)
+                written += len(batch)
+        return written
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def setup(self):
+        collection = await self._collection()
+        await collection.create_index([("session_id", 1), ("created_at", 1)])
+
+    async def start(self):
+        """Prepares the collection and starts the background flusher. Called from the app lifespan."""
+        try:
+            await self.setup()
+        except Exception as e:
+            logger.error(f"❌ Could not create chat transcript indexes: {e}")
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _cancel_flusher(self):
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+
+    async def _drain(self):
+        if self._flush_task is not None:
+            # Let a flush in progress finish first: cancelled mid-write, its batch would have to be retried
+            async with self._flush_lock:
+                self._flush_task.cancel()
+            await self._cancel_flusher()
+        await self.flush()
+
+    async def stop(self, timeout: float = 10.0):
+        """Stops the flusher and drains the buffer, giving up after `timeout` seconds."""
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            if self._flush_task is not None:
+                await self._cancel_flusher()
+            logger.error(f"❌ Gave up draining {len(self._buffer)} chat transcripts on shutdown")
+        if self._buffer:
+            self.dropped += len(self._buffer)
+            self._buffer.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._buffer),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "backpressure_waits": self.backpressure_waits,
+            "failed_batches": self.failed_batches,
+        }
+
+
+transcript_writer = TranscriptWriter(
+    max_buffered=settings.TRANSCRIPT_MAX_BUFFERED,
+    batch_size=settings.TRANSCRIPT_BATCH_SIZE,
+    flush_interval=settings.TRANSCRIPT_FLUSH_INTERVAL_SECONDS,
+    backpressure_timeout=settings.TRANSCRIPT_BACKPRESSURE_TIMEOUT_SECONDS
+)
@@ -6,17 +6,16 @@ const API_BASE_URL = process.env.REACT_APP_API_BASE_URL;
 
 /**
  * Sends a chat message to the backend AI agent and retrieves a response.
+ * The server keeps the conversation history of each session, so only the new question is sent.
  * @param {string} sessionId - The unique ID for the current chat session.
  * @param {string} question - The user's latest question.
- * @param {Array<Object>} chatHistory - The history of the conversation.
  * @returns {Promise<string>} The agent's response.
  */
-export async function postToChatApi(sessionId, question, chatHistory) {
+export async function postToChatApi(sessionId, question) {
   const url = `${API_BASE_URL}/chats/`;
   const payload = {
     session_id: sessionId,
-    question: question,
-    chat_history: chatHistory
+    question: question
   };
 
   try {
@@ -31,19 +31,13 @@ const ChatbotPage = () => {
     setMessages(prev => [...prev, userMessage]);
     setIsLoading(true);
 
-    // 2. Prepare the history for the backend API call
-    const apiHistory = messages.map(msg => ({
-      sender: msg.sender,
-      // Ensure history contains only text, not complex objects
-      text: typeof msg.text === 'object' ? msg.text.answer : msg.text,
-    }));
-
-    // 3. Call the backend and get the agent's response
-    const agentResponse = await postToChatApi(sessionId, text, apiHistory);
+    // 2. Call the backend and get the agent's response
+    //    (the server keeps the conversation history for this session)
+    const agentResponse = await postToChatApi(sessionId, text);
     
     let agentMessageContent;
     try {
-        // 4. Try to parse the response as JSON in case it includes an image
+        // 3. Try to parse the response as JSON in case it includes an image
         //    CORRECTED: Use JavaScript's built-in JSON.parse
         agentMessageContent = JSON.parse(agentResponse);
     } catch (e) {
@@ -53,7 +47,7 @@ const ChatbotPage = () => {
     
     const agentMessage = { sender: 'agent', text: agentMessageContent };
     
-    // 5. Add the agent's message to the UI and stop the loading indicator
+    // 4. Add the agent's message to the UI and stop the loading indicator
     setMessages(prev => [...prev, agentMessage]);
     setIsLoading(false);
   };
@@ -0,0 +1,132 @@
+# scripts/bench_chat_ttfb.py
+"""
+Time-to-first-byte of the blocking chat path vs. the streaming one.
+
+Swaps the service's agent for one driven by a fake streaming LLM (fixed
+"thinking" delay, then one token every few milliseconds) and a tool with a fixed
+latency, then compares:
+  - blocking:  time until get_ai_response returns (what POST /chats/ waits for)
+  - streaming: time until stream_ai_response yields its first event and first token
+
+Runs offline like bench_load_offline.py: the service is set up with the offline
+providers (hash embeddings, scripted chat model, local vector index of a seeded menu)
+over an in-memory Motor stand-in, so no API keys or network are needed. Needs
+mongomock-motor. Run from the backend directory so `app` is importable:
+    cd backend && PYTHONPATH=. python ../scripts/bench_chat_ttfb.py
+"""
+import asyncio
+import logging
+import random
+import statistics
+import time
+from typing import AsyncIterator, List
+
+import bench_load_offline as bench  # noqa: F401  (sets the offline environment)
+from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain.tools import tool
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.core.config import settings
+from app.db import mongodb
+from app.services import chat_agent_service
+
+THINK_DELAY = 0.4   # seconds before the model produces anything
+TOKEN_DELAY = 0.02  # seconds between streamed tokens
+TOOL_DELAY = 0.15   # seconds spent inside the tool
+ANSWER_TOKENS = 120
+RUNS = 10
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """Calls `menu_search` on the first turn, then streams a canned answer."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-streaming"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        if any(isinstance(message, ToolMessage) for message in messages):
+            return AIMessage(content=" ".join(f"token{i}" for i in range(ANSWER_TOKENS)))
+        return AIMessage(content="", tool_calls=[{"name": "menu_search", "args": {"query": "spicy food"}, "id": "call-1"}])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError("benchmark only runs async")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self._respond(messages)
+        await asyncio.sleep(THINK_DELAY + TOKEN_DELAY * len(message.content.split()))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._respond(messages)
+        await asyncio.sleep(THINK_DELAY)
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                {"name": "menu_search", "args": '{"query": "spicy food"}', "id": "call-1", "index": 0}
+            ]))
+            return
+        for word in message.content.split():
+            await asyncio.sleep(TOKEN_DELAY)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+@tool
+async def menu_search(query: str) -> str:
+    """Search the restaurant menu."""
+    await asyncio.sleep(TOOL_DELAY)
+    return "- **Paneer Tikka** 💰 ₹250\n- **Chilli Chicken** 💰 ₹320"
+
+
+async def measure(runs: int):
+    blocking, first_event, first_token = [], [], []
+    for i in range(runs):
+        question = f"show me something spicy please #{i}"
+
+        start = time.perf_counter()
+        await chat_agent_service.get_ai_response(f"bench-block-{i}", question, [])
+        blocking.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        event_at = token_at = None
+        async for event in chat_agent_service.stream_ai_response(f"bench-stream-{i}", question, []):
+            now = time.perf_counter() - start
+            event_at = event_at or now
+            if event["type"] == "token" and token_at is None:
+                token_at = now
+        first_event.append(event_at)
+        first_token.append(token_at)
+    return blocking, first_event, first_token
+
+
+async def run():
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("Install mongomock-motor for the in-memory database")
+    mongodb.db.client = AsyncMongoMockClient()
+    await bench.seed(await mongodb.get_database(), 20, 0, random.Random(1))
+
+    settings.SEMANTIC_CACHE_ENABLED = False  # every run must reach the agent
+    settings.TRANSCRIPTS_ENABLED = False
+    llm = FakeStreamingChatModel()
+    agent = create_tool_calling_agent(llm, [menu_search], chat_agent_service.prompt)
+    chat_agent_service.get_chat_agent().agent_executor = AgentExecutor(agent=agent, tools=[menu_search], max_iterations=3)
+    return await measure(RUNS)
+
+
+def main():
+    blocking, first_event, first_token = asyncio.run(run())
+    print(f"--- TTFB over {RUNS} runs (think {THINK_DELAY}s, tool {TOOL_DELAY}s, {ANSWER_TOKENS} tokens) ---")
+    print(f"  blocking /chats/         median {statistics.median(blocking) * 1000:8.1f} ms")
+    print(f"  streaming first event    median {statistics.median(first_event) * 1000:8.1f} ms")
+    print(f"  streaming first token    median {statistics.median(first_token) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    main()
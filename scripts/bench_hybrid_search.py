@@ -0,0 +1,184 @@
+# scripts/bench_hybrid_search.py
+"""
+Relevance and latency of the menu search: vector only, keyword (BM25) only, and the
+hybrid of both fused by reciprocal rank fusion, as menu_search does it.
+
+Builds a synthetic menu (5,000 items by default) whose key ingredients and tags are
+not in the text that gets embedded ("name: description", like the sync job), then
+asks four kinds of questions with known answers:
+    ingredient   "dishes with mushroom"       key_ingredients contains it
+    tag          "bestseller"                 tags contains it
+    dish         "paneer tikka"               the name has both words
+    combined     "chicken with garlic"        name and key_ingredients
+and reports, per mode, recall@k (relevant items in the top k / min(k, relevant items))
+and the in-process latency of a search (the query embedding and, in production, the
+Pinecone round trip come on top). Vectors come from the offline hash embeddings, a
+bag-of-words stand-in: like a real model, they only see the embedded text.
+
+Every question here can be answered by its words alone, which is what the keyword
+half is for; questions that need the embedding's sense of meaning ("something light")
+are what the vector half keeps, and can't be judged with hash vectors. Compare the
+hybrid with the vector-only search menu_search did before. Exits non-zero if the hybrid
+recalls fewer of the ingredient or tag matches than the keyword search alone.
+
+Run from the backend directory so `app` is importable:
+    cd backend && PYTHONPATH=. python ../scripts/bench_hybrid_search.py --items 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Set
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+# Offline run: the settings the app requires get placeholder values
+for key, value in {
+    "MONGO_URI": "mongodb://localhost:27017", "FIREBASE_CREDENTIALS_PATH": "bench-no-firebase.json",
+    "PINECONE_API_KEY": "bench", "GOOGLE_API_KEY": "bench", "ADMIN_API_KEY": "bench",
+    "PHONEPE_PROD_MERCHANT_ID": "bench", "PHONEPE_PROD_SALT_KEY": "bench", "PHONEPE_PROD_SALT_INDEX": "1",
+    "PHONEPE_UAT_MERCHANT_ID": "bench", "PHONEPE_UAT_SALT_KEY": "bench", "PHONEPE_UAT_SALT_INDEX": "1",
+    "FRONTEND_URLS": "", "BACKEND_URL": "http://bench",
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.core.config import settings  # noqa: E402
+from app.services.keyword_search import reciprocal_rank_fusion  # noqa: E402
+from app.services.local_vector_index import LocalVectorIndex  # noqa: E402
+from app.services.menu_snapshot import MenuSnapshot, build_snapshot_item  # noqa: E402
+from app.services.providers import HashEmbeddings  # noqa: E402
+
+CATEGORIES = ["Starters", "Main Course", "Desserts", "Drinks", "Breads", "Rice & Biryani"]
+ADJECTIVES = ["Smoky", "Classic", "Royal", "Home-style", "Crispy", "Lahori", "Hyderabadi", "Amritsari", "Shahi", "Desi"]
+PROTEINS = ["Paneer", "Chicken", "Mutton", "Fish", "Prawn", "Egg", "Tofu", "Aloo", "Gobi", "Corn", "Dal", "Rajma"]
+STYLES = ["Tikka", "Masala", "Curry", "Biryani", "Roll", "Kadai", "Korma", "Tandoori", "Fry", "Soup", "Momos", "Pulao"]
+INGREDIENTS = ["mushroom", "garlic", "ginger", "onion", "tomato", "cream", "cashew", "saffron", "mint", "coriander",
+               "chilli", "lemon", "cheese", "spinach", "peas", "capsicum", "coconut", "jaggery", "curry leaves", "fenugreek"]
+TAGS = ["Bestseller", "Spicy", "Chef's Special", "New", "Kids", "Jain", "Gluten-Free", "Healthy"]
+
+
+def make_menu(size: int, rng: random.Random) -> List[dict]:
+    menu = []
+    for i in range(size):
+        protein, style = rng.choice(PROTEINS), rng.choice(STYLES)
+        name = f"{rng.choice(ADJECTIVES)} {protein} {style}"
+        menu.append({
+            "_id": f"item-{i}",
+            "name": name,
+            "description": f"{name}, a {rng.choice(['slow cooked', 'freshly made', 'signature', 'house'])} dish",
+            "category_id": rng.choice(CATEGORIES),
+            "pricing": [{"size": "Full", "price": rng.randrange(80, 600, 10)}],
+            "key_ingredients": rng.sample(INGREDIENTS, rng.randint(2, 4)),
+            "tags": rng.sample(TAGS, rng.randint(0, 2)),
+            "is_available": True,
+        })
+    return menu
+
+
+def make_questions(menu: List[dict], count: int, rng: random.Random) -> List[Dict]:
+    """Questions of each kind, with the ids of the items that answer them."""
+    def ids(predicate) -> Set[str]:
+        return {item["_id"] for item in menu if predicate(item)}
+
+    questions = []
+    for i in range(count):
+        kind = ["ingredient", "tag", "dish", "combined"][i % 4]
+        if kind == "ingredient":
+            ingredient = rng.choice(INGREDIENTS)
+            text, relevant = f"dishes with {ingredient}", ids(lambda item: ingredient in item["key_ingredients"])
+        elif kind == "tag":
+            tag = rng.choice(TAGS)
+            text, relevant = f"{tag.lower()} items", ids(lambda item: tag in item["tags"])
+        elif kind == "dish":
+            protein, style = rng.choice(PROTEINS), rng.choice(STYLES)
+            text = f"{protein.lower()} {style.lower()}"
+            relevant = ids(lambda item: protein in item["name"] and style in item["name"])
+        else:
+            protein, ingredient = rng.choice(PROTEINS), rng.choice(INGREDIENTS)
+            text = f"{protein.lower()} with {ingredient}"
+            relevant = ids(lambda item: protein in item["name"] and ingredient in item["key_ingredients"])
+        if relevant:
+            questions.append({"kind": kind, "text": text, "relevant": relevant})
+    return questions
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=400)
+    parser.add_argument("-k", type=int, default=6, help="results shown per search")
+    parser.add_argument("--vector-k", type=int, default=settings.MENU_SEARCH_VECTOR_K, help="vector results fused (hybrid)")
+    parser.add_argument("--keyword-k", type=int, default=settings.MENU_SEARCH_KEYWORD_K, help="keyword results fused (hybrid)")
+    parser.add_argument("--keyword-weight", type=float, default=settings.MENU_SEARCH_KEYWORD_WEIGHT,
+                        help="weight of the keyword ranking in the fusion (hybrid)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    menu = make_menu(args.items, rng)
+    questions = make_questions(menu, args.questions, rng)
+    embeddings = HashEmbeddings(settings.HASH_EMBEDDING_DIMENSIONS)
+
+    start = time.perf_counter()
+    snapshot = MenuSnapshot([build_snapshot_item(item, item["category_id"]) for item in menu])
+    snapshot.menu_index
+    keyword_build = time.perf_counter() - start
+    texts = [f"{item['name']}: {item['description']}" for item in menu]
+    index = LocalVectorIndex.from_embeddings(embeddings.embed_documents(texts), texts, [{"doc_id": item["_id"]} for item in menu])
+    # The vector store answers with documents; map them to snapshot positions like menu_search does
+    vector_positions = [snapshot.positions[document["metadata"]["doc_id"]] for document in index.documents]
+    query_vectors = [embeddings.embed_query(question["text"]) for question in questions]
+
+    def vector(question, vector_query, k):
+        return [vector_positions[row] for row, _ in index.search(vector_query, k)]
+
+    def keyword(question, vector_query, k):
+        return [position for position, _ in snapshot.menu_index.search(question["text"], k)]
+
+    def hybrid(question, vector_query, k):
+        return reciprocal_rank_fusion([
+            vector(question, vector_query, args.vector_k),
+            keyword(question, vector_query, args.keyword_k),
+        ], k, weights=[1.0, args.keyword_weight])
+
+    print(f"--- {len(menu)} items, {len(questions)} questions, top-{args.k} "
+          f"(hybrid: {args.vector_k} vector + {args.keyword_k} keyword results, keyword weight {args.keyword_weight:g}) ---")
+    print(f"keyword index built in {keyword_build * 1000:.0f} ms (with the snapshot)")
+    kinds = ["ingredient", "tag", "dish", "combined"]
+    print(f"{'mode':<9}" + "".join(f"{kind:>11}" for kind in kinds) + f"{'all':>8}{'p50 ms':>9}{'p95 ms':>9}")
+    mean_recall: Dict[str, Dict[str, float]] = {}
+    for mode, search in (("vector", vector), ("keyword", keyword), ("hybrid", hybrid)):
+        recall: Dict[str, List[float]] = {kind: [] for kind in kinds}
+        latencies = []
+        for question, vector_query in zip(questions, query_vectors):
+            start = time.perf_counter()
+            positions = search(question, vector_query, args.k)
+            latencies.append(time.perf_counter() - start)
+            hits = sum(1 for position in positions if snapshot.items[position]["id"] in question["relevant"])
+            recall[question["kind"]].append(hits / min(args.k, len(question["relevant"])))
+        overall = np.mean([value for values in recall.values() for value in values])
+        mean_recall[mode] = {kind: float(np.mean(recall[kind])) for kind in kinds if recall[kind]}
+        print(f"{mode:<9}" + "".join(f"{np.mean(recall[kind]) if recall[kind] else float('nan'):>11.3f}" for kind in kinds)
+              + f"{overall:>8.3f}{percentile(latencies, 50) * 1000:>9.3f}{percentile(latencies, 95) * 1000:>9.3f}")
+
+    # Exact ingredient and tag matches are what the keyword half is for: the fusion must not lose them
+    failures = [
+        f"hybrid recall on {kind} questions {mean_recall['hybrid'][kind]:.3f} < keyword-only {mean_recall['keyword'][kind]:.3f}"
+        for kind in ("ingredient", "tag")
+        if kind in mean_recall["keyword"] and mean_recall["hybrid"][kind] < mean_recall["keyword"][kind] - 1e-9
+    ]
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
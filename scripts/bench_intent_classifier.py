@@ -0,0 +1,125 @@
+# scripts/bench_intent_classifier.py
+"""
+Accuracy and throughput of the chat agent's intent classifier.
+
+Runs the labelled English/Hindi/Hinglish corpus in intent_benchmark_corpus.jsonl
+through the single-pass classifier and through the previous one (a regex list per
+intent, checked in dict order), and reports accuracy per language and per intent,
+classifications per second, and the misclassified queries.
+
+That corpus was written alongside the classifier's patterns, so its accuracy only
+shows the patterns cover their own examples. intent_heldout_corpus.jsonl holds queries
+written separately, in customers' own phrasing, and is never used to tune the patterns;
+its accuracy is reported on its own and is the number to compare classifiers by.
+
+Run from the backend directory so `app` is importable:
+    cd backend && PYTHONPATH=. python ../scripts/bench_intent_classifier.py
+"""
+import json
+import os
+import re
+import time
+from collections import defaultdict
+
+from app.services.query_classifier import QueryClassifier
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_benchmark_corpus.jsonl")
+HELDOUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_heldout_corpus.jsonl")
+THROUGHPUT_ROUNDS = 200
+
+
+class LegacyQueryClassifier:
+    """The previous implementation, kept here only as a baseline."""
+
+    def __init__(self):
+        self.patterns = {
+            'greeting': [
+                r'\b(hi|hello|hey|good\s*(morning|afternoon|evening)|greetings?)\b',
+                r'^(hi|hello|hey)[\s\W]*$'
+            ],
+            'goodbye': [
+                r'\b(bye|goodbye|see\s*you|thanks?\s*(bye|goodbye)|have\s*a\s*good\s*(day|night))\b',
+                r'\b(exit|quit|done|finished?)\b'
+            ],
+            'how_are_you': [
+                r'\b(how\s*are\s*you|how\s*do\s*you\s*do|how\s*is\s*it\s*going)\b'
+            ],
+            'menu_query': [
+                r'\b(menu|food|dish|eat|hungry|meal|cuisine|spicy|vegetarian|vegan|price|cost)\b',
+                r'\b(what.*available|show.*menu|recommend|suggest.*food)\b',
+                r'\b(pizza|burger|chicken|rice|bread|dessert|drink|beverage|starter|appetizer)\b',
+                r'\b(under|below|less than|within).*(\d+).*rupees?\b'
+            ],
+            'restaurant_info': [
+                r'\b(hours?|time|open|close|location|address|phone|contact|delivery|takeout)\b',
+                r'\b(where.*located|how.*reach|reservation|book.*table)\b'
+            ],
+            'promotion_query': [
+                r'\b(deal|discount|offer|promotion|special|coupon|cheap)\b',
+                r'\b(any.*offer|save.*money|best.*deal)\b'
+            ]
+        }
+        self.compiled_patterns = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for category, patterns in self.patterns.items()
+        }
+
+    def classify(self, query: str) -> str:
+        query_lower = query.lower().strip()
+        if len(query_lower) <= 10 and any(word in query_lower for word in ['hi', 'hello', 'hey']):
+            return 'greeting'
+        for category, compiled_patterns in self.compiled_patterns.items():
+            if any(pattern.search(query_lower) for pattern in compiled_patterns):
+                return category
+        return 'general'
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(name, classifier, corpus, throughput=True):
+    correct = defaultdict(int)
+    total = defaultdict(int)
+    errors = []
+    for example in corpus:
+        predicted = classifier.classify(example["text"])
+        for key in ("all", f"lang:{example['lang']}", f"intent:{example['intent']}"):
+            total[key] += 1
+            correct[key] += predicted == example["intent"]
+        if predicted != example["intent"]:
+            errors.append((example["text"], example["intent"], predicted))
+
+    print(f"\n--- {name} ---")
+    if throughput:
+        texts = [example["text"] for example in corpus]
+        start = time.perf_counter()
+        for _ in range(THROUGHPUT_ROUNDS):
+            for text in texts:
+                classifier.classify(text)
+        elapsed = time.perf_counter() - start
+        print(f"  throughput   {len(texts) * THROUGHPUT_ROUNDS / elapsed:>12,.0f} queries/s")
+    for key in sorted(total, key=lambda k: (k != "all", k)):
+        print(f"  {key:<24} {correct[key] / total[key]:>7.1%}  ({correct[key]}/{total[key]})")
+    return errors
+
+
+def report(title, corpus, throughput):
+    print(f"\n===== {title}: {len(corpus)} labelled queries =====")
+    evaluate("legacy (regex list per intent, first match wins)", LegacyQueryClassifier(), corpus, throughput)
+    errors = evaluate("single pass (scored intents)", QueryClassifier(), corpus, throughput)
+
+    if errors:
+        print("\n  Misclassified by the single-pass classifier:")
+        for text, expected, predicted in errors:
+            print(f"    {text!r}: expected {expected}, got {predicted}")
+
+
+def main():
+    report(f"Development corpus ({CORPUS_PATH}, written with the patterns)", load_corpus(CORPUS_PATH), True)
+    report(f"Held-out corpus ({HELDOUT_PATH})", load_corpus(HELDOUT_PATH), False)
+
+
+if __name__ == "__main__":
+    main()
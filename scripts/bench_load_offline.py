@@ -0,0 +1,339 @@
+# scripts/bench_load_offline.py
+"""
+Offline load benchmark of the chat, menu and payment APIs.
+
+Starts the FastAPI app in-process (lifespan included) against an in-memory Motor
+stand-in (mongomock-motor) or a local MongoDB. The real chat agent is built from the
+offline providers (app/services/providers.py): hash embeddings and the scripted
+tool-calling chat model, each with a configurable latency, over a local vector
+index of the seeded menu. Then drives a weighted mix of
+    POST /api/v1/chats/   GET /api/v1/menu/items/   GET /api/v1/payments/orders
+at each concurrency level and prints p50/p95/p99 latency and requests/second per
+endpoint as JSON, to keep as a baseline and compare across commits.
+
+Needs httpx (already required by FastAPI's TestClient) and, without --mongo-uri,
+mongomock-motor:
+    pip install mongomock-motor
+
+Run from the backend directory so `app` is importable:
+    cd backend && PYTHONPATH=. python ../scripts/bench_load_offline.py --concurrency 1,8,32 --requests 400 --output baseline.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# Offline run: the settings the app requires get placeholder values, and the caches
+# that persist to disk go to a throwaway directory
+BENCH_ENV = {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "FIREBASE_CREDENTIALS_PATH": "bench-no-firebase.json",
+    "PINECONE_API_KEY": "bench",
+    "GOOGLE_API_KEY": "bench",
+    "ADMIN_API_KEY": "bench-admin-key",
+    "PHONEPE_PROD_MERCHANT_ID": "bench",
+    "PHONEPE_PROD_SALT_KEY": "bench",
+    "PHONEPE_PROD_SALT_INDEX": "1",
+    "PHONEPE_UAT_MERCHANT_ID": "bench",
+    "PHONEPE_UAT_SALT_KEY": "bench",
+    "PHONEPE_UAT_SALT_INDEX": "1",
+    "FRONTEND_URLS": "",
+    "BACKEND_URL": "http://bench",
+}
+for key, value in BENCH_ENV.items():
+    os.environ.setdefault(key, value)
+WORK_DIR = tempfile.mkdtemp(prefix="bench-load-")
+os.environ.update({
+    "EMBEDDING_PROVIDER": "hash",
+    "CHAT_MODEL_PROVIDER": "scripted",
+    "VECTOR_STORE_MODE": "local",
+    "LOCAL_VECTOR_INDEX_DIR": os.path.join(WORK_DIR, "vector_index"),
+    "EMBEDDING_CACHE_PATH": os.path.join(WORK_DIR, "embeddings.sqlite3"),
+})
+
+import httpx
+
+from app.core.config import settings
+from app.db import mongodb
+
+CATEGORIES = ["Starters", "Main Course", "Desserts", "Drinks", "Breads", "Rice & Biryani"]
+DISH_WORDS = ["Paneer", "Chicken", "Mushroom", "Aloo", "Dal", "Veg", "Mutton", "Fish", "Gobi", "Corn"]
+DISH_STYLES = ["Tikka", "Masala", "Butter", "Kadai", "Chilli", "Makhani", "Biryani", "Roll", "Kulfi", "Lassi"]
+TAGS = ["Veg", "Non-Veg", "Spicy", "Popular", "Bestseller", "Creamy"]
+
+QUESTIONS = [
+    "hi",
+    "show me spicy food",
+    "what vegetarian options do you have?",
+    "any offers today?",
+    "what are your opening hours?",
+    "do you deliver?",
+    "how much is paneer tikka?",
+    "tell me about dal makhani",
+    "compare paneer tikka and dal makhani",
+    "veg starters under 200",
+    "list 5 desserts",
+    "something creamy and not too spicy",
+    "kuch spicy khana hai kya?",
+]
+
+DEFAULT_MIX = "chat=5,menu=3,orders=2"
+
+
+# --- Data ---
+async def seed(db, items: int, orders: int, rng: random.Random):
+    """Fills the database with a synthetic menu, FAQs and order history, and indexes the menu and FAQs."""
+    for collection in ("categories", "menu_items", "orders", "restaurants", "promotions", "chat_transcripts"):
+        await db[collection].delete_many({})
+
+    category_ids = []
+    for name in CATEGORIES:
+        category_ids.append((await db.categories.insert_one({"name": name})).inserted_id)
+
+    menu = []
+    for i in range(items):
+        name = f"{rng.choice(DISH_WORDS)} {rng.choice(DISH_STYLES)} {i}"
+        price = rng.randint(80, 600)
+        menu.append({
+            "name": name,
+            "description": f"House special {name.lower()}, slow cooked with whole spices",
+            "category_id": str(rng.choice(category_ids)),
+            "pricing": [{"size": "Half", "price": max(50, price - 80)}, {"size": "Full", "price": price}],
+            "tags": rng.sample(TAGS, 2),
+            "dietary_info": {"is_vegan_available": rng.random() < 0.2, "is_gluten_free": rng.random() < 0.3},
+            "key_ingredients": rng.sample(DISH_WORDS, 2),
+            "is_available": rng.random() < 0.9,
+            "prep_time_minutes": rng.randint(10, 30),
+        })
+    if menu:
+        await db.menu_items.insert_many(menu)
+
+    faqs = [
+        {"question": "What are your opening hours?", "answer": "11am to 11pm, every day."},
+        {"question": "Do you deliver?", "answer": "Yes, within 5 km of the restaurant."},
+        {"question": "Where are you located?", "answer": "MG Road, next to the metro station."},
+    ]
+    await db.restaurants.insert_one({"name": "HFC", "faqs": faqs})
+    await db.promotions.insert_one({"title": "Weekday lunch", "description": "20% off on all thalis", "discount": "20%"})
+
+    now = datetime.utcnow()
+    order_docs = [{
+        "user_id": f"user-{rng.randint(1, 200)}",
+        "merchant_transaction_id": f"MT{i}",
+        "amount": rng.randint(200, 3000),
+        "status": rng.choice(["PAYMENT_SUCCESS", "CONFIRMED", "PREPARING", "SHIPPED"]),
+        "items": [{"name": rng.choice(menu)["name"] if menu else "Thali", "quantity": rng.randint(1, 3)}],
+        "created_at": now - timedelta(minutes=i),
+    } for i in range(orders)]
+    if order_docs:
+        await db.orders.insert_many(order_docs)
+
+    # The same documents the sync job writes to the local vector index
+    from app.services.local_vector_index import LocalVectorIndex
+    from app.services.providers import create_embeddings
+
+    embeddings = create_embeddings(cached=False)
+    category_names = {str(category_id): name for category_id, name in zip(category_ids, CATEGORIES)}
+    menu_texts = [f"{item['name']}: {item['description']}" for item in menu if item["is_available"]]
+    menu_metadata = [{
+        "doc_id": str(item["_id"]), "name": item["name"], "description": item["description"],
+        "pricing": item["pricing"], "is_available": True, "category": category_names[item["category_id"]],
+    } for item in menu if item["is_available"]]
+    faq_texts = [f"Question: {faq['question']} Answer: {faq['answer']}" for faq in faqs]
+    for name, texts, metadata in (("menu-items", menu_texts, menu_metadata), ("faqs", faq_texts, faqs)):
+        index = LocalVectorIndex.from_embeddings(embeddings.embed_documents(texts), texts, metadata)
+        index.save(settings.LOCAL_VECTOR_INDEX_DIR, name)
+
+
+# --- Load generation ---
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "rps": round((len(latencies) + errors) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ("chat", "menu", "orders"):
+            raise SystemExit(f"Unknown endpoint '{name}' in --mix (use chat, menu, orders)")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+async def send(client: httpx.AsyncClient, endpoint: str, rng: random.Random, request_number: int) -> httpx.Response:
+    if endpoint == "chat":
+        payload = {"session_id": f"bench-{request_number}", "question": rng.choice(QUESTIONS)}
+        return await client.post("/api/v1/chats/", json=payload)
+    if endpoint == "menu":
+        return await client.get("/api/v1/menu/items/")
+    return await client.get("/api/v1/payments/orders", headers={"X-API-Key": settings.ADMIN_API_KEY})
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, total: int, weights: Dict[str, float], seed: int):
+    rng = random.Random(seed)
+    plan = rng.choices(list(weights), weights=list(weights.values()), k=total)
+    latencies: Dict[str, List[float]] = {endpoint: [] for endpoint in weights}
+    errors: Dict[str, int] = {endpoint: 0 for endpoint in weights}
+    next_request = iter(range(total))
+
+    async def worker():
+        for request_number in next_request:
+            endpoint = plan[request_number]
+            start = time.perf_counter()
+            try:
+                response = await send(client, endpoint, rng, request_number)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            if ok:
+                latencies[endpoint].append(time.perf_counter() - start)
+            else:
+                errors[endpoint] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "endpoints": {endpoint: summarize(latencies[endpoint], errors[endpoint], elapsed) for endpoint in weights},
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    if args.mongo_uri:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(args.mongo_uri)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("Install mongomock-motor for the in-memory database, or pass --mongo-uri of a local MongoDB")
+        client = AsyncMongoMockClient()
+
+    settings.SEMANTIC_CACHE_ENABLED = args.semantic_cache
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.FAKE_LLM_LATENCY_SECONDS = args.llm_latency
+    settings.FAKE_EMBEDDING_LATENCY_SECONDS = args.embedding_latency
+
+    import app.main as app_main
+    from app.services.agent_runtime import agent_runtime
+
+    # The lifespan's Mongo connection is the benchmark database
+    async def connect_to_mongo():
+        mongodb.db.client = client
+
+    async def close_mongo_connection():
+        pass
+
+    if not args.verbose:
+        # Per-request INFO logs would dominate the measurement
+        logging.disable(logging.INFO)
+
+    app_main.connect_to_mongo = connect_to_mongo
+    app_main.close_mongo_connection = close_mongo_connection
+    mongodb.db.client = client
+
+    await seed(await mongodb.get_database(), args.items, args.orders, rng)
+
+    weights = parse_mix(args.mix)
+    levels = []
+    async with app_main.app.router.lifespan_context(app_main.app):
+        await agent_runtime.get()
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as http:
+            # Warm-up: fills the menu snapshot and first-use paths outside the measurement
+            await run_level(http, min(4, max(args.concurrency)), args.warmup, weights, args.seed)
+            for i, concurrency in enumerate(args.concurrency):
+                level = await run_level(http, concurrency, args.requests, weights, args.seed + i)
+                levels.append(level)
+                overall = level["overall"]
+                print(f"  concurrency {concurrency:>4}: {overall['rps']:>8.1f} req/s  p50 {overall['p50_ms']:>8.1f} ms  "
+                      f"p95 {overall['p95_ms']:>8.1f} ms  p99 {overall['p99_ms']:>8.1f} ms  errors {overall['errors']}",
+                      file=sys.stderr)
+
+    report = {
+        "benchmark": "bench_load_offline",
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "config": {
+            "database": "mongodb" if args.mongo_uri else "mongomock",
+            "mix": weights,
+            "requests_per_level": args.requests,
+            "items": args.items,
+            "orders": args.orders,
+            "llm_latency_s": args.llm_latency,
+            "embedding_latency_s": args.embedding_latency,
+            "semantic_cache": args.semantic_cache,
+            "seed": args.seed,
+        },
+        "levels": levels,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline load benchmark of the chat, menu and payment APIs")
+    parser.add_argument("--concurrency", type=lambda value: [int(v) for v in value.split(",")], default=[1, 8, 32],
+                        help="comma-separated in-flight request levels (default 1,8,32)")
+    parser.add_argument("--requests", type=int, default=300, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=30, help="unmeasured requests before the first level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds per scripted chat model call")
+    parser.add_argument("--embedding-latency", type=float, default=0.05, help="seconds per hash embedding call")
+    parser.add_argument("--items", type=int, default=200, help="synthetic menu items")
+    parser.add_argument("--orders", type=int, default=500, help="synthetic orders")
+    parser.add_argument("--semantic-cache", action="store_true", help="keep the semantic answer cache on")
+    parser.add_argument("--mongo-uri", help="use this (local, throwaway) MongoDB instead of the in-memory stand-in")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verbose", action="store_true", help="keep the app's INFO logs")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
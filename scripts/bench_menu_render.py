@@ -0,0 +1,92 @@
+# scripts/bench_menu_render.py
+"""
+Cost of rendering a category_filter_search answer for 10, 100 and 1000 items.
+
+Compares the previous rendering (price, dietary and availability strings rebuilt
+for every item on every cache miss, concatenated with +=) with joining the
+fragments the menu snapshot pre-renders when an item is written. Also reports
+the one-off cost of rendering the fragments, which is paid at write time.
+
+Run from the backend directory so `app` is importable:
+    cd backend && PYTHONPATH=. python ../scripts/bench_menu_render.py
+"""
+import random
+import time
+
+from app.services.menu_fragments import list_dietary_notes, price_summary
+from app.services.menu_snapshot import build_snapshot_item
+
+SIZES = [10, 100, 1000]
+ROUNDS = 200
+TAGS = ["Veg", "Non-Veg", "Spicy", "Popular", "Bestseller", "Creamy"]
+
+
+def make_item(i: int) -> dict:
+    rng = random.Random(i)
+    return {
+        "_id": f"item{i}",
+        "name": f"Dish {i}",
+        "description": f"A house speciality number {i}, slow cooked with whole spices",
+        "pricing": [{"size": "Half", "price": rng.randint(80, 300)}, {"size": "Full", "price": rng.randint(300, 600)}],
+        "tags": rng.sample(TAGS, 2),
+        "dietary_info": {"is_vegan_available": rng.random() < 0.2, "is_gluten_free": rng.random() < 0.3},
+        "is_available": rng.random() < 0.9,
+        "prep_time_minutes": rng.randint(10, 30),
+    }
+
+
+def legacy_render(docs, category_name: str) -> str:
+    """The previous per-request rendering, kept here only as a baseline."""
+    result = f"🍽️ **Starters items:**\n\n"
+    for item in docs:
+        _, price_display = price_summary(item.get('pricing', []))
+        dietary_notes = list_dietary_notes(item)
+        availability = "✅ Available" if item.get('is_available', True) else "❌ Unavailable"
+        dietary_str = " | ".join(dietary_notes[:3]) if dietary_notes else "ℹ️ No dietary info"
+
+        result += f"- **{item.get('name', 'Unknown')}**\n"
+        result += f"  📝 {item.get('description', 'Delicious item')}\n"
+        result += f"  💰 {price_display}\n"
+        result += f"  {availability}\n"
+        if category_name:
+            result += f"  📂 Category: {category_name}\n"
+        prep_time = item.get('prep_time_minutes') or 0
+        if prep_time > 0:
+            result += f"  ⏱️ Prep time: {prep_time} minutes\n"
+        result += f"  🏷️ {dietary_str}\n\n"
+    result += "❓ Want details about any specific item? Just ask!"
+    return result
+
+
+def fragment_render(entries) -> str:
+    parts = ["🍽️ **Starters items:**\n\n"]
+    parts.extend(entry['list_md'] for entry in entries)
+    parts.append("❓ Want details about any specific item? Just ask!")
+    return "".join(parts)
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    print(f"--- Rendering a category listing ({ROUNDS} rounds per size) ---")
+    print(f"{'items':>6} {'legacy µs':>11} {'fragments µs':>13} {'speedup':>8} {'pre-render µs/item':>19}")
+    for size in SIZES:
+        docs = [make_item(i) for i in range(size)]
+
+        start = time.perf_counter()
+        entries = [build_snapshot_item(doc, "Starters") for doc in docs]
+        prerender = (time.perf_counter() - start) / size
+
+        assert legacy_render(docs, "Starters") == fragment_render(entries)
+        legacy = timed(lambda: legacy_render(docs, "Starters"), ROUNDS)
+        fragments = timed(lambda: fragment_render(entries), ROUNDS)
+        print(f"{size:>6} {legacy * 1e6:>11.1f} {fragments * 1e6:>13.1f} {legacy / fragments:>7.1f}x {prerender * 1e6:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# scripts/bench_query_cache.py
+"""
+Microbenchmarks for the chat agent's QueryCache at 10k-100k entries.
+
+Measures hits, misses and inserts into a full cache (the eviction path), and
+compares inserts against the previous dict + min(access_times) eviction, which
+was O(n) per insert once the cache was full.
+
+Run from the backend directory so `app` is importable:
+    cd backend && PYTHONPATH=. python ../scripts/bench_query_cache.py
+"""
+import random
+import string
+import time
+
+from app.services.query_cache import QueryCache
+
+SIZES = [10_000, 50_000, 100_000]
+NAMESPACES = ["menu", "category", "faq", "item", "promotions"]
+LEGACY_INSERTS = 500  # the legacy cache is too slow to benchmark with more
+
+
+class LegacyQueryCache:
+    """The previous implementation, kept here only as a baseline."""
+
+    def __init__(self, max_size, ttl=1800):
+        self.cache = {}
+        self.access_times = {}
+        self.max_size = max_size
+        self.ttl = ttl
+
+    def set(self, key, value):
+        if len(self.cache) >= self.max_size:
+            oldest_key = min(self.access_times, key=self.access_times.get)
+            del self.cache[oldest_key]
+            del self.access_times[oldest_key]
+        self.cache[key] = value
+        self.access_times[key] = time.time()
+
+
+def random_value(length=600):
+    return "".join(random.choices(string.ascii_letters + " ", k=length))
+
+
+def ops_per_second(count, seconds):
+    return f"{count / seconds:>12,.0f} ops/s"
+
+
+def bench_size(size):
+    values = [random_value() for _ in range(1000)]
+    keys = [(NAMESPACES[i % len(NAMESPACES)], f"query number {i}") for i in range(size)]
+
+    # Budget for exactly `size` entries, so further inserts have to evict
+    probe = QueryCache(max_bytes=1 << 40)
+    probe.set("menu", keys[0][1], values[0])
+    cache = QueryCache(max_bytes=probe.total_bytes * size)
+
+    start = time.perf_counter()
+    for i, (namespace, key) in enumerate(keys):
+        cache.set(namespace, key, values[i % len(values)])
+    fill_time = time.perf_counter() - start
+
+    lookups = random.choices(keys, k=size)
+    start = time.perf_counter()
+    for namespace, key in lookups:
+        cache.get(namespace, key)
+    hit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(size):
+        cache.get("menu", f"missing {i}")
+    miss_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(size):
+        cache.set("menu", f"new query {i}", values[i % len(values)])
+    evict_time = time.perf_counter() - start
+
+    legacy = LegacyQueryCache(max_size=size)
+    for i, (namespace, key) in enumerate(keys):
+        legacy.cache[f"{namespace}:{key}"] = values[i % len(values)]
+        legacy.access_times[f"{namespace}:{key}"] = float(i)
+    start = time.perf_counter()
+    for i in range(LEGACY_INSERTS):
+        legacy.set(f"new query {i}", values[i % len(values)])
+    legacy_time = time.perf_counter() - start
+
+    stats = cache.stats()
+    print(f"\n--- {size:,} entries ({stats['bytes'] / 1024 / 1024:.1f} MiB) ---")
+    print(f"  fill                 {ops_per_second(size, fill_time)}")
+    print(f"  get (hit)            {ops_per_second(size, hit_time)}")
+    print(f"  get (miss)           {ops_per_second(size, miss_time)}")
+    print(f"  set (evicting)       {ops_per_second(size, evict_time)}")
+    print(f"  legacy set (full)    {ops_per_second(LEGACY_INSERTS, legacy_time)}")
+    print(f"  evictions: {stats['evictions']:,}  hit rate: {stats['hit_rate']:.2%}")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    for size in SIZES:
+        bench_size(size)
@@ -0,0 +1,137 @@
+# scripts/bench_vector_index.py
+"""
+Recall and latency of the local in-process vector index.
+
+Synthetic mode (default) builds random float32 indexes of several sizes, saves
+and memory-maps them like the sync job does, and measures top-k query latency
+and recall against an exact float64 ground truth.
+
+With --pinecone it instead loads the persisted local indexes written by a
+`VECTOR_STORE_MODE=local` sync, runs the same questions through both stores,
+and reports the overlap of their top-k results and each store's latency.
+Pinecone mode needs the usual .env and has to be run from the backend directory:
+    cd backend && PYTHONPATH=. python ../scripts/bench_vector_index.py --pinecone
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.local_vector_index import LocalVectorIndex  # noqa: E402
+
+SIZES = [100, 500, 2000, 10000]
+DIMENSIONS = 768
+QUERIES = 200
+TOP_K = 5
+
+QUESTIONS = [
+    "something spicy with paneer",
+    "vegan dessert",
+    "what can I get for kids",
+    "cold drinks",
+    "chicken starters",
+    "do you deliver",
+    "what are your opening hours",
+    "is there parking",
+    "gluten free options",
+    "mocktails under 200",
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def bench_synthetic(sizes, dimensions, queries, k):
+    rng = np.random.default_rng(42)
+    print(f"--- Local index, {dimensions} dims, top-{k}, {queries} queries per size ---")
+    print(f"{'rows':>7} {'p50 ms':>9} {'p99 ms':>9} {'recall':>8} {'file MB':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            embeddings = rng.standard_normal((size, dimensions))
+            texts = [f"doc {i}" for i in range(size)]
+            LocalVectorIndex.from_embeddings(embeddings, texts, [{"row": i} for i in range(size)]).save(directory, f"bench-{size}")
+            index = LocalVectorIndex.load(directory, f"bench-{size}")
+
+            # Exact ground truth in float64 on the unquantised vectors
+            exact = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+            latencies, hits = [], 0
+            for _ in range(queries):
+                query = rng.standard_normal(dimensions)
+                start = time.perf_counter()
+                result = index.search(query, k)
+                latencies.append(time.perf_counter() - start)
+
+                truth = set(np.argsort(-(exact @ (query / np.linalg.norm(query))))[:k].tolist())
+                hits += len(truth & {row for row, _ in result})
+
+            file_mb = os.path.getsize(LocalVectorIndex.current_paths(directory, f"bench-{size}")[0]) / 1e6
+            print(f"{size:>7} {percentile(latencies, 50) * 1000:>9.3f} {percentile(latencies, 99) * 1000:>9.3f} "
+                  f"{hits / (queries * k):>8.3f} {file_mb:>8.1f}")
+
+
+def bench_against_pinecone(k):
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    from langchain_pinecone import PineconeVectorStore
+
+    from app.core.config import settings
+    from app.services.local_vector_index import LocalVectorStore
+
+    embedding_model = GoogleGenerativeAIEmbeddings(model="gemini-embedding-001", google_api_key=settings.GOOGLE_API_KEY)
+
+    for namespace in ["menu-items", "faqs"]:
+        if not LocalVectorIndex.exists(settings.LOCAL_VECTOR_INDEX_DIR, namespace):
+            print(f"⚠️ No local index for '{namespace}' in {settings.LOCAL_VECTOR_INDEX_DIR}; run the sync in local mode first.")
+            continue
+
+        local = LocalVectorStore(settings.LOCAL_VECTOR_INDEX_DIR, namespace)
+        remote = PineconeVectorStore(index_name="restaurant-menu", embedding=embedding_model, namespace=namespace,
+                                     pinecone_api_key=settings.PINECONE_API_KEY)
+
+        local_times, remote_times, overlap = [], [], 0
+        for question in QUESTIONS:
+            vector = embedding_model.embed_query(question)
+
+            start = time.perf_counter()
+            local_docs = local.similarity_search_by_vector(vector, k=k)
+            local_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            remote_docs = remote.similarity_search_by_vector(vector, k=k, namespace=namespace)
+            remote_times.append(time.perf_counter() - start)
+
+            # Documents are compared by content, since ids are not shared between the stores
+            overlap += len({doc.page_content for doc in local_docs} & {doc.page_content for doc in remote_docs})
+
+        print(f"--- {namespace}: {len(QUESTIONS)} questions, top-{k} ---")
+        print(f"  local     median {statistics.median(local_times) * 1000:8.2f} ms")
+        print(f"  pinecone  median {statistics.median(remote_times) * 1000:8.2f} ms")
+        print(f"  top-{k} agreement with pinecone: {overlap / (len(QUESTIONS) * k):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pinecone", action="store_true", help="compare the persisted local index with Pinecone")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--dimensions", type=int, default=DIMENSIONS)
+    parser.add_argument("--queries", type=int, default=QUERIES)
+    parser.add_argument("-k", type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    if args.pinecone:
+        bench_against_pinecone(args.k)
+    else:
+        bench_synthetic(args.sizes, args.dimensions, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# scripts/check_coalesced_tool_outputs.py
+"""
+Checks that a tool call shared between concurrent requests (SingleFlight coalescing,
+as tool_flight does for the chat tools) reaches the deadline of every request, not
+only the one that started it: a request past its answer-by time answers from its own
+Deadline.tool_outputs, so a follower missing the shared result would have nothing to
+show although the tool has answered.
+
+Two requests run the agent (ParallelToolAgentExecutor with a model that calls the same
+slow tool, then takes far longer than the deadline to answer); the second joins the
+first one's tool call. Each request's tool_outputs must hold the result. Exits non-zero
+on failure.
+    cd backend && PYTHONPATH=. python ../scripts/check_coalesced_tool_outputs.py
+"""
+import asyncio
+import logging
+import sys
+
+import bench_load_offline as bench  # noqa: F401  (sets the offline environment)
+from langchain.agents import create_tool_calling_agent
+from langchain.tools import tool
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from app.services.parallel_tools import ParallelToolAgentExecutor
+from app.services.request_deadline import Deadline, deadline_scope
+from app.services.singleflight import SingleFlight
+
+TOOL_SECONDS = 0.3
+DEADLINE_SECONDS = 0.8
+FOLLOWER_DELAY = 0.1  # the second request joins while the first one's tool call is running
+
+flight = SingleFlight("check")
+
+
+@tool
+@flight.coalesce("slow_lookup")
+async def slow_lookup(item: str) -> str:
+    """Looks up a menu item."""
+    await asyncio.sleep(TOOL_SECONDS)
+    return f"{item}: ₹250"
+
+
+class ToolThenStallChatModel(BaseChatModel):
+    """Calls slow_lookup, then stalls past the deadline instead of answering."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "tool-then-stall"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError("only runs async")
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if any(isinstance(message, ToolMessage) for message in messages):
+            await asyncio.sleep(DEADLINE_SECONDS * 10)
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content="too late"))])
+        call = {"name": "slow_lookup", "args": {"item": "Paneer Tikka"}, "id": "call-1"}
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="", tool_calls=[call]))])
+
+
+async def request(executor, delay: float):
+    await asyncio.sleep(delay)
+    deadline = Deadline(DEADLINE_SECONDS)
+    with deadline_scope(deadline):
+        run = asyncio.ensure_future(executor.ainvoke({"input": "how much is paneer tikka?"}))
+    await asyncio.wait({run}, timeout=deadline.remaining())
+    run.cancel()
+    return deadline.tool_outputs
+
+
+async def main() -> int:
+    prompt = ChatPromptTemplate.from_messages([("human", "{input}"), MessagesPlaceholder("agent_scratchpad")])
+    agent = create_tool_calling_agent(ToolThenStallChatModel(), [slow_lookup], prompt)
+    executor = ParallelToolAgentExecutor(agent=agent, tools=[slow_lookup])
+
+    leader, follower = await asyncio.gather(request(executor, 0), request(executor, FOLLOWER_DELAY))
+    stats = flight.stats()
+    print(f"leader tool outputs:   {leader}")
+    print(f"follower tool outputs: {follower}")
+    print(f"tool executions {stats['executed']}, coalesced {stats['coalesced']}")
+
+    failures = []
+    if stats["coalesced"] != 1:
+        failures.append("the second request did not join the first one's tool call")
+    for name, outputs in (("leader", leader), ("follower", follower)):
+        if not outputs:
+            failures.append(f"the {name}'s deadline has no tool output")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,130 @@
+# scripts/check_fuzzy_names.py
+"""
+Probes the fuzzy item-name matching behind exact_lookup (FuzzyNameIndex) with a real-
+looking menu: misspelt and Hinglish names must find their dish, and names of dishes
+that are NOT on the menu must not be matched to a different dish that shares a word or
+looks alike ("butter chicken" is not Butter Naan). Those near misses should come back
+as "did you mean" suggestions instead.
+
+Also times match() on a synthetic menu (like bench_hybrid_search.py), hits and misses.
+Exits non-zero if any probe fails.
+    python scripts/check_fuzzy_names.py --items 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.fuzzy_names import FuzzyNameIndex  # noqa: E402
+
+MENU = [
+    "Paneer Tikka", "Paneer Tikka Masala", "Paneer Butter Masala", "Kadai Paneer", "Palak Paneer",
+    "Butter Naan", "Garlic Naan", "Tandoori Roti", "Lachha Paratha", "Aloo Paratha",
+    "Chicken 65", "Chicken Lababdar", "Tandoori Chicken", "Chicken Korma", "Chilli Chicken",
+    "Veg Biryani", "Mutton Biryani", "Hyderabadi Chicken Biryani", "Jeera Rice", "Veg Pulao",
+    "Dal Makhani", "Dal Tadka", "Chole Bhature", "Rajma Chawal", "Aloo Gobi", "Matar Paneer",
+    "Veg Thali", "Non-Veg Thali", "Masala Chai", "Sweet Lassi", "Mango Lassi", "Gulab Jamun",
+    "Rasmalai", "Kheer", "Veg Momos", "Chicken Momos", "Onion Pakora", "Boondi Raita",
+]
+
+# query -> the dish it must find
+MATCHES = {
+    "Paneer Tikka": "Paneer Tikka",
+    "paner tika": "Paneer Tikka",
+    "panir tikka masala": "Paneer Tikka Masala",
+    "paneertikka": "Paneer Tikka",
+    "butter nan": "Butter Naan",
+    "chiken 65": "Chicken 65",
+    "chiken lababdaar": "Chicken Lababdar",
+    "paneer tikka": "Paneer Tikka",
+    "tikka masala paneer": "Paneer Tikka Masala",
+    "mutton biriyani": "Mutton Biryani",
+    "biryani hyderabadi chicken": "Hyderabadi Chicken Biryani",
+    "daal makhni": "Dal Makhani",
+    "chhole bhature": "Chole Bhature",
+    "alu gobhi": "Aloo Gobi",
+    "masaala chay": "Masala Chai",
+    "mango lassy": "Mango Lassi",
+    "gulab jamoon": "Gulab Jamun",
+    "the veg momo": "Veg Momos",
+    "non veg thali": "Non-Veg Thali",
+    "veg thali": "Veg Thali",
+    "lacha parantha": "Lachha Paratha",
+    "tandoori chiken": "Tandoori Chicken",
+}
+
+# Dishes not on the menu: no match allowed (the dish that shares words or looks alike is
+# only a suggestion)
+NOT_ON_MENU = {
+    "butter chicken": "Butter Naan",
+    "chicken tikka": "Chicken 65",
+    "egg biryani": "Veg Biryani",
+    "mutton korma": None,
+    "garlic bread": "Garlic Naan",
+    "paneer 65": None,
+    "chicken 56": None,
+    "dal fry": None,
+    "mango shake": None,
+    "fish curry": None,
+    "pizza": None,
+}
+
+
+def check(index: FuzzyNameIndex) -> int:
+    failures = 0
+    for query, expected in MATCHES.items():
+        match = index.match(query)
+        found = MENU[match[0]] if match else None
+        ok = found == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} match    {query!r:30} -> {found!r}" + ("" if ok else f" (expected {expected!r})"))
+    for query, suggestion in NOT_ON_MENU.items():
+        match = index.match(query)
+        suggested = [MENU[i] for i in index.suggest(query)]
+        ok = match is None and (suggestion is None or suggestion in suggested)
+        failures += not ok
+        found = MENU[match[0]] if match else None
+        print(f"{'ok  ' if ok else 'FAIL'} no match {query!r:30} -> {found!r}, did you mean {suggested}")
+    return failures
+
+
+def make_names(size: int, rng: random.Random):
+    adjectives = ["Smoky", "Classic", "Royal", "Home-style", "Crispy", "Lahori", "Hyderabadi", "Amritsari", "Shahi", "Desi"]
+    proteins = ["Paneer", "Chicken", "Mutton", "Fish", "Prawn", "Egg", "Tofu", "Aloo", "Gobi", "Corn", "Dal", "Rajma"]
+    styles = ["Tikka", "Masala", "Curry", "Biryani", "Roll", "Kadai", "Korma", "Tandoori", "Fry", "Soup", "Momos", "Pulao"]
+    return [f"{rng.choice(adjectives)} {rng.choice(proteins)} {rng.choice(styles)}" for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000, help="size of the synthetic menu that is timed")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    failures = check(FuzzyNameIndex(MENU))
+
+    rng = random.Random(args.seed)
+    names = make_names(args.items, rng)
+    start = time.perf_counter()
+    index = FuzzyNameIndex(names)
+    build = time.perf_counter() - start
+    queries = [rng.choice(names).lower() for _ in range(args.queries // 2)]
+    # Misspelt hits and misses: a dropped letter, or words of the menu in combinations it doesn't have
+    queries += [query.replace("a", "", 1) for query in queries[:args.queries // 4]]
+    queries += [f"{rng.choice(['butter', 'egg', 'veg', 'garlic'])} {query.split()[-1]}" for query in queries[:args.queries // 4]]
+    start = time.perf_counter()
+    matched = sum(1 for query in queries if index.match(query) is not None)
+    elapsed = time.perf_counter() - start
+    print(f"--- {args.items} names: index built in {build * 1000:.0f} ms, "
+          f"{elapsed / len(queries) * 1e6:.0f} us per match() ({matched}/{len(queries)} matched) ---")
+
+    print("OK" if not failures else f"{failures} probes failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# scripts/check_import_time.py
+"""
+Import-time budget check for the API.
+
+Imports `app.main` in a fresh interpreter (as uvicorn does on a cold start) and
+fails if that takes longer than the budget, or if it pulls in the chat agent's
+heavy dependencies (LangChain, Gemini, Pinecone). Those are only imported by the
+chat agent's background warm-up, so the menu/payment routes never pay for them.
+Prints the slowest imports of app.main to help find a regression.
+
+Run from the backend directory with the usual .env so `app` is importable:
+    cd backend && PYTHONPATH=. python ../scripts/check_import_time.py --budget 1.5
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "langchain",
+    "langchain_core",
+    "langchain_google_genai",
+    "langchain_pinecone",
+    "pinecone",
+    "app.services.chat_agent_service",
+]
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(f"{{elapsed:.4f}} {{','.join(heavy)}}")
+"""
+
+
+def slowest_imports(importtime_log: str, top: int):
+    """Parses `-X importtime` output into the slowest imports made by app.main (cumulative µs)."""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # Each level of nesting indents the name by two more spaces; level 1 is what app.main imports
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of app.main")
+    parser.add_argument("--budget", type=float, default=1.5, help="maximum import time in seconds")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to time; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+
+    def probe(*flags):
+        result = subprocess.run([sys.executable, *flags, "-c", PROBE], capture_output=True, text=True, env=env)
+        if result.returncode != 0:
+            print(result.stderr[-2000:])
+            sys.exit("❌ Importing app.main failed")
+        elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(" ")
+        return float(elapsed), [name for name in loaded.split(",") if name], result.stderr
+
+    timings = []
+    for _ in range(args.runs):
+        elapsed, heavy, _ = probe()
+        timings.append(elapsed)
+    # One more run with -X importtime for the breakdown (it adds overhead, so it isn't timed)
+    _, _, log = probe("-X", "importtime")
+
+    best = min(timings)
+    print(f"--- import app.main: best {best:.3f}s of {args.runs} runs (budget {args.budget:.3f}s) ---")
+    for cumulative_us, name in slowest_imports(log, args.top):
+        print(f"  {cumulative_us / 1e6:8.3f}s  {name}")
+
+    failed = False
+    if best > args.budget:
+        print(f"❌ Over budget by {best - args.budget:.3f}s")
+        failed = True
+    if heavy:
+        print(f"❌ Imported at startup, should load lazily: {', '.join(heavy)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ Within budget, no heavy imports at startup")
+
+
+if __name__ == "__main__":
+    main()
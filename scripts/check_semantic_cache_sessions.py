@@ -0,0 +1,83 @@
+# scripts/check_semantic_cache_sessions.py
+"""
+Checks that the semantic answer cache never hands one session's follow-up answer to
+another session.
+
+Two sessions ask about different dishes, then both ask the same follow-up ("how much
+is it?"), whose answer depends on the earlier turn. Their answers must differ. A third
+session then repeats the first session's opening question, which has no history and
+must still be answered from the cache.
+
+Runs offline like bench_load_offline.py (in-memory Motor stand-in, hash embeddings),
+with a chat model that answers from the conversation so far. Exits non-zero on failure.
+    cd backend && PYTHONPATH=. python ../scripts/check_semantic_cache_sessions.py
+"""
+import asyncio
+import logging
+import random
+import sys
+
+import bench_load_offline as bench  # noqa: F401  (sets the offline environment)
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.core.config import settings
+from app.db import mongodb
+from app.services import providers
+from app.services.providers import ScriptedChatModel
+
+
+class HistoryEchoChatModel(ScriptedChatModel):
+    """Answers with the question and the customer's previous message, so history shows in the answer."""
+
+    def _reply(self, messages):
+        if not self.bound_tools:
+            return super()._reply(messages)
+        questions = [str(message.content) for message in messages if isinstance(message, HumanMessage)]
+        earlier = questions[-2] if len(questions) > 1 else "nothing"
+        return AIMessage(content=f"Answer to '{questions[-1]}' after '{earlier}'")
+
+
+async def main() -> int:
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("Install mongomock-motor for the in-memory database")
+    mongodb.db.client = AsyncMongoMockClient()
+    await bench.seed(await mongodb.get_database(), 20, 0, random.Random(1))
+
+    providers.CHAT_MODEL_PROVIDERS["history-echo"] = lambda model: HistoryEchoChatModel()
+    settings.CHAT_MODEL_PROVIDER = settings.CHAT_MODEL = "history-echo"
+    settings.FALLBACK_CHAT_MODEL = ""
+    settings.SEMANTIC_CACHE_ENABLED = True
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.TRANSCRIPTS_ENABLED = False
+
+    from app.services.chat_agent_service import get_ai_response, get_chat_agent, semantic_cache
+    get_chat_agent()
+
+    await get_ai_response("probe-a", "tell me about paneer tikka")
+    await get_ai_response("probe-b", "tell me about dal makhani")
+    answer_a = await get_ai_response("probe-a", "how much is it?")
+    answer_b = await get_ai_response("probe-b", "how much is it?")
+    hits_before = semantic_cache.stats().get("hits", 0)
+    answer_c = await get_ai_response("probe-c", "tell me about paneer tikka")
+    hits_after = semantic_cache.stats().get("hits", 0)
+
+    print(f"session a follow-up: {answer_a}")
+    print(f"session b follow-up: {answer_b}")
+    print(f"session c opening:   {answer_c} (cache hits {hits_before} -> {hits_after})")
+    failures = []
+    if answer_a == answer_b or "paneer tikka" not in answer_a or "dal makhani" not in answer_b:
+        failures.append("follow-up answers leaked between sessions")
+    if hits_after <= hits_before:
+        failures.append("a question without history was not answered from the cache")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,85 @@
+# scripts/load_test_chat.py
+"""
+Concurrency load test for the chatbot endpoint (POST /api/v1/chats/).
+
+Fires a fixed number of chat requests at increasing levels of in-flight
+concurrency and prints the throughput for each level. With a non-blocking tool
+layer the requests/second should keep growing with concurrency until the LLM or
+database becomes the bottleneck, instead of flattening out at ~1 request at a time.
+
+Usage (against a running backend):
+    python scripts/load_test_chat.py --base-url http://localhost:8000 --requests 64
+"""
+import argparse
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+QUESTIONS = [
+    "starters under 150",
+    "what are your opening hours?",
+    "how much is paneer tikka?",
+    "any offers today?",
+    "show me spicy food",
+    "desserts below 100",
+]
+
+
+def send_chat(session: requests.Session, url: str, question: str) -> float:
+    """Sends one chat request and returns its latency in seconds."""
+    payload = {"session_id": str(uuid.uuid4()), "question": question}
+    start = time.perf_counter()
+    response = session.post(url, json=payload, timeout=60)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def run_level(url: str, concurrency: int, total_requests: int) -> dict:
+    """Runs `total_requests` chats with at most `concurrency` of them in flight."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(total_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(lambda q: send_chat(session, url, q), questions))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "rps": total_requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="Comma-separated concurrency levels")
+    args = parser.parse_args()
+
+    url = f"{args.base_url.rstrip('/')}/api/v1/chats/"
+    levels = [int(level) for level in args.levels.split(",")]
+
+    print(f"--- Load testing {url} with {args.requests} requests per level ---")
+    print(f"{'in-flight':>10} {'req/s':>10} {'p50 (s)':>10} {'p95 (s)':>10} {'scaling':>10}")
+    baseline_rps = None
+    for concurrency in levels:
+        result = run_level(url, concurrency, args.requests)
+        baseline_rps = baseline_rps or result["rps"]
+        print(
+            f"{result['concurrency']:>10} {result['rps']:>10.2f} {result['p50']:>10.2f} "
+            f"{result['p95']:>10.2f} {result['rps'] / baseline_rps:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,17 @@ import os
 import hashlib
 import json
 from pymongo import MongoClient
-from sentence_transformers import SentenceTransformer
 from pinecone import Pinecone
 from app.core.config import settings
+from app.services.providers import create_embeddings
 
 # --- INITIALIZATION ---
 mongo_client = MongoClient(settings.MONGO_URI)
 db = mongo_client["restaurantDB"]
 menu_items_collection = db["menu_items"]
-model = SentenceTransformer('all-MiniLM-L6-v2')
+
+# The Pinecone index is 384-dimensional, so this sync is pinned to MiniLM whatever EMBEDDING_PROVIDER says
+model = create_embeddings("sentence-transformers", "all-MiniLM-L6-v2")
 pc = Pinecone(api_key=settings.PINECONE_API_KEY)
 index = pc.Index("restaurant-menu")
 
@@ -66,12 +68,17 @@ def run_sync():
     print(f"Found {len(new_ids)} new items and {len(changed_ids)} updated items.")
 
     # 4. Process and upsert only the necessary items
-    for item_id in ids_to_process:
+    # Embed everything in one batch; texts embedded by an earlier run come from the cache
+    ids_to_process = list(ids_to_process)
+    texts_to_embed = [
+        f"{mongo_data[item_id]['full_doc']['name']}: {mongo_data[item_id]['full_doc']['description']}"
+        for item_id in ids_to_process
+    ]
+    embeddings = model.embed_documents(texts_to_embed)
+
+    for item_id, embedding in zip(ids_to_process, embeddings):
         item = mongo_data[item_id]["full_doc"]
         data_hash = mongo_data[item_id]["hash"]
-
-        text_to_embed = f"{item['name']}: {item['description']}"
-        embedding = model.encode(text_to_embed).tolist()
         
         metadata = {
             "name": item["name"],